@@ -1,39 +1,39 @@
-import math
+import numpy as np
 
 def haversine(lat1, lon1, lat2, lon2):
     """
-    Calculate the great-circle distance between two points 
+    Calculate the great-circle distance between two points
     on the Earth's surface using the Haversine formula.
 
     Parameters:
     - lat1, lon1: Latitude and longitude of the first point in decimal degrees.
     - lat2, lon2: Latitude and longitude of the second point in decimal degrees.
+      Scalars or NumPy arrays (broadcast against each other).
 
     Returns:
-    - Distance in kilometers (km).
+    - Distance in kilometers (km), rounded to the nearest kilometer
+      (int for scalar inputs, array otherwise).
     """
     # Radius of the Earth in kilometers
-    R = 6371.0  
+    R = 6371.0
 
     # Convert latitude and longitude from degrees to radians
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
+    lat1_rad = np.radians(lat1)
+    lon1_rad = np.radians(lon1)
+    lat2_rad = np.radians(lat2)
+    lon2_rad = np.radians(lon2)
 
     # Differences in coordinates
     delta_lat = lat2_rad - lat1_rad
     delta_lon = lon2_rad - lon1_rad
 
     # Haversine formula
-    a = math.sin(delta_lat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    a = np.sin(delta_lat / 2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lon / 2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
 
     # Distance in kilometers
     distance = R * c
 
-    return round(distance)
-
-
-
-
+    if np.ndim(distance) == 0:
+        return round(float(distance))
+    return np.round(distance)
@@ -1,6 +1,12 @@
+import sys
+from pathlib import Path
+
 import pypsa
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, str(Path(__file__).resolve().parent / "officiel"))
+from core import PowerFlowAnalyzer
+
 # Create network
 n = pypsa.Network()
 
@@ -68,72 +74,21 @@ n.add("Line", name="Slack-Neutral1", bus0="SlackBus", bus1="NeutralBus1", x=1e-6
 # Optimize the network : Run the DC PowerFlow to evaluate optimal generation dispatch
 n.optimize()
 
-# Set the generation of each generators to it's optimal value for the AC powerflow
-n.generators.loc["Gen1", "p_set"] = p_opt_gen1 = n.generators_t.p["Gen1"].iloc[-1]
-n.generators.loc["Gen2", "p_set"] = p_opt_gen2 = n.generators_t.p["Gen2"].iloc[-1]
-n.generators.loc["Gen3", "p_set"] = p_opt_gen3 = n.generators_t.p["Gen3"].iloc[-1]
-n.generators.loc["Gen4", "p_set"] = p_opt_gen4 = n.generators_t.p["Gen4"].iloc[-1]
-n.generators.loc["Gen5", "p_set"] = p_opt_gen5 = n.generators_t.p["Gen5"].iloc[-1]
-
-# Calculate the total load amount and estimate the line losses
-total_load = n.loads_t.p.sum().sum()
-line_loss_initial_estimation = total_load * 0.1
-
-# List the number of generators not operating at their maximum output
-generators_not_at_max = [gen for gen in n.generators.index if n.generators.loc[gen, "p_set"] < n.generators.loc[gen, "p_nom"]]
-
-# Sort generators by marginal cost
-sorted_generators = n.generators.loc[generators_not_at_max].sort_values(by="marginal_cost").index
-
-# Dispatch the line loss estimation to each generator not operating at its maximum output
-remaining_loss = line_loss_initial_estimation
-for gen in sorted_generators:
-    if remaining_loss <= 0:
-        break
-    available_capacity = n.generators.loc[gen, "p_nom"] - n.generators.loc[gen, "p_set"]
-    if available_capacity >= remaining_loss:
-        n.generators.loc[gen, "p_set"] += remaining_loss
-        remaining_loss = 0
-    else:
-        n.generators.loc[gen, "p_set"] += available_capacity
-        remaining_loss -= available_capacity
-
-# Run the AC PowerFlow
-n.pf()
-
-# Check the power generated by the Slack generator (Should be near 0 if to generation balance the demand)
-slack_power = n.generators_t.p["SlackGen"].iloc[-1]
-
-# While the power generated by the Slack generator is greater than 0.01% of the total load, distribute the slack generator's power to generators not at their maximum output
-iterations = 0
-while slack_power > total_load / 1000:
-    # Distribute the Slack generator's power to generators not at their maximum output
-    remaining_slack_power = slack_power
-    for gen in sorted_generators:
-        if remaining_slack_power <= 0:
-            break
-        available_capacity = n.generators.loc[gen, "p_nom"] - n.generators.loc[gen, "p_set"]
-        if available_capacity >= remaining_slack_power:
-            n.generators.loc[gen, "p_set"] += remaining_slack_power
-            remaining_slack_power = 0
-        else:
-            n.generators.loc[gen, "p_set"] += available_capacity
-            remaining_slack_power -= available_capacity
-
-    # Run the AC PowerFlow again with updated values of p_set
-    n.pf()
-
-    # Check the power generated by the Slack generator
-    slack_power = n.generators_t.p["SlackGen"].iloc[-1]
-
-    iterations += 1
-
+# Run the AC PowerFlow from the optimal dispatch and redistribute the power taken by the
+# Slack generator (line losses) to the other generators in merit order until it is below
+# 0.1% of the total load
+analyzer = PowerFlowAnalyzer(n, mode="ac")
+redispatch = analyzer.run_loss_redispatch(distribution="merit_order", tol=1e-3)
+iterations = redispatch["iterations"]
 
 print("------------------------------------------------------------------------------------------")
 
 # Display results
 
 print("Number of iterations: ", iterations)
+print("AC power flow converged: ", bool(redispatch["pf_converged"].all()))
+print("Redispatch converged: ", redispatch["converged"])
+print("Remaining Slack power: ", redispatch["residual"].max())
 
 print("\nPower generated by each generator (p):")
 print(n.generators_t.p)
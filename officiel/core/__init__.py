@@ -1,9 +1,19 @@
 from .network_builder import NetworkBuilder
 from .power_flow import PowerFlowAnalyzer
 from .optimization import NetworkOptimizer
+from .scenario_runner import ScenarioRunner
+from .optimization_session import OptimizationSession
+from .reservoir_pilotage import ReservoirPilot
+from .reservoir_balance import ReservoirBalanceSimulation
+from .network_reduction import NetworkReducer
 
 __all__ = [
     'NetworkBuilder',
-    'NetworkOptimizer'
-    'PowerFlowAnalyzer'
+    'NetworkOptimizer',
+    'NetworkReducer',
+    'OptimizationSession',
+    'PowerFlowAnalyzer',
+    'ReservoirBalanceSimulation',
+    'ReservoirPilot',
+    'ScenarioRunner'
 ]
\ No newline at end of file
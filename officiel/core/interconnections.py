@@ -0,0 +1,22 @@
+"""
+Module des interconnexions du réseau québécois.
+
+Ce module regroupe les points d'import utilisés par les modules de calcul :
+la simulation en deux passes des réservoirs (ReservoirBalanceSimulation) et
+la levée des surcharges (PowerFlowAnalyzer.relieve_overloads). Chaque point
+d'import est un générateur ajouté au bus frontalier de l'interconnexion.
+
+Constants:
+    DEFAULT_IMPORT_POINTS: Points d'import {nom: {'bus', 'p_nom', 'marginal_cost'}}
+    IMPORT_CARRIER: Type des générateurs d'import
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+# Interconnexions vers l'Ontario (poste Outaouais) et New York (poste Hertel)
+DEFAULT_IMPORT_POINTS = {
+    'Import_Ottawa': {'bus': 'Outaouais', 'p_nom': 1250.0, 'marginal_cost': 0.0},
+    'Import_NYC': {'bus': 'Hertel', 'p_nom': 1250.0, 'marginal_cost': 0.0},
+}
+IMPORT_CARRIER = "import"
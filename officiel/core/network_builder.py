@@ -27,15 +27,18 @@ Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
                 Add Contributor here
 """
 
+import time
 import pypsa
 import pandas as pd
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
-from utils import NetworkDataLoader
+from utils import NetworkDataLoader, NetworkCache, SnapshotReducer
 from .optimization import NetworkOptimizer
 from .power_flow import PowerFlowAnalyzer
+from .reservoir_balance import ReservoirBalanceSimulation
+from .network_reduction import NetworkReducer
 
 
 class NetworkBuilder:
@@ -51,17 +54,30 @@ class NetworkBuilder:
     Attributes:
         data_loader (NetworkDataLoader): Gestionnaire de chargement des données
         current_network (pypsa.Network): Réseau PyPSA en cours d'analyse
+        network_cache (NetworkCache): Cache des réseaux construits (None si désactivé)
+        cache_info (dict): Statut du cache lors du dernier appel à create_network
     """
 
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data",
+                 use_cache: bool = True,
+                 cache_dir: Optional[str] = None,
+                 timeseries_backend: str = "csv"):
         """
         Initialise le constructeur de réseau.
 
         Args:
             data_dir: Chemin vers le répertoire des données
+            use_cache: Active le cache sur disque des réseaux construits
+            cache_dir: Répertoire du cache (data_dir/.cache par défaut)
+            timeseries_backend: Format des séries temporelles ('csv' ou 'parquet')
         """
-        self.data_loader = NetworkDataLoader(data_dir)
+        self.data_loader = NetworkDataLoader(data_dir, timeseries_backend)
         self.current_network = None
+        self.network_cache = None
+        self.cache_info = {}
+
+        if use_cache:
+            self.network_cache = NetworkCache(cache_dir or Path(data_dir) / ".cache")
 
     def create_network(self, year: str,
                       start_date: Optional[str] = None,
@@ -80,7 +96,26 @@ class NetworkBuilder:
         Example:
             >>> network = builder.create_network('2024')
             >>> network = builder.create_network('2024', '2024-01-01', '2024-12-31')
+
+        Note:
+            Si le cache est actif, un réseau déjà construit à partir des mêmes
+            fichiers sources et de la même fenêtre temporelle est relu depuis
+            le disque au lieu d'être reconstruit.
         """
+        start = time.perf_counter()
+        cache_key = None
+
+        if self.network_cache is not None:
+            cache_key = self.network_cache.compute_key(
+                self.data_loader.get_source_files(year),
+                year=year, start_date=start_date, end_date=end_date
+            )
+            network = self.network_cache.load(cache_key)
+            if network is not None:
+                self._report_cache(True, cache_key, time.perf_counter() - start)
+                self.current_network = network
+                return network
+
         # Chargement des données statiques
         network = self.data_loader.load_network_data()
         
@@ -88,22 +123,52 @@ class NetworkBuilder:
         network = self.data_loader.load_timeseries_data(
             network, year, start_date, end_date
         )
+
+        if cache_key is not None:
+            self.network_cache.save(cache_key, network)
+            self._report_cache(False, cache_key, time.perf_counter() - start)
         
         self.current_network = network
         return network
 
+    def _report_cache(self, hit: bool, key: str, elapsed: float) -> None:
+        """
+        Enregistre et affiche le statut du cache pour le dernier réseau créé.
+
+        Args:
+            hit: True si le réseau a été lu depuis le cache
+            key: Clé du réseau dans le cache
+            elapsed: Durée d'obtention du réseau en secondes
+        """
+        self.cache_info = {
+            'hit': hit,
+            'key': key,
+            'load_seconds': elapsed
+        }
+        status = "succès" if hit else "absent, réseau construit et mis en cache"
+        print(f"Cache réseau ({key[:12]}) : {status} en {elapsed * 1000:.0f} ms")
+
     def optimize_network(self, 
                         network: Optional[pypsa.Network] = None,
-                        solver_name: str = "highs") -> pypsa.Network:
+                        solver_name: str = "highs",
+                        horizon: Optional[int] = None,
+                        overlap: int = 0) -> pypsa.Network:
         """
         Optimise la production sur le réseau.
 
         Args:
             network: Réseau à optimiser (utilise current_network si None)
             solver_name: Solveur à utiliser pour l'optimisation
+            horizon: Taille des fenêtres pour une optimisation par horizon
+                glissant (optimisation unique si None)
+            overlap: Recouvrement entre fenêtres (horizon glissant uniquement)
 
         Returns:
             network: Réseau avec les résultats d'optimisation
+
+        Note:
+            En horizon glissant, les résultats par fenêtre sont conservés
+            dans l'attribut rolling_horizon_results.
         """
         if network is None:
             network = self.current_network
@@ -112,11 +177,137 @@ class NetworkBuilder:
             raise ValueError("Aucun réseau disponible pour l'optimisation")
 
         optimizer = NetworkOptimizer(network, solver_name)
-        network = optimizer.optimize()
+        if horizon is None:
+            network = optimizer.optimize()
+        else:
+            network, self.rolling_horizon_results = optimizer.optimize_rolling_horizon(
+                horizon, overlap
+            )
         
         self.current_network = network
         return network
 
+    def optimize_reservoir_balance(self,
+                                   network: Optional[pypsa.Network] = None,
+                                   solver_name: str = "highs",
+                                   reservoirs: Optional[pd.DataFrame] = None,
+                                   inflow: Optional[pd.DataFrame] = None,
+                                   import_points: Optional[Dict[str, Dict]] = None) -> pypsa.Network:
+        """
+        Optimise l'année en deux passes avec bilan des réservoirs.
+
+        Si les réservoirs finissent l'année plus bas qu'ils ne l'ont
+        commencée, l'énergie prélevée en trop est attribuée aux imports
+        (Ottawa, New York) et l'année est optimisée une seconde fois en
+        réutilisant le modèle de la première passe.
+
+        Args:
+            network: Réseau à optimiser (utilise current_network si None)
+            solver_name: Solveur à utiliser pour l'optimisation
+            reservoirs: Paramètres des réservoirs (voir ReservoirPilot)
+            inflow: Apports des réservoirs en MW
+            import_points: Points d'import (voir ReservoirBalanceSimulation)
+
+        Returns:
+            network: Réseau avec les résultats de la dernière passe
+
+        Note:
+            Les coûts, volumes importés et temps des deux passes sont
+            conservés dans l'attribut reservoir_balance_results.
+        """
+        if network is None:
+            network = self.current_network
+
+        if network is None:
+            raise ValueError("Aucun réseau disponible pour l'optimisation")
+
+        simulation = ReservoirBalanceSimulation(network, reservoirs=reservoirs, inflow=inflow,
+                                                import_points=import_points,
+                                                solver_name=solver_name)
+        self.reservoir_balance_results = simulation.run()
+
+        self.current_network = network
+        return network
+
+    def reduce_snapshots(self,
+                         network: Optional[pypsa.Network] = None,
+                         method: str = "kmeans",
+                         n_days: int = 12,
+                         hours: int = 3) -> pypsa.Network:
+        """
+        Réduit les snapshots du réseau avant optimisation.
+
+        Args:
+            network: Réseau à réduire (utilise current_network si None)
+            method: 'kmeans' ou 'kmedoids' (jours représentatifs) ou
+                'downsample' (moyenne par blocs de plusieurs heures)
+            n_days: Nombre de jours représentatifs
+            hours: Nombre d'heures par bloc pour 'downsample'
+
+        Returns:
+            network: Réseau réduit, qui devient current_network
+
+        Raises:
+            ValueError: Si aucun réseau n'est disponible
+
+        Note:
+            Le réducteur est conservé dans l'attribut snapshot_reducer : son
+            rapport d'erreur (error_report) et sa méthode expand ramènent les
+            résultats sur l'horizon complet.
+        """
+        if network is None:
+            network = self.current_network
+
+        if network is None:
+            raise ValueError("Aucun réseau disponible pour la réduction")
+
+        self.snapshot_reducer = SnapshotReducer(network)
+        if method == "downsample":
+            reduced = self.snapshot_reducer.downsample(hours)
+        else:
+            reduced = self.snapshot_reducer.cluster_days(n_days, method=method)
+
+        self.current_network = reduced
+        return reduced
+
+    def reduce_network(self,
+                       network: Optional[pypsa.Network] = None,
+                       method: str = "electrical",
+                       n_clusters: int = 75,
+                       keep_buses: Optional[List[str]] = None) -> pypsa.Network:
+        """
+        Remplace le réseau par un équivalent à quelques dizaines de bus.
+
+        Args:
+            network: Réseau à réduire (utilise current_network si None)
+            method: 'mrc', 'kmeans' ou 'electrical' (voir NetworkReducer)
+            n_clusters: Nombre de bus équivalents
+            keep_buses: Bus conservés seuls dans leur groupe
+
+        Returns:
+            network: Réseau équivalent, qui devient current_network
+
+        Raises:
+            ValueError: Si aucun réseau n'est disponible
+
+        Note:
+            Le réducteur est conservé dans l'attribut network_reducer : sa
+            correspondance (busmap), sa méthode expand et compare_flows
+            permettent de revenir au réseau complet et de mesurer l'écart.
+        """
+        if network is None:
+            network = self.current_network
+
+        if network is None:
+            raise ValueError("Aucun réseau disponible pour la réduction")
+
+        self.network_reducer = NetworkReducer(network, data_dir=self.data_loader.data_dir)
+        reduced = self.network_reducer.reduce(method=method, n_clusters=n_clusters,
+                                              keep_buses=keep_buses)
+
+        self.current_network = reduced
+        return reduced
+
     def run_power_flow(self,
                     network: Optional[pypsa.Network] = None,
                     mode: str = "dc") -> Tuple[pypsa.Network, Dict]:
@@ -0,0 +1,421 @@
+"""
+Module de réduction spatiale du réseau (agrégation de bus).
+
+Ce module regroupe les bus du réseau complet (667 bus, dont de nombreux
+nœuds de passage de type 'ligne') en un réseau équivalent de quelques
+dizaines de bus. Trois regroupements sont proposés :
+- Par MRC : chaque bus rejoint la MRC dont le centroïde est le plus proche
+- Par k-means sur la latitude et la longitude
+- Par distance électrique : impédance de Thévenin entre deux bus,
+  regroupement hiérarchique (lien moyen)
+
+L'agrégation (bus, charges, générateurs et séries temporelles) est faite
+par PyPSA. Les lignes entre deux groupes sont remplacées par une ligne
+équivalente dont la réactance est celle des lignes d'origine en parallèle
+(en p.u.) et dont la capacité est leur somme. La correspondance bus
+d'origine -> bus équivalent est conservée pour ramener les résultats sur
+le réseau complet, et l'écart de flux DC entre les deux réseaux est mesuré
+sur chaque ligne équivalente.
+
+Example:
+    >>> from network.core import NetworkReducer
+    >>> reducer = NetworkReducer(network)
+    >>> reduced = reducer.reduce(method='electrical', n_clusters=75)
+    >>> reduced.optimize(solver_name='highs')
+    >>> prices = reducer.expand(reduced.buses_t.marginal_price)
+    >>> reducer.compare_flows()
+
+Notes:
+    Les lignes internes à un groupe disparaissent : leur impédance et leur
+    capacité ne sont plus représentées dans le réseau équivalent.
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+from pathlib import Path
+from pypsa.clustering.spatial import get_clustering_from_busmap
+from scipy.cluster.hierarchy import fcluster, linkage
+from scipy.cluster.vq import kmeans2
+from scipy.spatial.distance import squareform
+from typing import List, Optional
+
+from utils.geo_utils import to_unit_vectors
+from .power_flow import PowerFlowAnalyzer
+
+
+class NetworkReducer:
+    """
+    Réduit le réseau en regroupant ses bus et ramène les résultats sur le réseau complet.
+
+    Attributes:
+        network (pypsa.Network): Réseau complet (non modifié)
+        reduced (pypsa.Network): Réseau équivalent du dernier appel à reduce
+        busmap (pd.Series): Bus équivalent de chaque bus d'origine
+        linemap (pd.Series): Ligne équivalente de chaque ligne d'origine
+            (absente pour les lignes internes à un groupe)
+        error_report (pd.DataFrame): Écarts de flux du dernier appel à compare_flows
+    """
+
+    METHODS = ['mrc', 'kmeans', 'electrical']
+    MRC_FILE = Path("MRC_GROUPE_9") / "coordonnees_MRC.csv"
+
+    # Attributs des bus sans règle d'agrégation dans PyPSA
+    BUS_STRATEGIES = {
+        'type': lambda values: values.mode().iloc[0],
+        'PQ_PV': lambda values: values.mode().iloc[0],
+        'sub_network': lambda values: values.iloc[0],
+        'voltage': 'max',
+        'v_nom': 'max',
+        'latitude': 'mean',
+        'longitude': 'mean',
+    }
+
+    def __init__(self, network: pypsa.Network, data_dir: str = "data"):
+        """
+        Initialise la réduction.
+
+        Args:
+            network: Réseau complet avec les coordonnées des bus
+                (colonnes latitude et longitude)
+            data_dir: Répertoire des données (centroïdes des MRC)
+
+        Raises:
+            ValueError: Si des bus n'ont pas de coordonnées
+        """
+        buses = network.buses
+        if not {'latitude', 'longitude'} <= set(buses.columns) or \
+                buses[['latitude', 'longitude']].isna().any().any():
+            raise ValueError("Tous les bus doivent avoir une latitude et une longitude")
+
+        self.network = network
+        self.data_dir = Path(data_dir)
+        self.reduced = None
+        self.busmap = None
+        self.linemap = None
+        self.error_report = None
+
+    def get_busmap(self,
+                   method: str = "kmeans",
+                   n_clusters: int = 75,
+                   keep_buses: Optional[List[str]] = None,
+                   seed: int = 0) -> pd.Series:
+        """
+        Calcule le bus équivalent de chaque bus.
+
+        Les bus équivalents portent le nom de la MRC ('mrc') ou du bus le
+        plus central de leur groupe ('kmeans', 'electrical').
+
+        Args:
+            method: 'mrc', 'kmeans' ou 'electrical'
+            n_clusters: Nombre de groupes (ignoré pour 'mrc')
+            keep_buses: Bus conservés seuls dans leur groupe (points
+                d'import, par exemple)
+            seed: Graine de l'initialisation du k-means
+
+        Returns:
+            Series bus d'origine -> bus équivalent
+
+        Raises:
+            ValueError: Si la méthode n'est pas supportée ou si n_clusters
+                est invalide
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Méthode non supportée: {method}")
+
+        buses = self.network.buses.index
+        keep = pd.Index(keep_buses or []).intersection(buses)
+        candidates = buses.difference(keep, sort=False)
+        if method != "mrc" and not 1 <= n_clusters <= len(candidates):
+            raise ValueError(f"n_clusters doit être compris entre 1 et {len(candidates)}")
+
+        if method == "mrc":
+            busmap = self._busmap_by_mrc(candidates)
+        elif method == "kmeans":
+            busmap = self._busmap_by_kmeans(candidates, n_clusters, seed)
+        else:
+            busmap = self._busmap_by_electrical_distance(candidates, n_clusters)
+
+        return pd.concat([busmap, pd.Series(keep, index=keep)]).reindex(buses).rename("cluster")
+
+    def reduce(self,
+               method: str = "kmeans",
+               n_clusters: int = 75,
+               busmap: Optional[pd.Series] = None,
+               keep_buses: Optional[List[str]] = None,
+               seed: int = 0) -> pypsa.Network:
+        """
+        Construit le réseau équivalent.
+
+        Args:
+            method: Regroupement utilisé si busmap n'est pas fourni
+                (voir get_busmap)
+            n_clusters: Nombre de groupes
+            busmap: Correspondance bus d'origine -> bus équivalent imposée
+            keep_buses: Bus conservés seuls dans leur groupe
+            seed: Graine de l'initialisation du k-means
+
+        Returns:
+            Réseau équivalent (bus, lignes, charges, générateurs et séries
+            temporelles)
+        """
+        if busmap is None:
+            busmap = self.get_busmap(method, n_clusters, keep_buses, seed)
+
+        # PyPSA agrège à partir des coordonnées x, y ; les résultats ne sont pas agrégés
+        network = self.network.copy()
+        network.calculate_dependent_values()
+        for component in network.components:
+            if component.empty:
+                continue
+            for attr, df in component.dynamic.items():
+                if not df.empty and str(component.defaults.at[attr, 'status']).startswith('Output'):
+                    component.dynamic[attr] = df.iloc[:, :0]
+        network.buses['x'] = network.buses['longitude']
+        network.buses['y'] = network.buses['latitude']
+
+        clustering = get_clustering_from_busmap(
+            network, busmap.astype(str),
+            bus_strategies={key: value for key, value in self.BUS_STRATEGIES.items()
+                            if key in network.buses.columns},
+            line_strategies={'type': lambda values: values.iloc[0]}
+        )
+        reduced = clustering.n
+        self.busmap = busmap
+        self.linemap = clustering.linemap
+        self._set_equivalent_impedances(network.lines, reduced)
+
+        self.reduced = reduced
+        print(f"Réseau réduit de {len(network.buses)} à {len(reduced.buses)} bus "
+              f"et de {len(network.lines)} à {len(reduced.lines)} lignes")
+        return reduced
+
+    def expand(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ramène des résultats par bus équivalent sur les bus d'origine.
+
+        Args:
+            df: Tableau dont les colonnes sont les bus équivalents
+                (ex: reduced.buses_t.marginal_price)
+
+        Returns:
+            Tableau dont les colonnes sont les bus d'origine
+
+        Raises:
+            RuntimeError: Si aucune réduction n'a été effectuée
+        """
+        if self.busmap is None:
+            raise RuntimeError("Aucune réduction effectuée")
+        return df.reindex(columns=self.busmap.values).set_axis(self.busmap.index, axis=1)
+
+    def compare_flows(self, snapshots=None) -> pd.DataFrame:
+        """
+        Compare les flux DC des lignes équivalentes à ceux du réseau complet.
+
+        Les injections du réseau complet (consignes p_set) sont sommées par
+        bus équivalent. Le flux de référence d'une ligne équivalente est la
+        somme des flux des lignes d'origine qu'elle remplace.
+
+        Args:
+            snapshots: Snapshots à comparer (tous si None)
+
+        Returns:
+            DataFrame par ligne équivalente avec :
+            - Flux maximal de référence en MW
+            - Erreur absolue maximale et quadratique moyenne en MW
+            - Erreur maximale en pourcentage de s_nom
+
+        Raises:
+            RuntimeError: Si aucune réduction n'a été effectuée
+
+        Note:
+            Pour évaluer un dispatch optimisé, copier generators_t.p dans
+            generators_t.p_set avant l'appel.
+        """
+        if self.reduced is None:
+            raise RuntimeError("Aucune réduction effectuée")
+
+        network, reduced = self.network, self.reduced
+        snapshots = network.snapshots if snapshots is None else pd.Index(snapshots)
+
+        analyzer = PowerFlowAnalyzer(network)
+        injections = analyzer._get_bus_injections(snapshots)
+        ptdf = analyzer.compute_ptdf()
+        flows = injections.values @ ptdf.values.T
+
+        reduced_ptdf = PowerFlowAnalyzer(reduced).compute_ptdf()
+        reduced_injections = injections.T.groupby(self.busmap.astype(str)).sum().T
+        reduced_flows = pd.DataFrame(
+            reduced_injections.reindex(columns=reduced_ptdf.columns, fill_value=0.0).values
+            @ reduced_ptdf.values.T, index=snapshots, columns=reduced_ptdf.index
+        )
+
+        # Flux des lignes d'origine orientés comme leur ligne équivalente
+        lines = network.lines.loc[ptdf.index]
+        linemap = self.linemap.reindex(ptdf.index)
+        crossing = linemap.notna().to_numpy()
+        same_direction = (self.busmap.astype(str)[lines.bus0].to_numpy()
+                          == reduced.lines.bus0.reindex(linemap).to_numpy())
+        oriented = pd.DataFrame(
+            flows[:, crossing] * np.where(same_direction, 1.0, -1.0)[crossing],
+            index=snapshots, columns=ptdf.index[crossing]
+        )
+        reference = oriented.T.groupby(linemap[crossing]).sum().T.reindex(
+            columns=reduced_flows.columns, fill_value=0.0)
+
+        error = (reduced_flows - reference).abs()
+        report = pd.DataFrame({
+            'reference_max_mw': reference.abs().max(),
+            'max_abs_error_mw': error.max(),
+            'rmse_mw': np.sqrt((error ** 2).mean()),
+            'max_error_percent': error.max() / reduced.lines.s_nom.reindex(error.columns) * 100
+        })
+        report.index.name = 'line'
+
+        self.error_report = report
+        print(f"Écart maximal de flux : {report['max_abs_error_mw'].max():.1f} MW "
+              f"({report['max_error_percent'].max():.1f} % de s_nom)")
+        return report
+
+    def _busmap_by_mrc(self, buses: pd.Index) -> pd.Series:
+        """Associe chaque bus à la MRC dont le centroïde est le plus proche."""
+        mrc = pd.read_csv(self.data_dir / self.MRC_FILE)
+        coordinates = self.network.buses.loc[buses]
+
+        # Le plus grand produit scalaire correspond à la plus petite distance sur la sphère
+        similarity = (to_unit_vectors(coordinates[['latitude', 'longitude']].to_numpy())
+                      @ to_unit_vectors(mrc[['centroid_y', 'centroid_x']].to_numpy()).T)
+        return pd.Series(mrc.CDNAME.to_numpy()[similarity.argmax(axis=1)], index=buses)
+
+    def _busmap_by_kmeans(self, buses: pd.Index, n_clusters: int, seed: int) -> pd.Series:
+        """Regroupe les bus par k-means sur leurs positions (vecteurs unitaires 3D)."""
+        coordinates = self.network.buses.loc[buses]
+        points = to_unit_vectors(coordinates[['latitude', 'longitude']].to_numpy())
+        centroids, labels = kmeans2(points, n_clusters, minit="++", seed=seed)
+
+        # Bus le plus proche du centroïde de chaque groupe
+        distances = np.linalg.norm(points - centroids[labels], axis=1)
+        order = np.lexsort((distances, labels))
+        first = order[np.r_[True, np.diff(labels[order]) != 0]]
+        names = pd.Series(buses[first], index=labels[first])
+        return pd.Series(names[labels].to_numpy(), index=buses)
+
+    def _busmap_by_electrical_distance(self, buses: pd.Index, n_clusters: int) -> pd.Series:
+        """
+        Regroupe les bus par distance électrique.
+
+        La distance entre deux bus est l'impédance de Thévenin vue entre eux
+        (Z_ii + Z_jj - 2 Z_ij, réseau DC). Les sous-réseaux ne sont jamais
+        fusionnés : chacun reçoit un nombre de groupes proportionnel à son
+        nombre de bus (au moins un).
+
+        Raises:
+            ValueError: Si n_clusters est inférieur au nombre de sous-réseaux
+        """
+        impedance, sub_network = self._get_thevenin_impedances()
+        positions = self.network.buses.index.get_indexer(buses)
+        impedance = impedance[np.ix_(positions, positions)]
+        sub_network = sub_network[positions]
+
+        islands, island_of_bus, sizes = np.unique(sub_network, return_inverse=True,
+                                                  return_counts=True)
+        if n_clusters < len(islands):
+            raise ValueError(f"n_clusters doit être au moins égal au nombre "
+                             f"de sous-réseaux ({len(islands)})")
+
+        # Répartition des groupes au prorata des tailles (plus forts restes)
+        share = (n_clusters - len(islands)) * sizes / sizes.sum()
+        counts = np.minimum(1 + np.floor(share).astype(int), sizes)
+        remainders = np.where(counts < sizes, share - np.floor(share), -1)
+        for island in np.argsort(-remainders)[:n_clusters - counts.sum()]:
+            if counts[island] < sizes[island]:
+                counts[island] += 1
+
+        names = np.empty(len(buses), dtype=object)
+        for island, count in enumerate(counts):
+            members = np.flatnonzero(island_of_bus == island)
+            local = impedance[np.ix_(members, members)]
+            diagonal = np.diag(local)
+            distance = np.clip(diagonal[:, None] + diagonal[None, :] - 2 * local, 0, None)
+            distance = (distance + distance.T) / 2
+            np.fill_diagonal(distance, 0)
+
+            if len(members) == 1:
+                labels = np.ones(1, dtype=int)
+            else:
+                labels = fcluster(linkage(squareform(distance, checks=False), method="average"),
+                                  count, criterion="maxclust")
+
+            # Bus le plus central (somme des distances minimale) de chaque groupe
+            same = labels[:, None] == labels[None, :]
+            centrality = np.where(same, distance, 0).sum(axis=1)
+            order = np.lexsort((centrality, labels))
+            first = order[np.r_[True, np.diff(labels[order]) != 0]]
+            representatives = pd.Series(buses[members[first]], index=labels[first])
+            names[members] = representatives[labels].to_numpy()
+
+        return pd.Series(names, index=buses)
+
+    def _get_thevenin_impedances(self):
+        """
+        Calcule la matrice des impédances nodales DC de chaque sous-réseau.
+
+        Returns:
+            Tuple (matrice bus × bus des impédances en p.u., nulle entre
+            sous-réseaux et sur les bus de référence ; sous-réseau de chaque bus)
+        """
+        network = self.network
+        network.determine_network_topology()
+        for sub_network in network.sub_networks.obj:
+            sub_network.find_bus_controls()
+        lines = PowerFlowAnalyzer(network)._get_active_lines()
+
+        buses = network.buses.index
+        impedance = np.zeros((len(buses), len(buses)))
+        for name, slack_bus in network.sub_networks.slack_bus.items():
+            sn_buses = buses[network.buses.sub_network == name]
+            sn_lines = lines[lines.sub_network == name]
+            keep = sn_buses[sn_buses != slack_bus]
+            if len(keep) == 0 or sn_lines.empty:
+                continue
+
+            local = pd.Series(np.arange(len(sn_buses)), index=sn_buses)
+            susceptance = 1.0 / sn_lines.x_pu_eff.to_numpy()
+            i, j = local[sn_lines.bus0].to_numpy(), local[sn_lines.bus1].to_numpy()
+            B = np.zeros((len(sn_buses), len(sn_buses)))
+            np.add.at(B, (i, j), -susceptance)
+            np.add.at(B, (j, i), -susceptance)
+            np.add.at(B, (i, i), susceptance)
+            np.add.at(B, (j, j), susceptance)
+
+            reduced = local[keep].to_numpy()
+            positions = buses.get_indexer(keep)
+            impedance[np.ix_(positions, positions)] = np.linalg.inv(B[np.ix_(reduced, reduced)])
+
+        return impedance, network.buses.sub_network.to_numpy()
+
+    def _set_equivalent_impedances(self, lines: pd.DataFrame, reduced: pypsa.Network) -> None:
+        """
+        Remplace les impédances des lignes équivalentes par celles des
+        lignes d'origine en parallèle.
+
+        Args:
+            lines: Lignes d'origine avec leurs valeurs dérivées (x_pu_eff, r_pu_eff)
+            reduced: Réseau équivalent à corriger
+        """
+        linemap = self.linemap.dropna()
+        admittance = (1.0 / lines.loc[linemap.index, ['x_pu_eff', 'r_pu_eff']]).groupby(
+            linemap).sum()
+
+        # PyPSA convertit les lignes en p.u. avec la tension du bus0
+        equivalent = reduced.lines.loc[admittance.index]
+        v_nom = equivalent.bus0.map(reduced.buses.v_nom)
+
+        # Les lignes équivalentes n'ont plus de type : x et r sont utilisés tels quels
+        reduced.lines.loc[admittance.index, 'type'] = ""
+        reduced.lines.loc[admittance.index, 'x'] = v_nom ** 2 / admittance['x_pu_eff']
+        reduced.lines.loc[admittance.index, 'r'] = (
+            v_nom ** 2 / admittance['r_pu_eff']).where(admittance['r_pu_eff'] > 0, 0.0)
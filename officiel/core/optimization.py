@@ -12,6 +12,12 @@ Example:
     >>> optimizer = NetworkOptimizer(network)
     >>> network = optimizer.optimize()
     >>> results = optimizer.get_optimization_results()
+    >>> # Horizon glissant : fenêtres de 24 h avec 6 h de recouvrement
+    >>> network, windows = optimizer.optimize_rolling_horizon(horizon=24, overlap=6)
+    >>> # Résolutions successives sans reconstruire le modèle
+    >>> session = optimizer.create_session()
+    >>> session.update_marginal_cost(new_costs)
+    >>> result = session.solve()
 
 Notes:
     L'optimisation utilise :
@@ -23,11 +29,14 @@ Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
                 Add Contributor here
 """
 
+import time
 import pypsa
 import pandas as pd
 from typing import Dict, Optional, Tuple
 from datetime import datetime
 
+from .optimization_session import OptimizationSession
+
 
 class NetworkOptimizer:
     """
@@ -154,4 +163,211 @@ class NetworkOptimizer:
         except Exception as e:
             return False, f"Erreur lors de la vérification: {str(e)}"
     
+    # Attributs de capacité des composants extensibles (nominal, extensible)
+    EXTENDABLE_ATTRIBUTES = {
+        "generators": ("p_nom", "p_nom_extendable"),
+        "lines": ("s_nom", "s_nom_extendable"),
+        "links": ("p_nom", "p_nom_extendable"),
+        "storage_units": ("p_nom", "p_nom_extendable"),
+        "stores": ("e_nom", "e_nom_extendable"),
+    }
+
+    def optimize_rolling_horizon(self,
+                                 horizon: int = 24,
+                                 overlap: int = 0,
+                                 fix_extendable: bool = True) -> Tuple[pypsa.Network, Dict]:
+        """
+        Optimise le réseau par horizon glissant.
+
+        Les snapshots sont découpés en fenêtres de `horizon` pas de temps,
+        prolongées de `overlap` pas de temps. Chaque fenêtre est optimisée
+        séparément ; la partie en recouvrement est ensuite écrasée par la
+        fenêtre suivante, de sorte que generators_t.p contient le même
+        assemblage qu'une optimisation unique.
+
+        D'une fenêtre à l'autre :
+        - Le niveau des réservoirs (StorageUnit, Store) à la fin de la partie
+          retenue devient le niveau initial de la fenêtre suivante
+        - Les capacités extensibles sont fixées à l'optimum de la première
+          fenêtre (si fix_extendable)
+
+        Args:
+            horizon: Nombre de snapshots retenus par fenêtre
+            overlap: Nombre de snapshots supplémentaires optimisés puis
+                remplacés par la fenêtre suivante
+            fix_extendable: Fixe les capacités extensibles après la première fenêtre
+
+        Returns:
+            Tuple[network, results]: Réseau optimisé et résultats contenant :
+            - Tableau par fenêtre (début, fin, statut, coût, temps de résolution)
+            - Temps total de résolution
+            - Coût total sur les snapshots retenus
+
+        Raises:
+            ValueError: Si horizon ou overlap sont invalides
+            RuntimeError: Si l'optimisation d'une fenêtre échoue
+        """
+        if horizon <= 0 or overlap < 0:
+            raise ValueError("horizon doit être positif et overlap non négatif")
+
+        snapshots = self.network.snapshots
+        saved_state = self._save_rolling_state()
+        windows = []
+
+        try:
+            for start in range(0, len(snapshots), horizon):
+                window = snapshots[start:start + horizon + overlap]
+
+                # Report de l'état des réservoirs à la fin de la fenêtre précédente
+                if start > 0:
+                    self._carry_over_storage_state(snapshots[start - 1], snapshots[start])
+
+                solve_start = time.perf_counter()
+                status, termination_condition = self.network.optimize(
+                    snapshots=window, solver_name=self.solver_name
+                )
+                solve_time = time.perf_counter() - solve_start
+
+                if status != "ok":
+                    raise RuntimeError(
+                        f"Optimisation de la fenêtre {window[0]} échouée avec statut: {status}"
+                    )
+
+                windows.append({
+                    'start': window[0],
+                    'end': snapshots[min(start + horizon, len(snapshots)) - 1],
+                    'n_snapshots': len(window),
+                    'status': termination_condition,
+                    'objective': float(self.network.objective),
+                    'solve_seconds': solve_time
+                })
+
+                if start == 0 and fix_extendable:
+                    self._fix_extendable_capacities()
+        finally:
+            self._restore_rolling_state(saved_state)
+
+        windows_df = pd.DataFrame(windows)
+        results = {
+            "windows": windows_df,
+            "total_solve_seconds": float(windows_df['solve_seconds'].sum()),
+            "total_cost": self._get_operational_cost()
+        }
+        return self.network, results
+
+    def _save_rolling_state(self) -> Dict[str, pd.DataFrame]:
+        """
+        Sauvegarde les attributs modifiés pendant l'horizon glissant.
+
+        Returns:
+            Dict des copies des attributs, par type de composant
+        """
+        state = {}
+        for list_name, attributes in self.EXTENDABLE_ATTRIBUTES.items():
+            state[list_name] = getattr(self.network, list_name)[list(attributes)].copy()
+
+        state["storage_units_initial"] = self.network.storage_units[
+            ["state_of_charge_initial", "cyclic_state_of_charge"]
+        ].copy()
+        state["stores_initial"] = self.network.stores[["e_initial", "e_cyclic"]].copy()
+        return state
+
+    def _restore_rolling_state(self, state: Dict[str, pd.DataFrame]) -> None:
+        """
+        Restaure les attributs sauvegardés par _save_rolling_state.
+
+        Les résultats (p_nom_opt, séries temporelles) sont conservés.
+
+        Args:
+            state: Attributs sauvegardés
+        """
+        for list_name in self.EXTENDABLE_ATTRIBUTES:
+            getattr(self.network, list_name).update(state[list_name])
+        self.network.storage_units.update(state["storage_units_initial"])
+        self.network.stores.update(state["stores_initial"])
+
+    def _carry_over_storage_state(self, snapshot: pd.Timestamp, next_snapshot: pd.Timestamp) -> None:
+        """
+        Initialise les réservoirs avec leur niveau à un snapshot donné.
+
+        PyPSA n'applique pas les pertes à vide au niveau initial : celles du
+        premier snapshot de la fenêtre sont donc appliquées au niveau reporté,
+        comme dans une optimisation unique.
+
+        Args:
+            snapshot: Dernier snapshot retenu de la fenêtre précédente
+            next_snapshot: Premier snapshot de la fenêtre suivante
+        """
+        weighting = self.network.snapshot_weightings.stores.at[next_snapshot]
+
+        storage_units = self.network.storage_units
+        if not storage_units.empty:
+            standing_loss = self.network.get_switchable_as_dense(
+                "StorageUnit", "standing_loss", [next_snapshot]).iloc[0]
+            storage_units["state_of_charge_initial"] = (
+                (self.network.storage_units_t.state_of_charge.loc[snapshot]
+                 * (1 - standing_loss) ** weighting)
+                .reindex(storage_units.index)
+                .fillna(storage_units["state_of_charge_initial"])
+            )
+            storage_units["cyclic_state_of_charge"] = False
+
+        stores = self.network.stores
+        if not stores.empty:
+            standing_loss = self.network.get_switchable_as_dense(
+                "Store", "standing_loss", [next_snapshot]).iloc[0]
+            stores["e_initial"] = (
+                (self.network.stores_t.e.loc[snapshot] * (1 - standing_loss) ** weighting)
+                .reindex(stores.index)
+                .fillna(stores["e_initial"])
+            )
+            stores["e_cyclic"] = False
+
+    def _fix_extendable_capacities(self) -> None:
+        """Fixe les capacités extensibles à leur valeur optimale."""
+        for list_name, (nom, extendable) in self.EXTENDABLE_ATTRIBUTES.items():
+            df = getattr(self.network, list_name)
+            is_extendable = df[extendable].astype(bool)
+            if is_extendable.any():
+                df.loc[is_extendable, nom] = df.loc[is_extendable, f"{nom}_opt"]
+                df.loc[is_extendable, extendable] = False
+
+    def _get_operational_cost(self) -> float:
+        """
+        Calcule le coût de production des générateurs sur tous les snapshots.
+
+        Returns:
+            Somme pondérée de la production multipliée par le coût marginal
+        """
+        generators = self.network.generators
+        marginal_cost = (
+            self.network.generators_t.marginal_cost
+            .reindex(index=self.network.snapshots, columns=generators.index)
+            .fillna(generators.marginal_cost)
+        )
+        production = self.network.generators_t.p.reindex(columns=generators.index).fillna(0)
+        weights = self.network.snapshot_weightings.objective
+
+        return float((production * marginal_cost).sum(axis=1).mul(weights).sum())
+
+    def create_session(self,
+                       snapshots: Optional[pd.Index] = None,
+                       solver_options: Optional[Dict] = None) -> OptimizationSession:
+        """
+        Crée une session d'optimisation persistante.
+
+        Le modèle est construit une seule fois ; les coûts marginaux,
+        p_max_pu, les charges et les contraintes globales peuvent ensuite
+        être modifiés sur place entre deux résolutions.
+
+        Args:
+            snapshots: Snapshots à optimiser (tous si None)
+            solver_options: Options transmises au solveur
+
+        Returns:
+            Session prête à être résolue
+        """
+        return OptimizationSession(self.network, solver_name=self.solver_name,
+                                   snapshots=snapshots, solver_options=solver_options)
+
     # Add new method here
\ No newline at end of file
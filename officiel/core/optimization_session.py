@@ -0,0 +1,289 @@
+"""
+Module de session d'optimisation persistante.
+
+Ce module permet de résoudre plusieurs fois le même problème d'optimisation
+sans reconstruire le modèle linopy. Le modèle et le modèle natif du solveur
+sont construits une seule fois ; les coûts marginaux, la disponibilité des
+centrales (p_max_pu), les charges et les constantes des contraintes globales
+sont ensuite modifiés sur place avant chaque nouvelle résolution. Avec HiGHS,
+la résolution repart de la base optimale précédente (démarrage à chaud).
+
+Classes:
+    OptimizationSession: Session de résolutions successives d'un réseau.
+
+Example:
+    >>> from network.core import OptimizationSession
+    >>> session = OptimizationSession(network)
+    >>> for scale in [0.8, 1.0, 1.2]:
+    ...     session.update_marginal_cost(base_cost * scale)
+    ...     result = session.solve()
+    >>> session.history  # temps de construction et de résolution
+
+Notes:
+    Seules les valeurs numériques peuvent changer d'une résolution à
+    l'autre. Un changement de structure (ajout de composants, capacités
+    rendues extensibles, ...) nécessite une nouvelle session.
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import time
+import pypsa
+import pandas as pd
+import xarray as xr
+from linopy import solvers
+from typing import Dict, Optional, Union
+
+
+class OptimizationSession:
+    """
+    Session d'optimisation réutilisant un modèle linopy déjà construit.
+
+    Attributes:
+        network (pypsa.Network): Réseau optimisé
+        model (linopy.Model): Modèle d'optimisation construit une seule fois
+        solver (linopy.solvers.Solver): Solveur persistant (API directe)
+        build_seconds (float): Temps de construction du modèle et du solveur
+        history (List[Dict]): Statut, objectif et temps de chaque résolution
+    """
+
+    def __init__(self,
+                 network: pypsa.Network,
+                 solver_name: str = "highs",
+                 snapshots: Optional[pd.Index] = None,
+                 solver_options: Optional[Dict] = None):
+        """
+        Construit le modèle d'optimisation et le modèle natif du solveur.
+
+        Args:
+            network: Réseau PyPSA à optimiser
+            solver_name: Solveur à utiliser (doit supporter l'API directe)
+            snapshots: Snapshots à optimiser (tous si None)
+            solver_options: Options transmises au solveur
+
+        Raises:
+            RuntimeError: Si le solveur ne peut pas être construit
+        """
+        self.network = network
+        self.snapshots = network.snapshots if snapshots is None else pd.Index(snapshots)
+        self.history = []
+
+        build_start = time.perf_counter()
+        self.model = network.optimize.create_model(snapshots=self.snapshots)
+        try:
+            self.solver = solvers.Solver.from_name(
+                solver_name, model=self.model, io_api="direct",
+                options=solver_options, track_updates=True
+            )
+        except Exception as e:
+            raise RuntimeError(f"Solveur {solver_name} non disponible en mode persistant: {str(e)}")
+        self.build_seconds = time.perf_counter() - build_start
+
+        # L'objectif est séparé en une partie fixe et le terme des coûts marginaux
+        self._marginal_cost = self._get_dense("Generator", "marginal_cost")
+        self._objective_base = (self.model.objective.expression
+                                - self._generator_cost_term(self._marginal_cost))
+        self._update_seconds = 0.0
+
+    def update_marginal_cost(self, marginal_cost: Union[pd.Series, pd.DataFrame]) -> None:
+        """
+        Modifie les coûts marginaux des générateurs.
+
+        Args:
+            marginal_cost: Coûts par générateur (Series) ou par snapshot et
+                générateur (DataFrame). Les générateurs absents sont inchangés.
+        """
+        start = time.perf_counter()
+        network = self.network
+        new_cost = self._expand(marginal_cost, self._marginal_cost)
+
+        network.generators_t.marginal_cost = new_cost.reindex(
+            index=network.snapshots).fillna(network.get_switchable_as_dense("Generator", "marginal_cost"))
+        self.model.add_objective(self._objective_base + self._generator_cost_term(new_cost),
+                                 overwrite=True)
+        self._marginal_cost = new_cost
+        self._update_seconds += time.perf_counter() - start
+
+    def update_p_max_pu(self, p_max_pu: Union[pd.Series, pd.DataFrame]) -> None:
+        """
+        Modifie la disponibilité maximale des générateurs.
+
+        Args:
+            p_max_pu: Disponibilité par générateur (Series) ou par snapshot et
+                générateur (DataFrame), en p.u. de la puissance nominale
+        """
+        start = time.perf_counter()
+        network = self.network
+        generators = network.generators
+        new_p_max_pu = self._expand(p_max_pu, self._get_dense("Generator", "p_max_pu"))
+
+        dense = network.get_switchable_as_dense("Generator", "p_max_pu")
+        dense.loc[self.snapshots] = new_p_max_pu
+        network.generators_t.p_max_pu = dense
+
+        # Générateurs à capacité fixe : p <= p_max_pu * p_nom (second membre)
+        if "Generator-fix-p-upper" in self.model.constraints:
+            constraint = self.model.constraints["Generator-fix-p-upper"]
+            names = constraint.coords["name"].values
+            constraint.update(rhs=self._to_dataarray(
+                new_p_max_pu[names] * generators.loc[names, "p_nom"], names
+            ))
+
+        # Générateurs extensibles : p - p_max_pu * p_nom <= 0 (coefficients)
+        if "Generator-ext-p-upper" in self.model.constraints:
+            constraint = self.model.constraints["Generator-ext-p-upper"]
+            names = constraint.coords["name"].values
+            p = self.model["Generator-p"].sel(name=names)
+            p_nom = self.model["Generator-p_nom"].sel(name=names)
+            constraint.update(lhs=p - self._to_dataarray(new_p_max_pu[names], names) * p_nom)
+
+        self._update_seconds += time.perf_counter() - start
+
+    def update_loads(self, p_set: pd.DataFrame) -> None:
+        """
+        Modifie les profils de charge.
+
+        Args:
+            p_set: Charges par snapshot et charge en MW. Les charges
+                absentes sont inchangées.
+        """
+        start = time.perf_counter()
+        network = self.network
+        loads = network.loads
+        old_p_set = self._get_dense("Load", "p_set")
+        new_p_set = self._expand(p_set, old_p_set)
+
+        dense = network.get_switchable_as_dense("Load", "p_set")
+        dense.loc[self.snapshots] = new_p_set
+        network.loads_t.p_set = dense
+
+        # Les charges sont des constantes de l'équilibre nodal : seul le second membre change
+        delta = (new_p_set - old_p_set).mul(loads.sign)
+        delta_by_bus = -delta.T.groupby(loads.bus).sum().T
+
+        constraint = self.model.constraints["Bus-nodal_balance"]
+        buses = constraint.coords["name"].values
+        constraint.update(rhs=constraint.rhs + self._to_dataarray(
+            delta_by_bus.reindex(columns=buses, fill_value=0.0), buses
+        ))
+        self._update_seconds += time.perf_counter() - start
+
+    def update_global_constraints(self, constants: Dict[str, float]) -> None:
+        """
+        Modifie les constantes des contraintes globales.
+
+        Args:
+            constants: Dict {nom de la contrainte: nouvelle constante}
+
+        Raises:
+            ValueError: Si une contrainte n'existe pas dans le modèle
+        """
+        start = time.perf_counter()
+        global_constraints = self.network.global_constraints
+
+        for name, constant in constants.items():
+            key = f"GlobalConstraint-{name}"
+            if key not in self.model.constraints:
+                raise ValueError(f"Contrainte globale inconnue: {name}")
+
+            constraint = self.model.constraints[key]
+            constraint.update(rhs=constraint.rhs + (constant - global_constraints.loc[name, "constant"]))
+            global_constraints.loc[name, "constant"] = constant
+
+        self._update_seconds += time.perf_counter() - start
+
+    def solve(self, allow_rebuild: bool = True) -> Dict:
+        """
+        Résout le modèle avec les valeurs courantes.
+
+        Les modifications sont appliquées sur place au modèle natif du
+        solveur, qui repart de la solution précédente.
+
+        Args:
+            allow_rebuild: Autorise la reconstruction du modèle natif si une
+                modification ne peut pas être appliquée sur place
+
+        Returns:
+            Dict contenant :
+            - Statut et condition de terminaison
+            - Valeur de l'objectif
+            - Temps de mise à jour et de résolution
+
+        Raises:
+            RuntimeError: Si l'optimisation échoue
+        """
+        solve_start = time.perf_counter()
+        try:
+            self.solver.solve(self.model, assign=True, disallow_rebuild=not allow_rebuild)
+        except Exception as e:
+            raise RuntimeError(f"Erreur lors de l'optimisation: {str(e)}")
+        solve_time = time.perf_counter() - solve_start
+
+        status = self.model.status
+        if status != "ok":
+            raise RuntimeError(f"Optimisation échouée avec statut: {status}")
+
+        self.network.optimize.assign_solution()
+        self.network.optimize.assign_duals(False)
+        self.network.optimize.post_processing()
+
+        result = {
+            'solve': len(self.history) + 1,
+            'status': status,
+            'termination_condition': self.model.termination_condition,
+            'objective': float(self.model.objective.value),
+            'build_seconds': self.build_seconds if not self.history else 0.0,
+            'update_seconds': self._update_seconds,
+            'solve_seconds': solve_time
+        }
+        self.history.append(result)
+        self._update_seconds = 0.0
+        return result
+
+    def get_history(self) -> pd.DataFrame:
+        """Retourne l'historique des résolutions sous forme de tableau."""
+        return pd.DataFrame(self.history)
+
+    def _get_dense(self, component: str, attr: str) -> pd.DataFrame:
+        """Retourne un attribut variable dans le temps sur les snapshots de la session."""
+        return self.network.get_switchable_as_dense(component, attr, self.snapshots)
+
+    def _expand(self,
+                values: Union[pd.Series, pd.DataFrame],
+                current: pd.DataFrame) -> pd.DataFrame:
+        """
+        Complète des nouvelles valeurs avec les valeurs courantes.
+
+        Args:
+            values: Valeurs par composant (Series) ou par snapshot et composant
+            current: Valeurs courantes (snapshots × composants)
+
+        Returns:
+            DataFrame snapshots × composants
+        """
+        updated = current.copy()
+        if isinstance(values, pd.Series):
+            columns = values.index.intersection(updated.columns)
+            updated[columns] = values[columns].values
+        else:
+            values = values.reindex(index=self.snapshots)
+            columns = values.columns.intersection(updated.columns)
+            updated[columns] = values[columns].fillna(updated[columns])
+        return updated
+
+    def _to_dataarray(self, df: pd.DataFrame, names) -> xr.DataArray:
+        """Convertit un tableau snapshots × composants aux dimensions du modèle."""
+        return xr.DataArray(
+            df.loc[self.snapshots, names].values,
+            coords={"snapshot": self.snapshots, "name": names},
+            dims=["snapshot", "name"]
+        )
+
+    def _generator_cost_term(self, marginal_cost: pd.DataFrame):
+        """Terme de l'objectif lié aux coûts marginaux des générateurs."""
+        variable = self.model["Generator-p"]
+        names = variable.coords["name"].values
+        weights = self.network.snapshot_weightings.objective.loc[self.snapshots]
+        coefficients = marginal_cost[names].mul(weights, axis=0)
+        return (variable * self._to_dataarray(coefficients, names)).sum()
@@ -10,6 +10,12 @@ Example:
     >>> analyzer = PowerFlowAnalyzer(network)
     >>> success = analyzer.run_power_flow()
     >>> results = analyzer.get_line_statistics()
+    >>> # Flux DC de tous les snapshots par la matrice PTDF
+    >>> success = analyzer.run_power_flow(mode="ptdf")
+    >>> # Analyse de sécurité N-1 par facteurs LODF
+    >>> overloads = analyzer.run_contingency_analysis(threshold=100.0)
+    >>> # Flux AC avec répartition des pertes sur les générateurs
+    >>> redispatch = analyzer.run_loss_redispatch(distribution="merit_order")
 
 Notes:
     Les calculs utilisent les données de :
@@ -21,10 +27,159 @@ Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
                 Add Contributor here
 """
 
+import functools
+import hashlib
+import multiprocessing
+import time
 import pypsa
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional, Tuple
 import numpy as np
+from scipy.sparse import bmat, csc_matrix, csr_matrix, diags
+from scipy.sparse.linalg import splu
+
+from .interconnections import DEFAULT_IMPORT_POINTS, IMPORT_CARRIER
+
+
+def _screen_outages(flows: np.ndarray,
+                    lodf: np.ndarray,
+                    limits: np.ndarray,
+                    outages: np.ndarray,
+                    threshold: float,
+                    max_elements: int) -> List[Tuple]:
+    """
+    Évalue un groupe de défauts de ligne sur tous les snapshots.
+
+    Le flux après perte de la ligne k est f_l + LODF[l, k] * f_k. Les défauts
+    sont traités par blocs de façon vectorisée (snapshots × lignes × défauts),
+    la taille des blocs étant limitée à max_elements valeurs.
+
+    Args:
+        flows: Flux de base (snapshots × lignes)
+        lodf: Matrice LODF (lignes × lignes)
+        limits: Capacité des lignes en MW
+        outages: Positions des lignes en défaut à évaluer
+        threshold: Seuil de surcharge en pourcentage de la capacité
+        max_elements: Nombre maximal de valeurs par bloc
+
+    Returns:
+        Liste de tuples (défaut, ligne, chargement max %, flux max MW,
+        nombre de snapshots en surcharge, position du pire snapshot)
+    """
+    n_snapshots, n_lines = flows.shape
+    chunk = max(1, max_elements // max(1, n_snapshots * n_lines))
+    violations = []
+
+    for start in range(0, len(outages), chunk):
+        block = outages[start:start + chunk]
+        post = flows[:, :, None] + lodf[None, :, block] * flows[:, None, block]
+        loading = np.abs(post) / limits[None, :, None] * 100
+
+        overloaded = loading > threshold
+        counts = overloaded.sum(axis=0)
+        lines_i, outages_i = np.nonzero(counts)
+        if len(lines_i) == 0:
+            continue
+
+        worst = loading[:, lines_i, outages_i].argmax(axis=0)
+        for line, outage, snapshot in zip(lines_i, outages_i, worst):
+            violations.append((
+                block[outage], line,
+                loading[snapshot, line, outage],
+                abs(post[snapshot, line, outage]),
+                counts[line, outage],
+                snapshot
+            ))
+
+    return violations
+
+
+def _allocate_slack(mismatch: np.ndarray,
+                    headroom_up: np.ndarray,
+                    headroom_down: np.ndarray,
+                    distribution: str) -> np.ndarray:
+    """
+    Répartit l'écart du générateur de référence entre les autres générateurs.
+
+    Args:
+        mismatch: Écart à compenser par snapshot en MW (positif = hausse)
+        headroom_up: Marges à la hausse (snapshots × générateurs), générateurs
+            triés par coût marginal croissant
+        headroom_down: Marges à la baisse, dans le même ordre
+        distribution: 'merit_order' ou 'proportional'
+
+    Returns:
+        Variations des consignes (snapshots × générateurs) en MW
+    """
+    up = np.clip(mismatch, 0, None)[:, None]
+    down = np.clip(-mismatch, 0, None)[:, None]
+
+    if distribution == "merit_order":
+        # Hausse des moins chers d'abord, baisse des plus chers d'abord
+        before_up = np.cumsum(headroom_up, axis=1) - headroom_up
+        before_down = np.cumsum(headroom_down[:, ::-1], axis=1)[:, ::-1] - headroom_down
+        delta_up = np.clip(up - before_up, 0, headroom_up)
+        delta_down = np.clip(down - before_down, 0, headroom_down)
+    else:
+        # Participation au prorata des marges disponibles
+        total_up = headroom_up.sum(axis=1, keepdims=True)
+        total_down = headroom_down.sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta_up = np.nan_to_num(headroom_up * np.minimum(up / total_up, 1.0))
+            delta_down = np.nan_to_num(headroom_down * np.minimum(down / total_down, 1.0))
+
+    return delta_up - delta_down
+
+
+def _ac_jacobian(Y: csr_matrix, V: np.ndarray, n_pv: int) -> csc_matrix:
+    """
+    Calcule la jacobienne du Newton-Raphson AC d'un sous-réseau.
+
+    Les bus sont ordonnés comme sub_network.buses_o (référence, PV puis PQ)
+    et les inconnues sont les angles des bus PV et PQ puis les modules des
+    bus PQ, comme dans PyPSA.
+
+    Args:
+        Y: Matrice d'admittance nodale
+        V: Tensions complexes des bus en pu
+        n_pv: Nombre de bus PV
+
+    Returns:
+        Jacobienne creuse au format CSC (prête pour la factorisation LU)
+    """
+    current = Y @ V
+    diag_v = diags(V)
+    diag_norm = diags(V / np.abs(V))
+
+    dS_dVa = 1j * diag_v @ (diags(current) - Y @ diag_v).conj()
+    dS_dVm = diags(V / np.abs(V) * np.conj(current)) + diag_v @ (Y @ diag_norm).conj()
+
+    return bmat([
+        [dS_dVa[1:, 1:].real, dS_dVm[1:, 1 + n_pv:].real],
+        [dS_dVa[1 + n_pv:, 1:].imag, dS_dVm[1 + n_pv:, 1 + n_pv:].imag]
+    ], format="csc")
+
+
+def _memoized(method):
+    """
+    Met en cache le résultat d'une méthode d'analyse pour la solution courante.
+
+    La clé associe le numéro de calcul (solve_generation), le mode de calcul,
+    le nom de la méthode et ses arguments. Le cache est vidé à chaque nouveau
+    calcul de flux ; les objets retournés sont partagés et ne doivent pas
+    être modifiés.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        arguments = tuple(tuple(a) if isinstance(a, list) else a for a in args)
+        options = tuple(sorted((k, tuple(v) if isinstance(v, list) else v)
+                               for k, v in kwargs.items()))
+        key = (self.solve_generation, self.solve_mode, method.__name__, arguments, options)
+        if key not in self._results_cache:
+            self._results_cache[key] = method(self, *args, **kwargs)
+        return self._results_cache[key]
+    return wrapper
 
 
 class PowerFlowAnalyzer:
@@ -36,22 +191,39 @@ class PowerFlowAnalyzer:
 
     Attributes:
         network (pypsa.Network): Réseau à analyser
-        mode (str): Mode de calcul par défaut ('ac' ou 'dc')
+        mode (str): Mode de calcul par défaut ('ac', 'ac_sweep', 'dc' ou 'ptdf')
         results_available (bool): Indique si des résultats sont disponibles
+        solve_generation (int): Numéro du dernier calcul de flux
+        solve_mode (str): Mode du dernier calcul de flux
     """
 
+    # Dépassement relatif du seuil toléré avant qu'une ligne soit surchargée
+    OVERLOAD_TOLERANCE = 1e-6
+
     def __init__(self, network: pypsa.Network, mode: str = "dc"):
         """
         Initialise l'analyseur de flux de puissance.
 
         Args:
             network: Réseau PyPSA à analyser
-            mode: Mode de calcul par défaut ('ac' ou 'dc')
+            mode: Mode de calcul par défaut ('ac', 'ac_sweep', 'dc' ou 'ptdf')
         """
         self.network = network
         self.mode = mode
         self.results_available = False
 
+        # Matrices PTDF/LODF en cache et empreintes de la topologie associée
+        self._ptdf = None
+        self._ptdf_signature = None
+        self._lodf = None
+        self._lodf_signature = None
+        self.islanding_outages = []
+
+        # Résultats d'analyse mis en cache pour le calcul courant
+        self.solve_generation = 0
+        self.solve_mode = None
+        self._results_cache = {}
+
     def run_power_flow(self, 
                       snapshot: Optional[str] = None,
                       mode: Optional[str] = None) -> bool:
@@ -60,7 +232,11 @@ class PowerFlowAnalyzer:
 
         Args:
             snapshot: Instant spécifique à calculer
-            mode: Mode de calcul (utilise le mode par défaut si None)
+            mode: Mode de calcul (utilise le mode par défaut si None).
+                'ptdf' calcule les flux DC de tous les snapshots en un seul
+                produit matriciel (voir run_ptdf_flow). 'ac_sweep' enchaîne
+                les calculs AC en partant de la solution précédente
+                (voir run_ac_sweep).
 
         Returns:
             bool: True si le calcul a convergé
@@ -70,10 +246,16 @@ class PowerFlowAnalyzer:
         """
         try:
             calc_mode = mode if mode else self.mode
-            
+            self._start_solve(calc_mode)
+
             if calc_mode == "ac":
                 self.network.lpf(snapshots=snapshot)
                 success = self.network.pf(snapshots=snapshot,x_tol=1e-5)
+            elif calc_mode == "ptdf":
+                success = self.run_ptdf_flow(snapshots=snapshot)
+            elif calc_mode == "ac_sweep":
+                sweep = self.run_ac_sweep(snapshots=snapshot)
+                success = bool(sweep['converged'].all())
             else:
                 success = self.network.lpf(snapshots=snapshot)
 
@@ -85,34 +267,93 @@ class PowerFlowAnalyzer:
             self.results_available = False
             return False
 
-    def get_line_loading(self) -> pd.DataFrame:
+    def _start_solve(self, mode: str) -> None:
+        """Ouvre un nouveau calcul de flux : les résultats en cache sont invalidés."""
+        self.solve_generation += 1
+        self.solve_mode = mode
+        self._results_cache.clear()
+
+    def invalidate_results(self) -> None:
+        """
+        Vide le cache des résultats d'analyse.
+
+        À appeler si network.lines_t ou network.buses_t sont modifiés hors
+        de l'analyseur (calcul lancé directement sur le réseau, par exemple).
+        """
+        self._results_cache.clear()
+
+    @_memoized
+    def get_line_loading(self, time_resolved: bool = False) -> pd.DataFrame:
         """
         Calcule le chargement des lignes.
 
+        Args:
+            time_resolved: Retourne le chargement de chaque snapshot plutôt
+                que le maximum sur l'horizon
+
         Returns:
             DataFrame avec pour chaque ligne :
             - Chargement en pourcentage
             - Flux de puissance
             - Marge disponible
+            Si time_resolved, DataFrame snapshots × lignes du chargement en
+            pourcentage.
         """
-        if not self.results_available or self.network.lines_t.p0.empty:
-            raise RuntimeError("Aucun résultat de calcul disponible")
+        lines, abs_flow, capacity = self._get_line_flow_arrays()
 
-        # Calculer le chargement en utilisant p0 (flux de puissance) et s_nom (capacité)
-        power_flow = self.network.lines_t.p0
-        capacity = self.network.lines.s_nom
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if time_resolved:
+                return pd.DataFrame(abs_flow / capacity * 100,
+                                    index=self.network.lines_t.p0.index, columns=lines)
 
-        # Calculer le pourcentage de chargement manuellement
-        loading_percent = (power_flow.abs() / capacity) * 100
+            # fmax ignore les NaN, comme les agrégations pandas
+            max_flow = np.fmax.reduce(abs_flow, axis=0)
+            return pd.DataFrame({
+                'loading_percent': max_flow / capacity * 100,
+                'power_flow_mw': max_flow,
+                'remaining_capacity_mw': capacity - max_flow
+            }, index=lines)
 
-        results = pd.DataFrame({
-            'loading_percent': loading_percent.max(),
-            'power_flow_mw': power_flow.abs().max(),
-            'remaining_capacity_mw': capacity - power_flow.abs().max()
-        })
+    @_memoized
+    def get_loading_percentiles(self,
+                                percentiles: Tuple[float, ...] = (50, 90, 95, 99)) -> pd.DataFrame:
+        """
+        Résume la distribution temporelle du chargement des lignes.
 
-        return results
+        Args:
+            percentiles: Centiles à calculer (entre 0 et 100)
+
+        Returns:
+            DataFrame lignes × centiles du chargement en pourcentage
+        """
+        lines, abs_flow, capacity = self._get_line_flow_arrays()
+        values = np.nanpercentile(abs_flow, percentiles, axis=0)
 
+        with np.errstate(divide="ignore", invalid="ignore"):
+            loading = values.T / capacity[:, None] * 100
+
+        return pd.DataFrame(loading, index=lines,
+                            columns=[f"p{q:g}" for q in percentiles])
+
+    def _get_line_flow_arrays(self) -> Tuple[pd.Index, np.ndarray, np.ndarray]:
+        """
+        Extrait en une passe les flux absolus et les capacités des lignes.
+
+        Returns:
+            Tuple (lignes, flux absolus snapshots × lignes en MW, capacités en MW)
+
+        Raises:
+            RuntimeError: Si aucun résultat n'est disponible
+        """
+        if not self.results_available or self.network.lines_t.p0.empty:
+            raise RuntimeError("Aucun résultat de calcul disponible")
+
+        p0 = self.network.lines_t.p0
+        abs_flow = np.abs(p0.to_numpy(dtype=float))
+        capacity = self.network.lines.s_nom.reindex(p0.columns).to_numpy(dtype=float)
+        return p0.columns, abs_flow, capacity
+
+    @_memoized
     def get_critical_lines(self, threshold: float = 90.0) -> Dict[str, Dict]:
         """
         Identifie les lignes fortement chargées.
@@ -136,34 +377,61 @@ class PowerFlowAnalyzer:
 
         return critical_lines
 
-    def analyze_network_losses(self) -> Dict[str, float]:
+    @_memoized
+    def analyze_network_losses(self, time_resolved: bool = False) -> Dict:
         """
         Calcule les pertes dans le réseau.
 
+        Les pertes de chaque ligne (p0 + p1) sont calculées une seule fois,
+        puis agrégées par niveau de tension par un produit avec la matrice
+        d'appartenance lignes × niveaux.
+
+        Args:
+            time_resolved: Ajoute les pertes de chaque snapshot, au total et
+                par niveau de tension
+
         Returns:
             Dict contenant :
             - Pertes totales
             - Pourcentage des pertes
             - Pertes par niveau de tension
+            - Si time_resolved : pertes par snapshot (Series) et par
+              snapshot et niveau de tension (DataFrame)
         """
         if not self.results_available:
             raise RuntimeError("Aucun résultat de calcul disponible")
 
-        total_generation = self.network.generators_t.p.sum().sum()
-        total_load = self.network.loads_t.p.sum().sum()
-        losses = self.network.lines_t.p0.sum() + self.network.lines_t.p1.sum()
+        network = self.network
+        p0 = network.lines_t.p0
+        line_losses = p0.to_numpy(dtype=float) + network.lines_t.p1.reindex(
+            index=p0.index, columns=p0.columns).to_numpy(dtype=float)
+        line_losses[np.isnan(line_losses)] = 0.0
 
-        return {
-            'total_losses_mw': float(losses.sum()),
-            'losses_percent': float(losses.sum() / total_generation * 100),
-            'losses_by_voltage': self.network.lines.groupby('type',group_keys=False).apply(
-                lambda x: (
-                    self.network.lines_t.p0[x.index].sum() - 
-                    self.network.lines_t.p1[x.index].sum()
-                ).sum()
-            ).to_dict()
+        # Matrice d'appartenance lignes × niveaux de tension
+        codes, levels = pd.factorize(network.lines.type.reindex(p0.columns), use_na_sentinel=False)
+        membership = csr_matrix(
+            (np.ones(len(codes)), (np.arange(len(codes)), codes)),
+            shape=(len(codes), len(levels))
+        )
+        losses_by_level = np.asarray(membership.T @ line_losses.T).T
+
+        total_losses = float(line_losses.sum())
+        total_generation = np.nansum(network.generators_t.p.to_numpy(dtype=float))
+
+        results = {
+            'total_losses_mw': total_losses,
+            'losses_percent': float(total_losses / total_generation * 100),
+            'losses_by_voltage': dict(zip(levels, losses_by_level.sum(axis=0).tolist()))
         }
 
+        if time_resolved:
+            results['losses_by_snapshot'] = pd.Series(line_losses.sum(axis=1), index=p0.index)
+            results['losses_by_voltage_t'] = pd.DataFrame(losses_by_level, index=p0.index,
+                                                          columns=levels)
+
+        return results
+
+    @_memoized
     def get_voltage_profile(self) -> Optional[pd.DataFrame]:
         """
         Analyse les profils de tension (mode AC uniquement).
@@ -174,7 +442,7 @@ class PowerFlowAnalyzer:
         if not self.results_available:
             raise RuntimeError("Aucun résultat de calcul disponible")
 
-        if self.mode == "dc":
+        if self.mode not in ("ac", "ac_sweep"):
             return None
 
         return pd.DataFrame({
@@ -184,4 +452,938 @@ class PowerFlowAnalyzer:
             'angle_deg': self.network.buses_t.v_ang.mean() * 180 / np.pi
         })
     
+    def compute_ptdf(self, force: bool = False) -> pd.DataFrame:
+        """
+        Calcule la matrice PTDF (Power Transfer Distribution Factors).
+
+        La matrice donne la variation du flux de chaque ligne pour une
+        injection unitaire à chaque bus, compensée au bus slack de sa
+        sous-partie connexe. Comme dans network.lpf(), les sous-réseaux à
+        courant continu (carrier 'DC') utilisent la résistance des lignes
+        (r_pu_eff) et les sous-réseaux AC leur réactance (x_pu_eff). Elle
+        est mise en cache et n'est recalculée que si les bus ou les lignes
+        (extrémités, impédance, activité) changent.
+
+        Args:
+            force: Recalcule la matrice même si la topologie est inchangée
+
+        Returns:
+            DataFrame lignes × bus des facteurs de distribution
+        """
+        signature = self._topology_signature()
+        if not force and self._ptdf is not None and signature == self._ptdf_signature:
+            return self._ptdf
+
+        network = self.network
+        network.determine_network_topology()
+        for sub_network in network.sub_networks.obj:
+            sub_network.find_bus_controls()
+
+        lines = self._get_active_lines()
+        buses = network.buses.index
+        ptdf = np.zeros((len(lines), len(buses)))
+        bus_positions = pd.Series(np.arange(len(buses)), index=buses)
+        line_positions = pd.Series(np.arange(len(lines)), index=lines.index)
+
+        # Une matrice indépendante par sous-réseau connexe (îlot)
+        sub_networks = network.sub_networks
+        for sub_network, slack_bus in sub_networks.slack_bus.items():
+            sn_lines = lines[lines.sub_network == sub_network]
+            if sn_lines.empty:
+                continue
+            sn_buses = buses[network.buses.sub_network == sub_network]
+            local = pd.Series(np.arange(len(sn_buses)), index=sn_buses)
+
+            # Incidence lignes × bus : +1 au départ, -1 à l'arrivée
+            rows = np.arange(len(sn_lines))
+            incidence = csr_matrix(
+                (np.r_[np.ones(len(rows)), -np.ones(len(rows))],
+                 (np.r_[rows, rows], np.r_[local[sn_lines.bus0].values, local[sn_lines.bus1].values])),
+                shape=(len(sn_lines), len(sn_buses))
+            )
+            impedance = "r_pu_eff" if sub_networks.at[sub_network, 'carrier'] == "DC" else "x_pu_eff"
+            H = diags(1.0 / sn_lines[impedance].values) @ incidence
+            B = (incidence.T @ H).tocsc()
+
+            # B réduite (sans le slack) inversée par factorisation LU
+            keep = np.flatnonzero(sn_buses != slack_bus)
+            block = np.zeros((len(sn_lines), len(sn_buses)))
+            if len(keep) > 0:
+                lu = splu(csc_matrix(B[keep][:, keep]))
+                block[:, keep] = lu.solve(H[:, keep].T.toarray()).T
+
+            ptdf[np.ix_(line_positions[sn_lines.index].values,
+                        bus_positions[sn_buses].values)] = block
+
+        self._ptdf = pd.DataFrame(ptdf, index=lines.index, columns=buses)
+        self._ptdf_signature = signature
+        return self._ptdf
+
+    def invalidate_ptdf(self) -> None:
+        """Force le recalcul des matrices PTDF et LODF au prochain appel."""
+        self._ptdf = None
+        self._ptdf_signature = None
+        self._lodf = None
+        self._lodf_signature = None
+
+    def run_ptdf_flow(self, snapshots=None) -> bool:
+        """
+        Calcule les flux DC de plusieurs snapshots par la matrice PTDF.
+
+        Les injections nodales sont construites comme dans network.lpf()
+        (consignes p_set des composants), puis les flux de tous les snapshots
+        sont obtenus en un seul produit matriciel injections × PTDF.
+
+        Args:
+            snapshots: Snapshot ou liste de snapshots (tous si None)
+
+        Returns:
+            bool: True si le calcul a réussi
+
+        Note:
+            Stocke les résultats dans network.lines_t.p0, network.lines_t.p1
+            et network.buses_t.p, comme network.lpf().
+        """
+        self._start_solve("ptdf")
+        network = self.network
+        snapshots = self._get_snapshot_index(snapshots)
+
+        ptdf = self.compute_ptdf()
+        injections = self._get_bus_injections(snapshots)
+        flows = injections.values @ ptdf.values.T
+
+        p0 = network.lines_t.p0.reindex(index=network.snapshots, columns=ptdf.index)
+        p0.loc[snapshots] = flows
+        network.lines_t.p0 = p0
+        network.lines_t.p1 = -p0
+
+        bus_p = network.buses_t.p.reindex(index=network.snapshots, columns=network.buses.index)
+        bus_p.loc[snapshots] = injections.values
+        network.buses_t.p = bus_p
+
+        return True
+
+    def _get_snapshot_index(self, snapshots=None) -> pd.Index:
+        """Convertit un snapshot, une liste de snapshots ou None (tous) en index."""
+        if snapshots is None:
+            return self.network.snapshots
+        if np.isscalar(snapshots) or isinstance(snapshots, pd.Timestamp):
+            return pd.Index([pd.Timestamp(snapshots)])
+        return pd.Index(snapshots)
+
+    def _get_active_lines(self) -> pd.DataFrame:
+        """Retourne les lignes actives avec leurs valeurs dérivées (x_pu_eff)."""
+        self.network.calculate_dependent_values()
+        lines = self.network.lines
+        if 'active' in lines.columns:
+            lines = lines[lines.active.astype(bool)]
+        return lines
+
+    def _topology_signature(self) -> str:
+        """
+        Calcule une empreinte des bus et des lignes actives.
+
+        Returns:
+            Empreinte hexadécimale de la topologie électrique
+        """
+        lines = self._get_active_lines()
+        digest = hashlib.sha256()
+        digest.update(pd.util.hash_pandas_object(self.network.buses.index).values.tobytes())
+        digest.update(pd.util.hash_pandas_object(lines[['bus0', 'bus1', 'x_pu_eff', 'r_pu_eff']]).values.tobytes())
+        return digest.hexdigest()
+
+    def _get_bus_injections(self, snapshots: pd.Index, attribute: str = "p_set") -> pd.DataFrame:
+        """
+        Calcule les injections nodales à partir des consignes p_set (ou q_set).
+
+        Args:
+            snapshots: Snapshots à calculer
+            attribute: Consigne utilisée ('p_set' ou 'q_set')
+
+        Returns:
+            DataFrame snapshots × bus des injections en MW (ou Mvar)
+        """
+        network = self.network
+        buses = network.buses.index
+        injections = pd.DataFrame(0.0, index=snapshots, columns=buses)
+
+        for component, list_name in [("Generator", "generators"), ("Load", "loads"),
+                                     ("StorageUnit", "storage_units"), ("Store", "stores")]:
+            static = getattr(network, list_name)
+            if static.empty:
+                continue
+            setpoint = network.get_switchable_as_dense(component, attribute, snapshots).fillna(0)
+            setpoint = setpoint * static.sign
+            injections += setpoint.T.groupby(static.bus).sum().T.reindex(columns=buses, fill_value=0.0)
+
+        # Les liens contrôlables soutirent p0 au bus0 et p1 au bus1
+        if attribute == "p_set" and not network.links.empty:
+            for i in (0, 1):
+                p = network.links_t[f"p{i}"].reindex(index=snapshots, columns=network.links.index).fillna(0)
+                injections -= p.T.groupby(network.links[f"bus{i}"]).sum().T.reindex(
+                    columns=buses, fill_value=0.0
+                )
+
+        return injections
+
+    def compute_lodf(self) -> pd.DataFrame:
+        """
+        Calcule la matrice LODF (Line Outage Distribution Factors).
+
+        LODF[l, k] est la fraction du flux de la ligne k reportée sur la
+        ligne l lorsque k est retirée du réseau (LODF[k, k] = -1). Les
+        colonnes des lignes dont la perte isole une partie du réseau
+        (lignes radiales) valent NaN. La matrice est dérivée de la PTDF et
+        mise en cache avec la même empreinte de topologie.
+
+        Returns:
+            DataFrame lignes × lignes en défaut
+        """
+        ptdf = self.compute_ptdf()
+        if self._lodf is not None and self._lodf_signature == self._ptdf_signature:
+            return self._lodf
+
+        lines = self._get_active_lines().loc[ptdf.index]
+        bus_positions = pd.Series(np.arange(len(ptdf.columns)), index=ptdf.columns)
+
+        # Sensibilité du flux de chaque ligne à un transfert bus0 -> bus1 de chaque ligne
+        branch_ptdf = (ptdf.values[:, bus_positions[lines.bus0].values]
+                       - ptdf.values[:, bus_positions[lines.bus1].values])
+
+        denominator = 1.0 - np.diag(branch_ptdf)
+        islanding = np.isclose(denominator, 0.0, atol=1e-8)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lodf = branch_ptdf / denominator[None, :]
+        lodf[:, islanding] = np.nan
+        np.fill_diagonal(lodf, -1.0)
+
+        self._lodf = pd.DataFrame(lodf, index=ptdf.index, columns=ptdf.index)
+        self._lodf_signature = self._ptdf_signature
+        return self._lodf
+
+    def run_contingency_analysis(self,
+                                 threshold: float = 100.0,
+                                 outages: Optional[List[str]] = None,
+                                 n_jobs: int = 1,
+                                 max_elements: int = 5_000_000) -> pd.DataFrame:
+        """
+        Analyse de sécurité N-1 sur toutes les lignes et tous les snapshots.
+
+        Les flux après chaque défaut sont obtenus à partir des flux de base
+        (lines_t.p0 du dernier calcul) et des facteurs LODF, sans relancer
+        de calcul de flux. Les défauts qui isolent une partie du réseau ne
+        sont pas évalués et sont listés dans islanding_outages.
+
+        Args:
+            threshold: Seuil de surcharge en pourcentage de s_nom
+            outages: Lignes en défaut à évaluer (toutes si None)
+            n_jobs: Nombre de processus pour répartir les défauts
+            max_elements: Taille maximale d'un bloc de calcul (mémoire)
+
+        Returns:
+            DataFrame des surcharges avec pour chaque couple (défaut, ligne) :
+            - Chargement maximal en pourcentage
+            - Flux maximal en MW
+            - Nombre de snapshots en surcharge
+            - Snapshot le plus contraignant
+        """
+        if not self.results_available or self.network.lines_t.p0.empty:
+            raise RuntimeError("Aucun résultat de calcul disponible")
+
+        lodf = self.compute_lodf()
+        line_names = lodf.index
+        flows = self.network.lines_t.p0.reindex(columns=line_names).dropna(how="all")
+        limits = self.network.lines.s_nom.reindex(line_names).values
+
+        outage_names = line_names if outages is None else pd.Index(outages)
+        islanding = lodf.columns[lodf.isna().any()]
+        self.islanding_outages = [line for line in outage_names if line in islanding]
+        positions = line_names.get_indexer(outage_names.difference(islanding, sort=False))
+
+        args = (flows.fillna(0).values, lodf.values, limits)
+        if n_jobs > 1 and len(positions) > 1:
+            chunks = np.array_split(positions, n_jobs)
+            with ProcessPoolExecutor(max_workers=n_jobs,
+                                     mp_context=multiprocessing.get_context("spawn")) as executor:
+                futures = [executor.submit(_screen_outages, *args, chunk, threshold, max_elements)
+                           for chunk in chunks]
+                violations = [v for future in futures for v in future.result()]
+        else:
+            violations = _screen_outages(*args, positions, threshold, max_elements)
+
+        results = pd.DataFrame(violations, columns=[
+            'outage', 'line', 'loading_percent', 'power_flow_mw',
+            'n_snapshots_overloaded', 'worst_snapshot'
+        ])
+        results['outage'] = line_names[results['outage'].astype(int)]
+        results['line'] = line_names[results['line'].astype(int)]
+        results['worst_snapshot'] = flows.index[results['worst_snapshot'].astype(int)]
+
+        return results.sort_values(
+            ['loading_percent', 'outage', 'line'], ascending=[False, True, True]
+        ).reset_index(drop=True)
+
+    def run_ac_sweep(self,
+                     snapshots=None,
+                     x_tol: float = 1e-5,
+                     max_iter: int = 30) -> pd.DataFrame:
+        """
+        Calcule les flux AC de tous les snapshots avec démarrage à chaud.
+
+        Chaque snapshot part des tensions (module et angle) du snapshot
+        précédent et est résolu par une méthode de Newton à jacobienne
+        figée : la factorisation LU de la jacobienne est réutilisée d'une
+        itération et d'un snapshot à l'autre, et n'est recalculée que
+        lorsque la convergence ralentit. Sur des données horaires, deux
+        snapshots voisins sont très proches et une même factorisation sert
+        à de nombreux snapshots. Le premier snapshot, ainsi que tout
+        snapshot qui ne converge pas à chaud, est résolu par un Newton
+        complet à partir d'un départ plat (1 pu, 0 rad).
+
+        Les résultats sont écrits comme par network.pf (tensions, flux des
+        lignes et transformateurs, production des générateurs de référence
+        et PV), en une seule écriture par attribut.
+
+        Args:
+            snapshots: Snapshot ou liste de snapshots (tous si None)
+            x_tol: Tolérance sur l'écart de puissance (MW/Mvar)
+            max_iter: Nombre maximal d'itérations par snapshot et par départ
+
+        Returns:
+            DataFrame indexé par snapshot avec :
+            - Type de démarrage retenu ('flat', 'warm' ou 'flat_fallback')
+            - Nombre d'itérations et de factorisations de la jacobienne
+            - Convergence et erreur finale
+        """
+        self._start_solve("ac_sweep")
+        network = self.network
+        snapshots = self._get_snapshot_index(snapshots)
+
+        network.determine_network_topology()
+        network.calculate_dependent_values()
+
+        buses = network.buses.index
+        p = self._get_bus_injections(snapshots, attribute="p_set")
+        q = self._get_bus_injections(snapshots, attribute="q_set")
+        s = p.to_numpy() + 1j * q.to_numpy()
+        v_set = network.get_switchable_as_dense("Bus", "v_mag_pu_set", snapshots).reindex(
+            columns=buses).to_numpy(dtype=float)
+
+        v_mag = np.ones((len(snapshots), len(buses)))
+        v_ang = np.zeros((len(snapshots), len(buses)))
+        s_calc = s.copy()
+        generator_delta = pd.DataFrame(0j, index=snapshots, columns=network.generators.index)
+        branch_flows = {}
+
+        records = pd.DataFrame({
+            'start': 'warm',
+            'n_iter': 0,
+            'factorizations': 0,
+            'converged': True,
+            'error': 0.0
+        }, index=snapshots)
+        records.iloc[0, records.columns.get_loc('start')] = 'flat'
+
+        for sub_network in network.sub_networks.obj:
+            sub_network.find_bus_controls()
+            idx = buses.get_indexer(sub_network.buses_o)
+            n_fixed = 1 + len(sub_network.pvs)
+
+            if len(sub_network.branches_i(active_only=True)) > 0:
+                sub_network.calculate_Y(skip_pre=True)
+                sweep = self._sweep_sub_network(sub_network, s[:, idx], v_set[:, idx[:n_fixed]],
+                                                x_tol, max_iter)
+                v_mag[:, idx] = sweep['v_mag']
+                v_ang[:, idx] = sweep['v_ang']
+                V = sweep['v_mag'] * np.exp(1j * sweep['v_ang'])
+                s_calc[:, idx] = V * np.conj((sub_network.Y @ V.T).T)
+
+                records['n_iter'] = np.maximum(records['n_iter'].to_numpy(), sweep['n_iter'])
+                records['factorizations'] += sweep['factorizations']
+                records['converged'] &= sweep['error'] <= x_tol
+                records['error'] = np.maximum(records['error'].to_numpy(), sweep['error'])
+                records.loc[sweep['fallback'], 'start'] = 'flat_fallback'
+
+                self._add_branch_flows(sub_network, V, branch_flows)
+            else:
+                # Sous-réseau à un bus : le générateur de référence équilibre le bus
+                v_mag[:, idx] = v_set[:, idx]
+                s_calc[:, idx] = 0.0
+
+            # Écarts repris par les générateurs de référence et PV
+            if sub_network.slack_generator is not None:
+                generator_delta[sub_network.slack_generator] += s_calc[:, idx[0]] - s[:, idx[0]]
+            if len(sub_network.pvs) > 0:
+                pv_generators = network.buses.loc[sub_network.pvs, 'generator']
+                generator_delta[pv_generators.to_numpy()] += 1j * (
+                    s_calc[:, idx[1:n_fixed]] - s[:, idx[1:n_fixed]]).imag
+
+            # Injections équilibrées (nulles pour un sous-réseau à un bus) ;
+            # PyPSA conserve l'injection des bus PQ
+            s[:, idx[0]] = s_calc[:, idx[0]]
+            s[:, idx[1:n_fixed]] = s[:, idx[1:n_fixed]].real + 1j * s_calc[:, idx[1:n_fixed]].imag
+
+        self._store_ac_results(snapshots, v_mag, v_ang, s, generator_delta, branch_flows)
+
+        records.index.name = 'snapshot'
+        self.results_available = bool(records['converged'].all())
+        return records
+
+    def _sweep_sub_network(self,
+                           sub_network,
+                           s: np.ndarray,
+                           v_fixed: np.ndarray,
+                           x_tol: float,
+                           max_iter: int) -> Dict[str, np.ndarray]:
+        """
+        Résout le flux AC d'un sous-réseau sur une suite de snapshots.
+
+        Newton à jacobienne figée : la factorisation LU est conservée tant
+        que l'erreur diminue au moins de moitié à chaque itération. Les
+        départs plats (premier snapshot et replis) refactorisent la
+        jacobienne à chaque itération.
+
+        Args:
+            sub_network: Sous-réseau PyPSA préparé (Y, buses_o, pvs, pqs)
+            s: Injections complexes (snapshots × buses_o) en MVA
+            v_fixed: Modules imposés du bus de référence et des bus PV en pu
+            x_tol: Tolérance sur l'écart de puissance
+            max_iter: Nombre maximal d'itérations par snapshot et par départ
+
+        Returns:
+            Dictionnaire de tableaux par snapshot : 'v_mag', 'v_ang',
+            'n_iter', 'factorizations', 'fallback' (repli sur un départ
+            plat) et 'error'
+        """
+        n_pv = len(sub_network.pvs)
+        n_pvpq = len(sub_network.pvpqs)
+        Y = sub_network.Y.tocsr()
+        n_snapshots, n_buses = s.shape
+
+        result = {
+            'v_mag': np.empty((n_snapshots, n_buses)),
+            'v_ang': np.empty((n_snapshots, n_buses)),
+            'n_iter': np.zeros(n_snapshots, dtype=int),
+            'factorizations': np.zeros(n_snapshots, dtype=int),
+            'fallback': np.zeros(n_snapshots, dtype=bool),
+            'error': np.zeros(n_snapshots)
+        }
+
+        def mismatch(V, s_now):
+            power = V * np.conj(Y @ V) - s_now
+            return np.r_[power.real[1:], power.imag[1 + n_pv:]]
+
+        v_mag = np.ones(n_buses)
+        v_ang = np.zeros(n_buses)
+        seed = (v_mag.copy(), v_ang.copy())
+        lu = None
+
+        for i in range(n_snapshots):
+            starts = ("flat",) if i == 0 else ("warm", "flat")
+            for start in starts:
+                if start == "flat":
+                    result['fallback'][i] = i > 0
+                    v_mag[1 + n_pv:] = 1.0
+                    v_ang[:] = 0.0
+                v_mag[:1 + n_pv] = v_fixed[i]
+                v_ang[0] = 0.0
+
+                V = v_mag * np.exp(1j * v_ang)
+                F = mismatch(V, s[i])
+                error = np.abs(F).max()
+                iterations = 0
+                while error > x_tol and iterations < max_iter:
+                    if lu is None or start == "flat":
+                        lu = splu(_ac_jacobian(Y, V, n_pv))
+                        result['factorizations'][i] += 1
+
+                    step = lu.solve(F)
+                    v_ang[1:] -= step[:n_pvpq]
+                    v_mag[1 + n_pv:] -= step[n_pvpq:]
+                    V = v_mag * np.exp(1j * v_ang)
+                    F = mismatch(V, s[i])
+                    previous_error, error = error, np.abs(F).max()
+                    iterations += 1
+
+                    # Jacobienne périmée : convergence trop lente
+                    if not error < 0.5 * previous_error:
+                        lu = None
+
+                result['n_iter'][i] += iterations
+                if error <= x_tol:
+                    break
+
+            result['v_mag'][i] = v_mag
+            result['v_ang'][i] = v_ang
+            result['error'][i] = error
+
+            # Le snapshot suivant part de la dernière solution convergée
+            if error <= x_tol:
+                seed = (v_mag.copy(), v_ang.copy())
+            else:
+                v_mag, v_ang = seed[0].copy(), seed[1].copy()
+                lu = None
+
+        return result
+
+    def _add_branch_flows(self,
+                          sub_network,
+                          V: np.ndarray,
+                          branch_flows: Dict[str, Dict[str, pd.DataFrame]]) -> None:
+        """
+        Calcule les puissances aux deux extrémités des branches d'un sous-réseau.
+
+        Args:
+            sub_network: Sous-réseau PyPSA préparé (Y0, Y1, buses_o)
+            V: Tensions complexes (snapshots × buses_o) en pu
+            branch_flows: Dictionnaire complété par type de branche
+                ('Line', 'Transformer') avec les puissances s0 et s1
+        """
+        branches = sub_network.branches_i(active_only=True)
+        bus0 = sub_network.buses_o.get_indexer(sub_network.branches().loc[branches, 'bus0'])
+        bus1 = sub_network.buses_o.get_indexer(sub_network.branches().loc[branches, 'bus1'])
+
+        s0 = V[:, bus0] * np.conj((sub_network.Y0 @ V.T).T)
+        s1 = V[:, bus1] * np.conj((sub_network.Y1 @ V.T).T)
+
+        for branch_type in branches.unique("type"):
+            mask = branches.get_level_values("type") == branch_type
+            names = branches[mask].get_level_values("name")
+            flows = branch_flows.setdefault(branch_type, {'s0': [], 's1': []})
+            flows['s0'].append(pd.DataFrame(s0[:, mask], columns=names))
+            flows['s1'].append(pd.DataFrame(s1[:, mask], columns=names))
+
+    def _store_ac_results(self,
+                          snapshots: pd.Index,
+                          v_mag: np.ndarray,
+                          v_ang: np.ndarray,
+                          s: np.ndarray,
+                          generator_delta: pd.DataFrame,
+                          branch_flows: Dict[str, Dict[str, List[pd.DataFrame]]]) -> None:
+        """
+        Écrit les résultats du balayage AC dans les séries du réseau.
+
+        Args:
+            snapshots: Snapshots calculés
+            v_mag: Modules des tensions (snapshots × bus) en pu
+            v_ang: Angles des tensions (snapshots × bus) en rad
+            s: Puissances complexes injectées aux bus (snapshots × bus)
+            generator_delta: Puissance complexe reprise par les générateurs
+                de référence et PV en plus de leur consigne
+            branch_flows: Puissances des branches par type (voir _add_branch_flows)
+        """
+        network = self.network
+
+        def store(list_name, attr, values):
+            static = getattr(network, list_name)
+            dynamic = getattr(network, f"{list_name}_t")
+            frame = dynamic[attr].reindex(index=network.snapshots, columns=static.index,
+                                          fill_value=0.0)
+            frame.loc[snapshots, values.columns] = values.to_numpy()
+            dynamic[attr] = frame
+
+        buses = network.buses.index
+        store("buses", "v_mag_pu", pd.DataFrame(v_mag, columns=buses))
+        store("buses", "v_ang", pd.DataFrame(v_ang, columns=buses))
+        store("buses", "p", pd.DataFrame(s.real, columns=buses))
+        store("buses", "q", pd.DataFrame(s.imag, columns=buses))
+
+        for component, list_name in [("Generator", "generators"), ("Load", "loads"),
+                                     ("StorageUnit", "storage_units"), ("Store", "stores")]:
+            static = getattr(network, list_name)
+            if static.empty:
+                continue
+            p_set = network.get_switchable_as_dense(component, "p_set", snapshots).fillna(0)
+            q_set = network.get_switchable_as_dense(component, "q_set", snapshots).fillna(0)
+            if component == "Generator":
+                p_set = p_set + generator_delta.to_numpy().real
+                q_set = q_set + generator_delta.to_numpy().imag
+            store(list_name, "p", p_set)
+            store(list_name, "q", q_set)
+
+        for branch_type, flows in branch_flows.items():
+            list_name = network.c[branch_type].list_name
+            s0 = pd.concat(flows['s0'], axis=1)
+            s1 = pd.concat(flows['s1'], axis=1)
+            store(list_name, "p0", pd.DataFrame(s0.to_numpy().real, columns=s0.columns))
+            store(list_name, "q0", pd.DataFrame(s0.to_numpy().imag, columns=s0.columns))
+            store(list_name, "p1", pd.DataFrame(s1.to_numpy().real, columns=s1.columns))
+            store(list_name, "q1", pd.DataFrame(s1.to_numpy().imag, columns=s1.columns))
+
+    def run_loss_redispatch(self,
+                            snapshots=None,
+                            distribution: str = "merit_order",
+                            tol: float = 1e-3,
+                            max_iter: int = 10,
+                            x_tol: float = 1e-5,
+                            use_optimal_dispatch: bool = True) -> Dict:
+        """
+        Calcule les flux AC en répartissant les pertes entre les générateurs.
+
+        Le dispatch optimal (sans pertes) est d'abord appliqué comme consigne,
+        les pertes AC sont alors prises par le générateur de référence de
+        chaque sous-réseau. Son écart à sa consigne est ensuite réparti sur
+        les autres générateurs du sous-réseau, dans la limite de leurs
+        marges, et le calcul AC est relancé à chaud pour les seuls snapshots
+        non convergés. Tous les snapshots sont traités ensemble à chaque
+        itération. Les snapshots dont le calcul AC ne converge pas sont
+        retirés de la redistribution (leur écart n'a pas de sens) et
+        signalés par pf_converged. Les consignes du réseau (generators_t.p_set) sont
+        restaurées à la fin du calcul ; les consignes redistribuées sont
+        retournées.
+
+        Args:
+            snapshots: Snapshot ou liste de snapshots (tous si None)
+            distribution: Répartition de l'écart :
+                'merit_order' (générateurs les moins chers d'abord) ou
+                'proportional' (au prorata des marges disponibles)
+            tol: Écart toléré sur les générateurs de référence, en fraction
+                de la charge totale du snapshot
+            max_iter: Nombre maximal de redistributions
+            x_tol: Tolérance du Newton-Raphson
+            use_optimal_dispatch: Part de la production optimisée
+                (network.generators_t.p) plutôt que des consignes p_set
+
+        Returns:
+            Dict contenant :
+            - iterations : Nombre de redistributions effectuées
+            - converged : True si le calcul AC a convergé et si l'écart
+              est sous la tolérance partout
+            - pf_converged : Convergence du calcul AC par snapshot
+            - residual : Écart restant par snapshot en MW
+            - history : Écart maximal en MW après chaque calcul AC
+            - losses : Pertes par snapshot en MW
+            - p_set : Consignes redistribuées (snapshots × générateurs)
+
+        Raises:
+            ValueError: Si le mode de répartition n'est pas supporté
+        """
+        if distribution not in ("merit_order", "proportional"):
+            raise ValueError(f"Mode de répartition non supporté: {distribution}")
+
+        self._start_solve("ac_redispatch")
+        network = self.network
+        snapshots = self._get_snapshot_index(snapshots)
+        generators = network.generators
+
+        p_set = network.get_switchable_as_dense("Generator", "p_set")
+        if use_optimal_dispatch:
+            dispatch = network.generators_t.p.reindex(index=snapshots, columns=generators.index)
+            p_set.loc[snapshots] = dispatch.fillna(p_set.loc[snapshots])
+
+        # Les consignes modifiées ne servent qu'au calcul : celles du réseau sont restaurées
+        original_p_set = network.generators_t.p_set
+        network.generators_t.p_set = p_set
+        try:
+            capacity = generators.p_nom_opt.where(generators.p_nom_extendable, generators.p_nom)
+            p_max = network.get_switchable_as_dense("Generator", "p_max_pu", snapshots) * capacity
+            p_min = network.get_switchable_as_dense("Generator", "p_min_pu", snapshots) * capacity
+
+            pf_converged = network.pf(snapshots=snapshots, x_tol=x_tol)['converged'].all(axis=1)
+
+            # Générateur de référence et participants (par ordre de mérite) de chaque sous-réseau
+            generator_sub_network = generators.bus.map(network.buses.sub_network)
+            islands = []
+            for name, sub_network in network.sub_networks.obj.items():
+                slack = getattr(sub_network, "slack_generator", None)
+                if not slack:
+                    continue
+                in_island = (generator_sub_network == name) & (generators.index != slack)
+                participants = generators[in_island].sort_values("marginal_cost", kind="stable").index
+                if len(participants) > 0:
+                    islands.append((slack, participants))
+
+            slacks = [slack for slack, _ in islands]
+            threshold = tol * network.loads_t.p.reindex(index=snapshots).sum(axis=1).abs()
+            history = []
+            iterations = 0
+
+            while True:
+                mismatch = (network.generators_t.p.loc[snapshots, slacks]
+                            - network.generators_t.p_set.loc[snapshots, slacks])
+                residual = mismatch.abs().max(axis=1).fillna(0.0)
+                history.append(float(residual.max()))
+
+                pending = snapshots[((residual > threshold) & pf_converged).values]
+                if len(pending) == 0 or iterations >= max_iter:
+                    break
+
+                moved = False
+                for slack, participants in islands:
+                    current = network.generators_t.p_set.loc[pending, participants].values
+                    delta = _allocate_slack(
+                        mismatch.loc[pending, slack].values,
+                        np.clip(p_max.loc[pending, participants].values - current, 0, None),
+                        np.clip(current - p_min.loc[pending, participants].values, 0, None),
+                        distribution
+                    )
+                    if np.any(delta != 0):
+                        network.generators_t.p_set.loc[pending, participants] = current + delta
+                        moved = True
+
+                # Plus aucune marge disponible : l'écart reste sur la référence
+                if not moved:
+                    break
+
+                result = network.pf(snapshots=pending, x_tol=x_tol, use_seed=True, skip_pre=True)
+                pf_converged.loc[pending] = result['converged'].all(axis=1)
+                iterations += 1
+
+            p_set = network.generators_t.p_set.loc[snapshots].copy()
+        finally:
+            network.generators_t.p_set = original_p_set
+
+        if not pf_converged.all():
+            print(f"Calcul AC non convergé pour {(~pf_converged).sum()} snapshot(s) : "
+                  f"{list(snapshots[~pf_converged.values])}")
+
+        self.results_available = bool(pf_converged.all())
+        return {
+            'iterations': iterations,
+            'converged': bool(((residual <= threshold) & pf_converged).all()),
+            'pf_converged': pf_converged,
+            'residual': residual,
+            'history': history,
+            'losses': network.buses_t.p.loc[snapshots].sum(axis=1),
+            'p_set': p_set
+        }
+
+    def relieve_overloads(self,
+                          threshold: float = 100.0,
+                          import_points: Optional[Dict[str, Dict]] = None,
+                          reinforce: bool = True,
+                          max_circuits: int = 3,
+                          max_iter: int = 5) -> Dict:
+        """
+        Lève les surcharges par des imports puis par l'ajout de lignes.
+
+        Chaque itération traite ensemble toutes les lignes au-delà du seuil
+        (get_critical_lines) :
+        - Les imports (Ottawa, New York par défaut) sont augmentés là où ils
+          soulagent les lignes surchargées ; la production des autres
+          générateurs du sous-réseau baisse d'autant, au prorata de leur
+          consigne. Les flux sont mis à jour par les facteurs de
+          sensibilité (PTDF), sans nouveau calcul.
+        - Les lignes encore surchargées sont doublées par des circuits
+          identiques en parallèle. Le nombre de circuits et le report sur
+          les autres lignes sont déduits de la PTDF de la ligne.
+        Un seul calcul de flux (run_ptdf_flow) vérifie le résultat en fin
+        d'itération ; il corrige les interactions entre actions simultanées.
+        Une ligne n'est surchargée qu'au-delà du seuil augmenté de
+        OVERLOAD_TOLERANCE (relatif) : une ligne ramenée exactement au seuil
+        ne déclenche pas une itération de plus pour une erreur d'arrondi.
+
+        Args:
+            threshold: Seuil de surcharge en pourcentage de s_nom
+            import_points: Dict {nom: {'bus', 'p_nom', 'marginal_cost'}}
+                (DEFAULT_IMPORT_POINTS de core/interconnections.py si None)
+            reinforce: Autorise l'ajout de circuits en parallèle
+            max_circuits: Nombre maximal de circuits ajoutés à une ligne
+                par itération
+            max_iter: Nombre maximal d'itérations (et de calculs de flux)
+
+        Returns:
+            Dict contenant :
+            - imports : Imports ajoutés en MW (snapshots × points d'import)
+            - added_lines : Circuits ajoutés (ligne renforcée, bus, s_nom,
+              itération)
+            - iterations : Nombre d'itérations effectuées
+            - converged : True si plus aucune ligne n'est surchargée
+            - history : Tableau par itération (lignes surchargées,
+              chargement maximal, énergie importée, circuits ajoutés)
+            - remaining : Lignes encore surchargées (voir get_critical_lines)
+
+        Raises:
+            ValueError: Si un bus d'import n'existe pas dans le réseau
+            RuntimeError: Si le calcul de flux échoue
+
+        Note:
+            Les imports sont appliqués aux consignes p_set des générateurs
+            et les circuits sont ajoutés à network.lines.
+        """
+        network = self.network
+        import_points = import_points or DEFAULT_IMPORT_POINTS
+        missing = {p['bus'] for p in import_points.values()} - set(network.buses.index)
+        if missing:
+            raise ValueError(f"Bus d'import absents du réseau: {sorted(missing)}")
+
+        self._add_import_generators(import_points)
+        if not self.run_power_flow(mode="ptdf"):
+            raise RuntimeError("Le calcul de flux initial a échoué")
+
+        snapshots = network.snapshots
+        import_names = list(import_points)
+        import_capacity = np.array([import_points[name]['p_nom'] for name in import_names])
+        imports = pd.DataFrame(0.0, index=snapshots, columns=import_names)
+        tolerance = 1 + self.OVERLOAD_TOLERANCE
+        added_lines = []
+        history = []
+        iterations = 0
+
+        while iterations < max_iter:
+            critical = self.get_critical_lines(threshold * tolerance)
+            if not critical:
+                break
+            iterations += 1
+
+            ptdf = self.compute_ptdf()
+            line_names = ptdf.index
+            flows = network.lines_t.p0.loc[snapshots, line_names].fillna(0).to_numpy(dtype=float, copy=True)
+            limits = network.lines.s_nom.reindex(line_names).to_numpy(dtype=float) * threshold / 100
+            positions = line_names.get_indexer(list(critical))
+
+            # 1. Imports : besoin de chaque ligne couvert par le point le plus efficace
+            p_set = network.get_switchable_as_dense("Generator", "p_set").fillna(0)
+            sensitivities, shares = self._get_import_sensitivities(ptdf, import_points, p_set)
+
+            abs_flows = np.abs(flows[:, positions])
+            excess = np.where(abs_flows > limits[positions] * tolerance,
+                              abs_flows - limits[positions], 0.0)
+            direction = np.sign(flows[:, positions])
+            relief = -sensitivities[:, :, positions] * direction[None]
+            best = relief.argmax(axis=0)
+            best_relief = relief.max(axis=0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                need = np.where((excess > 0) & (best_relief > 1e-6), excess / best_relief, 0.0)
+
+            headroom = import_capacity[None, :] - imports.to_numpy()
+            step = np.stack([np.where(best == i, need, 0.0).max(axis=1)
+                             for i in range(len(import_names))], axis=1)
+            step = np.clip(np.minimum(step, headroom), 0, None)
+
+            if step.any():
+                imports += step
+                flows += np.einsum("ti,itl->tl", step, sensitivities)
+                for i, name in enumerate(import_names):
+                    p_set[name] += step[:, i]
+                    p_set[shares[i].columns] -= shares[i].mul(step[:, i], axis=0)
+                network.generators_t.p_set = p_set
+
+            # 2. Circuits en parallèle pour les lignes encore surchargées
+            circuits = 0
+            if reinforce:
+                ratio = np.abs(flows[:, positions]).max(axis=0) / limits[positions]
+                for position in positions[ratio > tolerance]:
+                    line = line_names[position]
+                    self_ptdf = (ptdf.at[line, network.lines.at[line, 'bus0']]
+                                 - ptdf.at[line, network.lines.at[line, 'bus1']])
+                    if self_ptdf <= 1e-6:
+                        continue
+
+                    # Avec k circuits ajoutés, chaque circuit porte F / (1 + k·PTDF_ll)
+                    ratio_line = np.abs(flows[:, position]).max() / limits[position]
+                    k = int(min(np.ceil((ratio_line - 1) / self_ptdf), max_circuits))
+                    flows -= np.outer(flows[:, position] * k / (1 + k * self_ptdf),
+                                      ptdf[network.lines.at[line, 'bus0']].values
+                                      - ptdf[network.lines.at[line, 'bus1']].values)
+                    added_lines += self._add_parallel_circuits(line, k, iterations)
+                    circuits += k
+
+            history.append({
+                'iteration': iterations,
+                'overloaded_lines': len(critical),
+                'max_loading': max(info['loading'] for info in critical.values()),
+                'import_mwh': float(imports.mul(network.snapshot_weightings.generators, axis=0)
+                                    .sum().sum()),
+                'circuits_added': circuits
+            })
+
+            if not step.any() and circuits == 0:
+                print("Aucune action disponible pour les lignes encore surchargées")
+                break
+
+            if not self.run_power_flow(mode="ptdf"):
+                raise RuntimeError("Le calcul de flux a échoué")
+
+        remaining = self.get_critical_lines(threshold * tolerance)
+        return {
+            'imports': imports,
+            'added_lines': pd.DataFrame(
+                added_lines, columns=['name', 'line', 'bus0', 'bus1', 's_nom', 'iteration']
+            ).set_index('name'),
+            'iterations': iterations,
+            'converged': not remaining,
+            'history': pd.DataFrame(history),
+            'remaining': remaining
+        }
+
+    def _add_import_generators(self, import_points: Dict[str, Dict]) -> None:
+        """
+        Ajoute les points d'import absents comme générateurs à consigne nulle.
+
+        Comme dans ReservoirBalanceSimulation, ils sont indisponibles pour
+        l'optimisation (p_max_pu = 0) ; seule leur consigne p_set est utilisée.
+        """
+        network = self.network
+        carrier = IMPORT_CARRIER
+        if carrier not in network.carriers.index:
+            network.add("Carrier", carrier, co2_emissions=0.0)
+
+        names = [name for name in import_points if name not in network.generators.index]
+        if names:
+            network.add("Generator", names,
+                        bus=[import_points[name]['bus'] for name in names],
+                        p_nom=[import_points[name]['p_nom'] for name in names],
+                        marginal_cost=[import_points[name]['marginal_cost'] for name in names],
+                        p_max_pu=0.0,
+                        p_set=0.0,
+                        carrier=carrier)
+
+    def _get_import_sensitivities(self,
+                                  ptdf: pd.DataFrame,
+                                  import_points: Dict[str, Dict],
+                                  p_set: pd.DataFrame) -> Tuple[np.ndarray, List[pd.DataFrame]]:
+        """
+        Calcule la sensibilité des flux à chaque point d'import.
+
+        Un MW importé est compensé par les autres générateurs en production
+        du même sous-réseau, au prorata de leur consigne.
+
+        Args:
+            ptdf: Matrice PTDF lignes × bus
+            import_points: Points d'import
+            p_set: Consignes des générateurs (snapshots × générateurs)
+
+        Returns:
+            Tuple (sensibilités points d'import × snapshots × lignes,
+            parts de compensation par point d'import (snapshots × générateurs))
+        """
+        network = self.network
+        generators = network.generators
+        sub_networks = generators.bus.map(network.buses.sub_network)
+        candidates = generators.index.difference(list(import_points))
+
+        sensitivities = []
+        shares = []
+        for name, point in import_points.items():
+            same_island = candidates[(sub_networks[candidates]
+                                      == network.buses.at[point['bus'], 'sub_network']).values]
+            dispatch = p_set[same_island].clip(lower=0)
+            total = dispatch.sum(axis=1).replace(0, np.nan)
+            share = dispatch.div(total, axis=0).fillna(0)
+
+            compensation = share.to_numpy() @ ptdf[generators.loc[same_island, 'bus']].to_numpy().T
+            sensitivities.append(ptdf[point['bus']].to_numpy()[None, :] - compensation)
+            shares.append(share)
+
+        return np.stack(sensitivities), shares
+
+    def _add_parallel_circuits(self, line: str, count: int, iteration: int) -> List[Dict]:
+        """
+        Ajoute des circuits identiques en parallèle d'une ligne.
+
+        Returns:
+            Description des circuits ajoutés
+        """
+        network = self.network
+        attributes = network.lines.loc[line, ['bus0', 'bus1', 'type', 'x', 'r', 'g', 'b',
+                                              's_nom', 'length', 'num_parallel']]
+        existing = network.lines.index.str.startswith(f"{line}_renfort_").sum()
+        names = [f"{line}_renfort_{existing + j + 1}" for j in range(count)]
+        network.add("Line", names, **attributes.to_dict())
+
+        return [{'name': name, 'line': line, 'bus0': attributes['bus0'],
+                 'bus1': attributes['bus1'], 's_nom': attributes['s_nom'],
+                 'iteration': iteration} for name in names]
+
     # Add new method here
\ No newline at end of file
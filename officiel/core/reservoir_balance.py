@@ -0,0 +1,220 @@
+"""
+Module de bilan annuel des réservoirs en deux simulations.
+
+Ce module met en œuvre les deux simulations décrites dans core/idee_ced.txt.
+Une première optimisation calcule l'année complète. Si le niveau des
+réservoirs en fin d'année est plus bas qu'en début d'année, les réservoirs
+ont été trop sollicités : l'énergie en trop est attribuée aux imports
+(Ottawa, New York) et l'année est optimisée une seconde fois.
+
+Les points d'import et les deux contraintes d'énergie (production des
+réservoirs, volume importé) sont présents dès la première simulation, avec
+des valeurs qui ne contraignent rien. La seconde simulation ne modifie que
+des bornes et des constantes : elle réutilise le modèle de la première
+(OptimizationSession) et repart de sa solution.
+
+Classes:
+    ReservoirBalanceSimulation: Simulation annuelle en deux passes.
+
+Example:
+    >>> from network.core import ReservoirBalanceSimulation
+    >>> simulation = ReservoirBalanceSimulation(network)
+    >>> results = simulation.run()
+    >>> results['passes'][['objective', 'reservoir_mwh', 'import_mwh']]
+
+Notes:
+    Les niveaux des réservoirs sont calculés avec les paramètres et les
+    apports de ReservoirPilot (capacité, niveau initial, apports).
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+from typing import Dict, Optional
+
+from .interconnections import DEFAULT_IMPORT_POINTS, IMPORT_CARRIER
+from .optimization_session import OptimizationSession
+from .reservoir_pilotage import ReservoirPilot
+
+
+class ReservoirBalanceSimulation:
+    """
+    Simulation annuelle avec report du déficit des réservoirs sur les imports.
+
+    Attributes:
+        network (pypsa.Network): Réseau à optimiser
+        pilot (ReservoirPilot): Paramètres et bilan des réservoirs
+        import_points (Dict[str, Dict]): Points d'import (bus, p_nom, marginal_cost)
+        session (OptimizationSession): Session partagée par les deux passes
+    """
+
+    # Interconnexions vers l'Ontario et New York (voir core/interconnections.py)
+    DEFAULT_IMPORT_POINTS = DEFAULT_IMPORT_POINTS
+    IMPORT_CARRIER = IMPORT_CARRIER
+    RESERVOIR_CONSTRAINT = "reservoir_energy_balance"
+    IMPORT_CONSTRAINT = "import_reallocation"
+
+    def __init__(self,
+                 network: pypsa.Network,
+                 reservoirs: Optional[pd.DataFrame] = None,
+                 inflow: Optional[pd.DataFrame] = None,
+                 import_points: Optional[Dict[str, Dict]] = None,
+                 carrier: str = "hydro_reservoir",
+                 solver_name: str = "highs",
+                 solver_options: Optional[Dict] = None):
+        """
+        Initialise la simulation.
+
+        Args:
+            network: Réseau avec ses séries temporelles
+            reservoirs: Paramètres des réservoirs (voir ReservoirPilot)
+            inflow: Apports des réservoirs en MW (voir ReservoirPilot)
+            import_points: Dict {nom: {'bus', 'p_nom', 'marginal_cost'}}
+            carrier: Type des centrales à réservoir
+            solver_name: Solveur à utiliser
+            solver_options: Options transmises au solveur
+
+        Raises:
+            ValueError: Si un bus d'import n'existe pas dans le réseau
+        """
+        self.network = network
+        self.carrier = carrier
+        self.pilot = ReservoirPilot(network, reservoirs=reservoirs, inflow=inflow, carrier=carrier)
+        self.import_points = import_points or self.DEFAULT_IMPORT_POINTS
+        self.solver_name = solver_name
+        self.solver_options = solver_options
+        self.session = None
+
+        missing = {p['bus'] for p in self.import_points.values()} - set(network.buses.index)
+        if missing:
+            raise ValueError(f"Bus d'import absents du réseau: {sorted(missing)}")
+
+    def run(self) -> Dict:
+        """
+        Exécute les deux simulations.
+
+        Returns:
+            Dict contenant :
+            - passes : Tableau par passe (objectif, énergie des réservoirs,
+              volume importé par point, déficit, production au-delà des
+              réservoirs vides, temps de construction, de mise à jour et de
+              résolution)
+            - deficit_mwh : Énergie prélevée en trop dans les réservoirs
+            - reassigned_mwh : Énergie attribuée aux imports (limitée par
+              la capacité des interconnexions)
+            - levels : Niveaux en fin d'année par réservoir et par passe
+
+        Raises:
+            RuntimeError: Si une optimisation échoue
+        """
+        self._add_import_points()
+        self.session = OptimizationSession(self.network, solver_name=self.solver_name,
+                                           solver_options=self.solver_options)
+
+        passes = [self._summarize_pass(1, self.session.solve())]
+        first = passes[0]
+        deficit = first['deficit_mwh']
+
+        import_names = list(self.import_points)
+        hours = self.network.snapshot_weightings.generators.sum()
+        import_capacity = sum(p['p_nom'] for p in self.import_points.values()) * hours
+        reassigned = min(deficit, import_capacity)
+
+        if reassigned > 0:
+            self.session.update_p_max_pu(pd.Series(1.0, index=import_names))
+            self.session.update_global_constraints({
+                self.RESERVOIR_CONSTRAINT: first['reservoir_mwh'] - reassigned,
+                self.IMPORT_CONSTRAINT: reassigned
+            })
+            passes.append(self._summarize_pass(2, self.session.solve()))
+        else:
+            print("Réservoirs équilibrés en fin d'année : seconde simulation inutile")
+
+        passes_df = pd.DataFrame(passes).set_index('pass')
+        levels = passes_df.pop('end_levels').apply(pd.Series).T
+
+        return {
+            'passes': passes_df,
+            'deficit_mwh': deficit,
+            'reassigned_mwh': reassigned,
+            'levels': levels
+        }
+
+    def _add_import_points(self) -> None:
+        """
+        Ajoute les points d'import et les contraintes d'énergie au réseau.
+
+        Les imports sont indisponibles (p_max_pu = 0) et la production des
+        réservoirs n'est pas limitée : la première passe n'est pas modifiée.
+        """
+        network = self.network
+        if self.IMPORT_CARRIER not in network.carriers.index:
+            network.add("Carrier", self.IMPORT_CARRIER, co2_emissions=0.0)
+
+        names = [name for name in self.import_points if name not in network.generators.index]
+        if names:
+            network.add("Generator", names,
+                        bus=[self.import_points[name]['bus'] for name in names],
+                        p_nom=[self.import_points[name]['p_nom'] for name in names],
+                        marginal_cost=[self.import_points[name]['marginal_cost'] for name in names],
+                        p_max_pu=0.0,
+                        carrier=self.IMPORT_CARRIER)
+
+        # Borne non contraignante : capacité maximale des réservoirs plus la charge totale
+        weights = network.snapshot_weightings.generators
+        generators = network.generators.loc[self.pilot.reservoirs.index]
+        p_nom_max = generators.p_nom_max.where(
+            generators.p_nom_extendable & np.isfinite(generators.p_nom_max), generators.p_nom
+        )
+        reservoir_capacity = (p_nom_max.sum() * weights.sum()
+                              + float(network.loads_t.p_set.mul(weights, axis=0).sum().sum()))
+
+        for name, carrier, sense, constant in [
+            (self.RESERVOIR_CONSTRAINT, self.carrier, "<=", reservoir_capacity),
+            (self.IMPORT_CONSTRAINT, self.IMPORT_CARRIER, "==", 0.0),
+        ]:
+            if name not in network.global_constraints.index:
+                network.add("GlobalConstraint", name, type="operational_limit",
+                            carrier_attribute=carrier, sense=sense, constant=constant)
+
+    def _summarize_pass(self, number: int, result: Dict) -> Dict:
+        """
+        Résume une passe : coût, énergies, bilan des réservoirs et temps.
+
+        Args:
+            number: Numéro de la passe
+            result: Résultat de OptimizationSession.solve
+
+        Returns:
+            Dict des indicateurs de la passe
+        """
+        network = self.network
+        reservoirs = self.pilot.reservoirs
+        weights = network.snapshot_weightings.generators
+        energy = network.generators_t.p.mul(weights, axis=0).sum()
+
+        state = self.pilot.compute_levels(network.generators_t.p[reservoirs.index])
+        end_levels = state['end'].iloc[-1]
+        # La production au-delà du réservoir vide fait partie du déficit
+        shortfall = float(state['shortfall'].sum().sum())
+        deficit = float(((reservoirs['initial_level'] - end_levels) * reservoirs['e_nom']).sum())
+        deficit += shortfall
+
+        summary = {
+            'pass': number,
+            'objective': result['objective'],
+            'reservoir_mwh': float(energy[reservoirs.index].sum()),
+            'import_mwh': float(energy.reindex(list(self.import_points)).fillna(0).sum()),
+            'deficit_mwh': max(deficit, 0.0),
+            'shortfall_mwh': shortfall,
+            'build_seconds': result['build_seconds'],
+            'update_seconds': result['update_seconds'],
+            'solve_seconds': result['solve_seconds'],
+            'end_levels': end_levels
+        }
+        for name in self.import_points:
+            summary[f'{name}_mwh'] = float(energy.get(name, 0.0))
+        return summary
@@ -0,0 +1,323 @@
+"""
+Module de pilotage des centrales à réservoir par le coût marginal.
+
+Ce module met en œuvre l'idée décrite dans core/idee_ced.txt : le coût
+marginal d'une centrale à réservoir dépend du niveau de son réservoir. Il est
+nul lorsque le réservoir est plein et très élevé lorsqu'il est vide, de sorte
+que l'optimisation économique pilote elle-même les réservoirs.
+
+Le pilotage est chronologique, par blocs de snapshots (une semaine par
+défaut), comme en exploitation. Pour chaque bloc :
+- Le coût marginal de chaque réservoir est déduit de son niveau en début de
+  bloc par la courbe de coût
+- La production maximale est limitée à l'énergie disponible (réserve et
+  apports du bloc), ce qui empêche de vider un réservoir
+- Le bloc est optimisé, puis les niveaux sont mis à jour de façon vectorisée
+  à partir des apports et de la production (somme cumulée, déversement
+  quand le réservoir est plein, manque quand il est vide)
+
+Une année se calcule ainsi en une optimisation par bloc, avec un modèle de
+la taille d'un bloc, au lieu d'une optimisation par heure.
+
+Classes:
+    ReservoirPilot: Moteur de pilotage des réservoirs.
+
+Example:
+    >>> from network.core import ReservoirPilot
+    >>> pilot = ReservoirPilot(network)
+    >>> results = pilot.run(block_hours=168)
+    >>> results['levels'].plot()
+
+Notes:
+    Paramètres des réservoirs (un par générateur hydro_reservoir) :
+    - max_hours : capacité du réservoir en heures à pleine puissance
+    - initial_level : niveau initial en fraction de la capacité
+    - inflow_pu : apport moyen en p.u. de la puissance nominale, utilisé
+      si aucune série d'apports n'est fournie
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import time
+import numpy as np
+import pandas as pd
+import pypsa
+from typing import Dict, Optional
+
+
+class ReservoirPilot:
+    """
+    Pilote les centrales à réservoir par un coût marginal fonction du niveau.
+
+    Attributes:
+        network (pypsa.Network): Réseau à optimiser
+        reservoirs (pd.DataFrame): Paramètres des réservoirs par générateur
+        inflow (pd.DataFrame): Apports horaires en MW (snapshots × réservoirs)
+        level_curve (pd.Series): Coût marginal ($/MWh) indexé par niveau (0 à 1)
+    """
+
+    # Coût nul réservoir plein, supérieur au thermique sous 10 % de remplissage
+    DEFAULT_LEVEL_CURVE = pd.Series({0.0: 1000.0, 0.1: 20.0, 0.3: 6.0,
+                                     0.6: 3.0, 0.9: 1.0, 1.0: 0.0})
+    DEFAULT_PARAMETERS = {'max_hours': 24 * 60, 'initial_level': 0.7, 'inflow_pu': 0.5}
+
+    def __init__(self,
+                 network: pypsa.Network,
+                 reservoirs: Optional[pd.DataFrame] = None,
+                 inflow: Optional[pd.DataFrame] = None,
+                 level_curve: Optional[pd.Series] = None,
+                 carrier: str = "hydro_reservoir",
+                 solver_name: str = "highs",
+                 solver_options: Optional[Dict] = None):
+        """
+        Initialise le pilotage.
+
+        Args:
+            network: Réseau avec ses séries temporelles
+            reservoirs: Paramètres par générateur (max_hours, initial_level,
+                inflow_pu) ; les valeurs manquantes prennent les valeurs par défaut
+            inflow: Apports en MW (snapshots × générateurs), prioritaires sur inflow_pu
+            level_curve: Coût marginal indexé par niveau croissant entre 0 et 1
+            carrier: Type des centrales pilotées
+            solver_name: Solveur à utiliser
+            solver_options: Options transmises au solveur
+
+        Raises:
+            ValueError: Si aucune centrale du type demandé n'existe, si la
+                puissance d'une centrale est nulle ou infinie ou si la courbe
+                de coût est invalide
+        """
+        self.network = network
+        self.solver_name = solver_name
+        self.solver_options = solver_options or {}
+
+        names = network.generators.index[network.generators.carrier == carrier]
+        if len(names) == 0:
+            raise ValueError(f"Aucune centrale de type {carrier} dans le réseau")
+
+        self.reservoirs = self._get_reservoir_parameters(names, reservoirs)
+
+        self.level_curve = (self.DEFAULT_LEVEL_CURVE if level_curve is None
+                            else level_curve.sort_index())
+        if self.level_curve.index.min() > 0 or self.level_curve.index.max() < 1:
+            raise ValueError("La courbe de coût doit couvrir les niveaux 0 à 1")
+
+        default_inflow = self.reservoirs['inflow_pu'] * self.reservoirs['p_nom']
+        self.inflow = pd.DataFrame(
+            np.tile(default_inflow.values, (len(network.snapshots), 1)),
+            index=network.snapshots, columns=names
+        )
+        if inflow is not None:
+            inflow = inflow.reindex(index=network.snapshots)
+            columns = inflow.columns.intersection(names)
+            self.inflow[columns] = inflow[columns].fillna(self.inflow[columns])
+
+    def _get_reservoir_parameters(self,
+                                  names: pd.Index,
+                                  reservoirs: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Complète les paramètres des réservoirs et calcule leur capacité.
+
+        La puissance d'une centrale extensible est p_nom_opt, ou p_nom_max
+        si le réseau n'a pas encore été optimisé.
+
+        Returns:
+            DataFrame par générateur avec p_nom, max_hours, initial_level,
+            inflow_pu et e_nom (capacité en MWh)
+
+        Raises:
+            ValueError: Si la puissance d'une centrale est nulle ou infinie
+        """
+        parameters = pd.DataFrame(self.DEFAULT_PARAMETERS, index=names)
+        if reservoirs is not None:
+            given = reservoirs.reindex(index=names, columns=parameters.columns)
+            parameters = given.fillna(parameters)
+
+        generators = self.network.generators.loc[names]
+        extendable = generators['p_nom_extendable']
+        p_nom = generators['p_nom'].where(~extendable, generators['p_nom_opt'])
+        p_nom = p_nom.where(~extendable | (p_nom > 0), generators['p_nom_max'])
+
+        invalid = p_nom.index[~(np.isfinite(p_nom) & (p_nom > 0))]
+        if len(invalid) > 0:
+            raise ValueError(f"Puissance nulle ou infinie pour les réservoirs: {list(invalid)} "
+                             f"(renseigner p_nom_max des centrales extensibles)")
+
+        parameters['p_nom'] = p_nom
+        parameters['e_nom'] = parameters['p_nom'] * parameters['max_hours']
+        return parameters
+
+    def marginal_cost_from_level(self, levels: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calcule les coûts marginaux à partir des niveaux des réservoirs.
+
+        Args:
+            levels: Niveaux en fraction de la capacité (snapshots × réservoirs)
+
+        Returns:
+            Coûts marginaux en $/MWh, même forme que levels
+        """
+        costs = np.interp(levels.to_numpy(dtype=float).clip(0, 1),
+                          self.level_curve.index.to_numpy(dtype=float),
+                          self.level_curve.to_numpy(dtype=float))
+        return pd.DataFrame(costs, index=levels.index, columns=levels.columns)
+
+    def compute_levels(self,
+                       dispatch: pd.DataFrame,
+                       initial_level: Optional[pd.Series] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Calcule l'évolution des réservoirs pour une production donnée.
+
+        Le niveau sans déversement est la somme cumulée des apports moins la
+        production. Le déversement cumulé est le maximum courant du
+        dépassement de la capacité, ce qui évite une boucle horaire. De même,
+        la production qui viderait le réservoir sous zéro est comptée comme
+        manque (shortfall) : le niveau reste entre 0 et 1. Déversement et
+        manque dépendant l'un de l'autre, ils sont recalculés en alternance
+        jusqu'à ce qu'ils ne changent plus (une itération par passage d'un
+        réservoir du plein au vide ou inversement).
+
+        Args:
+            dispatch: Production en MW (snapshots × réservoirs)
+            initial_level: Niveaux avant le premier snapshot de dispatch
+                (niveaux initiaux des réservoirs si None)
+
+        Returns:
+            Dict contenant :
+            - start : Niveaux en début de snapshot (fraction)
+            - end : Niveaux en fin de snapshot (fraction)
+            - spill : Déversement par snapshot en MWh
+            - shortfall : Production non couverte par le réservoir, par
+              snapshot en MWh
+        """
+        names = self.reservoirs.index
+        index = dispatch.index
+        if initial_level is None:
+            initial_level = self.reservoirs['initial_level']
+        initial = initial_level.reindex(names).to_numpy(dtype=float)
+
+        hours = self.network.snapshot_weightings.generators.loc[index].to_numpy(dtype=float)[:, None]
+        e_nom = self.reservoirs['e_nom'].to_numpy(dtype=float)
+
+        net = (self.inflow.loc[index, names].to_numpy(dtype=float)
+               - dispatch.reindex(columns=names).fillna(0).to_numpy(dtype=float)) * hours
+        unbounded = initial * e_nom + np.cumsum(net, axis=0)
+        cumulative_spill = np.zeros_like(unbounded)
+        cumulative_shortfall = np.zeros_like(unbounded)
+        for _ in range(len(index) + 1):
+            shortfall = np.maximum.accumulate(
+                np.maximum(cumulative_spill - unbounded, 0), axis=0)
+            spill = np.maximum.accumulate(
+                np.maximum(unbounded + shortfall - e_nom, 0), axis=0)
+            if (np.array_equal(spill, cumulative_spill)
+                    and np.array_equal(shortfall, cumulative_shortfall)):
+                break
+            cumulative_spill, cumulative_shortfall = spill, shortfall
+
+        end = (unbounded + cumulative_shortfall - cumulative_spill) / e_nom
+        start = np.vstack([initial, end[:-1]])
+        spill = np.diff(cumulative_spill, axis=0, prepend=0)
+        shortfall = np.diff(cumulative_shortfall, axis=0, prepend=0)
+
+        return {
+            'start': pd.DataFrame(start, index=index, columns=names),
+            'end': pd.DataFrame(end, index=index, columns=names),
+            'spill': pd.DataFrame(spill, index=index, columns=names),
+            'shortfall': pd.DataFrame(shortfall, index=index, columns=names)
+        }
+
+    def run(self, block_hours: int = 168) -> Dict:
+        """
+        Calcule le pilotage chronologique des réservoirs.
+
+        Les coûts marginaux obtenus sont conservés dans
+        network.generators_t.marginal_cost ; la limitation de p_max_pu
+        propre à chaque bloc est retirée à la fin du calcul.
+
+        Args:
+            block_hours: Nombre de snapshots par bloc (coût constant sur le bloc)
+
+        Returns:
+            Dict contenant :
+            - levels : Niveaux en fin de snapshot (snapshots × réservoirs)
+            - marginal_cost : Coûts marginaux appliqués aux réservoirs
+            - spill : Déversement par snapshot en MWh
+            - shortfall : Production non couverte par les réservoirs en MWh
+            - blocks : Tableau par bloc (début, fin, objectif, temps de résolution)
+            - total_seconds : Durée totale du calcul
+
+        Raises:
+            ValueError: Si block_hours n'est pas positif
+            RuntimeError: Si l'optimisation d'un bloc échoue
+        """
+        if block_hours <= 0:
+            raise ValueError("block_hours doit être positif")
+
+        network = self.network
+        snapshots = network.snapshots
+        names = self.reservoirs.index
+        e_nom = self.reservoirs['e_nom']
+        weights = network.snapshot_weightings.generators
+
+        original_p_max_pu = network.generators_t.p_max_pu.copy()
+        p_max_pu = network.get_switchable_as_dense("Generator", "p_max_pu")
+        marginal_cost = network.get_switchable_as_dense("Generator", "marginal_cost")
+
+        level = self.reservoirs['initial_level'].copy()
+        states = []
+        blocks = []
+        run_start = time.perf_counter()
+
+        try:
+            for start in range(0, len(snapshots), block_hours):
+                block = snapshots[start:start + block_hours]
+
+                # Coût du bloc selon le niveau en début de bloc
+                costs = self.marginal_cost_from_level(level.to_frame().T)
+                marginal_cost.loc[block, names] = np.tile(costs.values, (len(block), 1))
+
+                # Production limitée à l'énergie disponible sur le bloc
+                hours = weights.loc[block]
+                available = level * e_nom + self.inflow.loc[block, names].mul(hours, axis=0).sum()
+                cap = (available / (self.reservoirs['p_nom'] * hours.sum())).clip(lower=0)
+                block_p_max_pu = p_max_pu.loc[block].copy()
+                block_p_max_pu[names] = block_p_max_pu[names].clip(upper=cap, axis=1)
+
+                network.generators_t.marginal_cost = marginal_cost
+                network.generators_t.p_max_pu = p_max_pu.copy()
+                network.generators_t.p_max_pu.loc[block] = block_p_max_pu
+
+                solve_start = time.perf_counter()
+                status, termination_condition = network.optimize(
+                    snapshots=block, solver_name=self.solver_name, **self.solver_options
+                )
+                solve_time = time.perf_counter() - solve_start
+
+                if status != "ok":
+                    raise RuntimeError(
+                        f"Optimisation du bloc {block[0]} échouée avec statut: {status}"
+                    )
+
+                state = self.compute_levels(network.generators_t.p.loc[block, names], level)
+                level = state['end'].iloc[-1]
+                states.append(state)
+
+                blocks.append({
+                    'start': block[0],
+                    'end': block[-1],
+                    'objective': float(network.objective),
+                    'min_level': float(state['end'].min().min()),
+                    'solve_seconds': solve_time
+                })
+        finally:
+            network.generators_t.p_max_pu = original_p_max_pu
+
+        return {
+            'levels': pd.concat([state['end'] for state in states]),
+            'marginal_cost': marginal_cost[names],
+            'spill': pd.concat([state['spill'] for state in states]),
+            'shortfall': pd.concat([state['shortfall'] for state in states]),
+            'blocks': pd.DataFrame(blocks),
+            'total_seconds': time.perf_counter() - run_start
+        }
@@ -0,0 +1,241 @@
+"""
+Module d'exécution parallèle de scénarios multi-années.
+
+Ce module permet de lancer des études de planification sur plusieurs années
+(2024, 2035, 2050, ...) et plusieurs jeux de paramètres de scénario. Chaque
+combinaison année × scénario est optimisée dans un processus séparé.
+
+La topologie statique (bus, lignes, générateurs) est construite une seule fois
+dans le processus principal puis transmise une fois à chaque processus de
+travail ; seules les séries temporelles de l'année sont chargées par tâche.
+
+Example:
+    >>> from network.core import ScenarioRunner
+    >>> runner = ScenarioRunner(max_workers=4)
+    >>> results = runner.run(
+    ...     years=['2024', '2035', '2050'],
+    ...     scenarios={
+    ...         'reference': {},
+    ...         'forte_demande': {'load_scale': 1.2},
+    ...     }
+    ... )
+    >>> results.pivot_table(index=['year', 'scenario'], columns='metric', values='value')
+
+Notes:
+    Paramètres de scénario supportés :
+    - load_scale : facteur multiplicatif sur les profils de charge
+    - marginal_cost_scale : facteur multiplicatif sur les coûts marginaux
+    - capacity_scale : dict {carrier: facteur} appliqué à p_nom
+    - global_constraints : dict {nom: constante} des contraintes globales
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import multiprocessing
+import time
+import pypsa
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from utils import NetworkDataLoader
+
+
+# Topologie statique partagée par les tâches d'un processus de travail
+_worker_context = {}
+
+
+def _init_worker(static_network: pypsa.Network,
+                 data_dir: str,
+                 solver_name: str,
+                 start_date: Optional[str],
+                 end_date: Optional[str]) -> None:
+    """Reçoit une fois par processus la topologie statique et la configuration."""
+    _worker_context.update({
+        'static_network': static_network,
+        'data_loader': NetworkDataLoader(data_dir),
+        'solver_name': solver_name,
+        'start_date': start_date,
+        'end_date': end_date,
+    })
+
+
+def _apply_scenario(network: pypsa.Network, params: Dict) -> None:
+    """
+    Applique les paramètres d'un scénario au réseau.
+
+    Args:
+        network: Réseau avec ses séries temporelles
+        params: Paramètres du scénario (voir l'en-tête du module)
+
+    Raises:
+        ValueError: Si un paramètre n'est pas supporté ou si une contrainte
+            globale n'existe pas dans le réseau
+    """
+    unknown = set(params) - set(ScenarioRunner.SCENARIO_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Paramètres de scénario non supportés: {sorted(unknown)}")
+
+    for name in params.get('global_constraints', {}):
+        if name not in network.global_constraints.index:
+            raise ValueError(f"Contrainte globale inconnue: {name}")
+
+    if 'load_scale' in params:
+        network.loads_t.p_set = network.loads_t.p_set * params['load_scale']
+
+    if 'marginal_cost_scale' in params:
+        network.generators['marginal_cost'] *= params['marginal_cost_scale']
+        network.generators_t.marginal_cost = (
+            network.generators_t.marginal_cost * params['marginal_cost_scale']
+        )
+
+    for carrier, factor in params.get('capacity_scale', {}).items():
+        is_carrier = network.generators.carrier == carrier
+        network.generators.loc[is_carrier, 'p_nom'] *= factor
+
+    for name, constant in params.get('global_constraints', {}).items():
+        network.global_constraints.loc[name, 'constant'] = constant
+
+
+def _run_scenario(year: str, scenario: str, params: Dict) -> List[Dict]:
+    """
+    Construit et optimise le réseau d'une combinaison année × scénario.
+
+    Returns:
+        Lignes du tableau de résultats (format long)
+    """
+    context = _worker_context
+    start = time.perf_counter()
+
+    network = context['static_network'].copy()
+    network = context['data_loader'].load_timeseries_data(
+        network, year, context['start_date'], context['end_date']
+    )
+    _apply_scenario(network, params)
+
+    solve_start = time.perf_counter()
+    status, termination_condition = network.optimize(solver_name=context['solver_name'])
+    solve_time = time.perf_counter() - solve_start
+
+    if status != "ok":
+        raise RuntimeError(f"Optimisation échouée avec statut: {status}")
+
+    weights = network.snapshot_weightings.generators
+    generation = (
+        network.generators_t.p.mul(weights, axis=0).sum()
+        .groupby(network.generators.carrier).sum()
+    )
+
+    rows = [
+        {'metric': 'objective', 'carrier': None, 'value': float(network.objective)},
+        {'metric': 'total_load_mwh', 'carrier': None,
+         'value': float(network.loads_t.p.mul(weights, axis=0).sum().sum())},
+        {'metric': 'solve_seconds', 'carrier': None, 'value': solve_time},
+        {'metric': 'total_seconds', 'carrier': None, 'value': time.perf_counter() - start},
+    ]
+    rows += [
+        {'metric': 'generation_mwh', 'carrier': carrier, 'value': float(value)}
+        for carrier, value in generation.items()
+    ]
+
+    for row in rows:
+        row.update({'year': year, 'scenario': scenario})
+    return rows
+
+
+class ScenarioRunner:
+    """
+    Exécute en parallèle des optimisations sur plusieurs années et scénarios.
+
+    Attributes:
+        data_loader (NetworkDataLoader): Gestionnaire de chargement des données
+        solver_name (str): Solveur utilisé pour chaque optimisation
+        max_workers (int): Nombre de processus (None = nombre de cœurs)
+        errors (List[Dict]): Combinaisons en échec lors du dernier appel à run
+    """
+
+    SCENARIO_PARAMETERS = [
+        'load_scale',
+        'marginal_cost_scale',
+        'capacity_scale',
+        'global_constraints',
+    ]
+    RESULT_COLUMNS = ['year', 'scenario', 'metric', 'carrier', 'value']
+
+    def __init__(self,
+                 data_dir: str = "data",
+                 solver_name: str = "highs",
+                 max_workers: Optional[int] = None):
+        """
+        Initialise l'exécuteur de scénarios.
+
+        Args:
+            data_dir: Chemin vers le répertoire des données
+            solver_name: Solveur à utiliser pour l'optimisation
+            max_workers: Nombre maximal de processus (1 = exécution séquentielle)
+        """
+        self.data_dir = data_dir
+        self.data_loader = NetworkDataLoader(data_dir)
+        self.solver_name = solver_name
+        self.max_workers = max_workers
+        self.errors = []
+
+    def run(self,
+            years: List[str],
+            scenarios: Optional[Dict[str, Dict]] = None,
+            start_date: Optional[str] = None,
+            end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Lance toutes les combinaisons année × scénario.
+
+        Args:
+            years: Années à simuler (ex: ['2024', '2035', '2050'])
+            scenarios: Dict {nom: paramètres} (un scénario 'reference' vide si None)
+            start_date: Date de début optionnelle, commune à toutes les années
+            end_date: Date de fin optionnelle, commune à toutes les années
+
+        Returns:
+            DataFrame au format long avec les colonnes year, scenario,
+            metric, carrier et value. Les combinaisons en échec sont
+            listées dans l'attribut errors.
+        """
+        if scenarios is None:
+            scenarios = {'reference': {}}
+
+        # Topologie statique construite une seule fois
+        static_network = self.data_loader.load_network_data()
+        initargs = (static_network, self.data_dir, self.solver_name, start_date, end_date)
+        tasks = [(year, name, params) for year in years for name, params in scenarios.items()]
+
+        rows = []
+        self.errors = []
+
+        if self.max_workers == 1:
+            _init_worker(*initargs)
+            for task in tasks:
+                try:
+                    rows += _run_scenario(*task)
+                except Exception as e:
+                    self._record_error(task, e)
+        else:
+            # 'spawn' évite les interblocages des solveurs multithreadés après un fork
+            with ProcessPoolExecutor(max_workers=self.max_workers,
+                                     mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_worker,
+                                     initargs=initargs) as executor:
+                futures = {executor.submit(_run_scenario, *task): task for task in tasks}
+                for future in as_completed(futures):
+                    try:
+                        rows += future.result()
+                    except Exception as e:
+                        self._record_error(futures[future], e)
+
+        results = pd.DataFrame(rows, columns=self.RESULT_COLUMNS)
+        return results.sort_values(['year', 'scenario', 'metric', 'carrier']).reset_index(drop=True)
+
+    def _record_error(self, task: tuple, error: Exception) -> None:
+        """Enregistre et affiche l'échec d'une combinaison année × scénario."""
+        year, scenario, _ = task
+        self.errors.append({'year': year, 'scenario': scenario, 'error': str(error)})
+        print(f"Échec du scénario {scenario} pour {year} : {str(error)}")
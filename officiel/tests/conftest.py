@@ -0,0 +1,67 @@
+"""
+Données de test partagées.
+
+Le fixture small_data_dir construit un répertoire data réduit à partir des
+données du projet : les bus des centrales et une quarantaine d'autres bus
+(noms en double compris), les lignes qui les relient, et trois semaines de
+séries horaires dérivées de la journée type de 2024. Les six premières
+colonnes de charge (régions) sont renommées d'après des bus 'conso' pour
+que la projection des colonnes (project_columns) ait des charges à lire ;
+les autres ne correspondent à aucune charge du réseau.
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_DATA = Path(__file__).resolve().parents[1] / "data"
+
+
+def _extend_timeseries(path: Path, days: int, seed: int) -> pd.DataFrame:
+    """Répète la journée type sur plusieurs jours avec une variation aléatoire."""
+    daily = pd.read_csv(path, index_col=0, parse_dates=True)
+    index = pd.date_range(daily.index[0], periods=24 * days, freq="h", name=daily.index.name)
+    rng = np.random.default_rng(seed)
+    values = np.tile(daily.values, (days, 1)) * rng.uniform(0.9, 1.1, (len(index), daily.shape[1]))
+    return pd.DataFrame(values.round(3), index=index, columns=daily.columns)
+
+
+@pytest.fixture
+def small_data_dir(tmp_path) -> Path:
+    """Répertoire data réduit (voir l'en-tête du module)."""
+    data_dir = tmp_path / "data"
+    for folder in ["centrales", "constraints", "lines"]:
+        shutil.copytree(PROJECT_DATA / "topology" / folder, data_dir / "topology" / folder)
+
+    generators = pd.concat([
+        pd.read_csv(PROJECT_DATA / "topology" / "centrales" / name)
+        for name in ["generators_non_pilotable.csv", "generators_pilotable.csv"]
+    ])
+    buses = pd.read_csv(PROJECT_DATA / "regions" / "buses.csv")
+    names = set(generators['bus']) | set(buses['name'].iloc[:40])
+    (data_dir / "regions").mkdir(parents=True)
+    buses[buses['name'].isin(names)].to_csv(data_dir / "regions" / "buses.csv", index=False)
+
+    lines = pd.read_csv(PROJECT_DATA / "topology" / "lines" / "lines.csv")
+    lines = lines[lines['bus0'].isin(names) & lines['bus1'].isin(names)]
+    lines.to_csv(data_dir / "topology" / "lines" / "lines.csv", index=False)
+
+    conso_buses = buses.loc[buses['name'].isin(names) & (buses['type'] == 'conso'), 'name'].unique()
+    for seed, relative_path in enumerate([Path("loads-p_set.csv"),
+                                          Path("generation") / "generators-marginal_cost.csv",
+                                          Path("generation") / "generators-p_max_pu.csv"]):
+        target = data_dir / "timeseries" / "2024" / relative_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        df = _extend_timeseries(PROJECT_DATA / "timeseries" / "2024" / relative_path,
+                                days=21, seed=seed)
+        if relative_path.name == "loads-p_set.csv":
+            df = df.rename(columns=dict(zip(df.columns[:6], conso_buses[:6])))
+        df.to_csv(target)
+
+    return data_dir
@@ -0,0 +1,143 @@
+"""
+Tests du balayage AC à démarrage à chaud (PowerFlowAnalyzer.run_ac_sweep).
+
+Les résultats sont comparés à ceux de network.pf sur un réseau de trois
+sous-réseaux : une boucle maillée avec un bus PV et un transformateur à
+prise, une ligne isolée et un bus seul.
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+import pytest
+
+from core.power_flow import PowerFlowAnalyzer, _ac_jacobian
+
+LINES = [
+    # nom, bus0, bus1, x (ohm)
+    ("AB", "A", "B", 10.0),
+    ("BC", "B", "C", 12.0),
+    ("CD", "C", "D", 8.0),
+    ("DA", "D", "A", 9.0),
+    ("XY", "X", "Y", 5.0),
+]
+SCALE = [0.8, 0.9, 1.0, 1.1, 1.2]
+RESULTS = {
+    "buses": ["v_mag_pu", "v_ang", "p", "q"],
+    "generators": ["p", "q"],
+    "loads": ["p", "q"],
+    "lines": ["p0", "q0", "p1", "q1"],
+    "transformers": ["p0", "q0", "p1", "q1"],
+}
+
+
+def make_network(scale=SCALE) -> pypsa.Network:
+    """Boucle A-B-C-D (B en PV, transformateur C-T), ligne X-Y et bus Z isolés."""
+    network = pypsa.Network()
+    network.set_snapshots(pd.date_range("2024-01-01", periods=len(scale), freq="h"))
+    network.add("Bus", list("ABCD"), v_nom=315.0)
+    network.add("Bus", ["T", "X", "Y"], v_nom=120.0)
+    network.add("Bus", "Z", v_nom=25.0)
+    for name, bus0, bus1, x in LINES:
+        network.add("Line", name, bus0=bus0, bus1=bus1, x=x, r=x / 10, b=1e-5, s_nom=500.0)
+    network.add("Transformer", "TR", bus0="C", bus1="T", x=0.1, r=0.005, s_nom=300.0,
+                tap_ratio=1.02)
+
+    scale = pd.Series(scale, index=network.snapshots)
+    network.add("Generator", "G_A", bus="A", control="Slack", p_set=0.0, v_mag_pu_set=1.02)
+    network.add("Generator", "G_B", bus="B", control="PV", p_set=150.0 * scale, v_mag_pu_set=1.01)
+    network.add("Generator", ["G_X", "G_Z"], bus=["X", "Z"], control="Slack", p_set=0.0)
+    network.add("Load", "L_D", bus="D", p_set=200.0 * scale, q_set=50.0 * scale)
+    network.add("Load", "L_T", bus="T", p_set=120.0 * scale, q_set=30.0 * scale)
+    network.add("Load", "L_Y", bus="Y", p_set=40.0 * scale, q_set=10.0)
+    network.add("Load", "L_Z", bus="Z", p_set=5.0, q_set=1.0)
+    return network
+
+
+def assert_matches_pf(network, reference, snapshots):
+    """Compare les séries de résultats aux snapshots donnés."""
+    for list_name, attributes in RESULTS.items():
+        for attr in attributes:
+            atol = 1e-6 if attr in ("v_mag_pu", "v_ang") else 1e-4
+            pd.testing.assert_frame_equal(
+                getattr(network, f"{list_name}_t")[attr].loc[snapshots],
+                getattr(reference, f"{list_name}_t")[attr].loc[snapshots],
+                check_exact=False, rtol=0, atol=atol, check_names=False)
+
+
+def test_ac_sweep_matches_newton_raphson():
+    reference = make_network()
+    assert reference.pf()['converged'].all().all()
+    network = make_network()
+    analyzer = PowerFlowAnalyzer(network, mode="ac")
+    records = analyzer.run_ac_sweep()
+
+    assert len(network.sub_networks) == 3
+    assert records['converged'].all() and analyzer.results_available
+    assert records['start'].tolist() == ["flat"] + ["warm"] * 4
+    # La jacobienne du premier snapshot sert à tous les suivants
+    assert (records['factorizations'].iloc[1:] == 0).all()
+    assert_matches_pf(network, reference, network.snapshots)
+
+
+def test_ac_sweep_falls_back_to_flat_start():
+    reference = make_network()
+    reference.pf()
+    network = make_network()
+    # Trop peu d'itérations pour que la jacobienne figée converge au dernier snapshot
+    records = PowerFlowAnalyzer(network, mode="ac").run_ac_sweep(max_iter=4)
+
+    assert records['start'].iloc[-1] == "flat_fallback"
+    assert records['converged'].all()
+    assert_matches_pf(network, reference, network.snapshots)
+
+
+def test_ac_sweep_reports_diverged_snapshot():
+    scale = [0.8, 0.9, 8.0, 1.1, 1.2]
+    reference = make_network(scale)
+    converged = reference.pf()['converged'].all(axis=1)
+    assert converged.tolist() == [True, True, False, True, True]
+
+    network = make_network(scale)
+    analyzer = PowerFlowAnalyzer(network, mode="ac")
+    records = analyzer.run_ac_sweep()
+
+    assert records['converged'].tolist() == converged.tolist()
+    assert records['start'].iloc[2] == "flat_fallback"
+    assert not analyzer.results_available
+    # Les snapshots suivants repartent de la dernière solution convergée
+    assert_matches_pf(network, reference, network.snapshots[converged.to_numpy()])
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_ac_jacobian_matches_finite_differences(seed):
+    network = make_network()
+    network.determine_network_topology()
+    network.calculate_dependent_values()
+    sub_network = network.sub_networks.obj.iloc[0]
+    sub_network.find_bus_controls()
+    sub_network.calculate_Y(skip_pre=True)
+    Y = sub_network.Y.tocsr()
+    n_buses, n_pv = len(sub_network.buses_o), len(sub_network.pvs)
+
+    rng = np.random.default_rng(seed)
+    v_mag = rng.uniform(0.95, 1.05, n_buses)
+    v_ang = rng.uniform(-0.2, 0.2, n_buses)
+
+    def mismatch(x):
+        ang, mag = v_ang.copy(), v_mag.copy()
+        ang[1:] = x[:n_buses - 1]
+        mag[1 + n_pv:] = x[n_buses - 1:]
+        V = mag * np.exp(1j * ang)
+        power = V * np.conj(Y @ V)
+        return np.r_[power.real[1:], power.imag[1 + n_pv:]]
+
+    x = np.r_[v_ang[1:], v_mag[1 + n_pv:]]
+    step = 1e-7
+    numerical = np.column_stack([(mismatch(x + step * e) - mismatch(x - step * e)) / (2 * step)
+                                 for e in np.eye(len(x))])
+    jacobian = _ac_jacobian(Y, v_mag * np.exp(1j * v_ang), n_pv).toarray()
+    np.testing.assert_allclose(jacobian, numerical, rtol=1e-5, atol=1e-4)
@@ -0,0 +1,101 @@
+"""
+Tests du chargement des données (utils.data_loader).
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import pandas as pd
+import pytest
+
+from utils.data_loader import NetworkDataLoader
+
+COMPONENTS = ["Bus", "Load", "LineType", "Line", "Carrier", "Generator", "GlobalConstraint"]
+
+
+def test_bulk_loading_matches_rowwise_loading(small_data_dir):
+    loader = NetworkDataLoader(str(small_data_dir))
+    bulk = loader.load_network_data(bulk=True)
+    rowwise = loader.load_network_data(bulk=False)
+
+    buses = pd.read_csv(small_data_dir / "regions" / "buses.csv")
+    assert buses['name'].duplicated().any()
+    assert len(bulk.buses) == buses['name'].nunique()
+
+    for component in COMPONENTS:
+        bulk_df = bulk.c[component].static
+        rowwise_df = rowwise.c[component].static
+        assert not bulk_df.empty, component
+        pd.testing.assert_frame_equal(bulk_df, rowwise_df[bulk_df.columns], check_dtype=False)
+
+
+def test_benchmark_reports_identical_networks(small_data_dir):
+    timings = NetworkDataLoader(str(small_data_dir)).benchmark_network_loading()
+    assert timings['identical']
+    assert timings['bulk_seconds'] > 0
+
+
+@pytest.fixture
+def parquet_data_dir(small_data_dir):
+    """Données réduites avec les séries converties en Parquet."""
+    written = NetworkDataLoader(str(small_data_dir)).convert_timeseries_to_parquet()
+    assert len(written) == len(NetworkDataLoader.TIMESERIES_FILES)
+    return small_data_dir
+
+
+@pytest.mark.parametrize("name", list(NetworkDataLoader.TIMESERIES_FILES))
+@pytest.mark.parametrize("window", [(None, None), ("2024-01-06", "2024-01-12"),
+                                    ("2024-01-20 05:00", None), (None, "2024-01-01")])
+def test_parquet_reads_match_csv_reads(parquet_data_dir, name, window):
+    csv_loader = NetworkDataLoader(str(parquet_data_dir), timeseries_backend="csv")
+    parquet_loader = NetworkDataLoader(str(parquet_data_dir), timeseries_backend="parquet")
+    start_date, end_date = window
+
+    full = pd.read_csv(csv_loader.get_timeseries_path("2024", name), index_col=0, parse_dates=True)
+    # La date de fin sans heure inclut toute la journée
+    expected = full.loc[start_date:end_date]
+
+    from_csv = csv_loader.read_timeseries("2024", name, start_date, end_date)
+    from_parquet = parquet_loader.read_timeseries("2024", name, start_date, end_date)
+
+    pd.testing.assert_frame_equal(from_csv, expected, check_freq=False, check_index_type=False)
+    pd.testing.assert_frame_equal(from_parquet, expected, check_freq=False,
+                                  check_index_type=False, check_names=False)
+
+
+def test_projected_timeseries_match_between_backends(parquet_data_dir):
+    networks = {}
+    for backend in ["csv", "parquet"]:
+        loader = NetworkDataLoader(str(parquet_data_dir), timeseries_backend=backend)
+        network = loader.load_network_data()
+        networks[backend] = loader.load_timeseries_data(network, "2024", "2024-01-03", "2024-01-09",
+                                                        project_columns=True)
+
+    csv_network, parquet_network = networks["csv"], networks["parquet"]
+    assert len(csv_network.snapshots) == 7 * 24
+    # Seules les colonnes des charges du réseau sont lues
+    assert csv_network.loads_t.p_set.shape[1] == 6
+    assert csv_network.loads_t.p_set.columns.isin(csv_network.loads.index).all()
+    assert csv_network.snapshots.equals(parquet_network.snapshots)
+    for attr in ["loads_t.p_set", "generators_t.marginal_cost", "generators_t.p_max_pu"]:
+        dynamic, name = attr.split(".")
+        csv_df = getattr(csv_network, dynamic)[name]
+        parquet_df = getattr(parquet_network, dynamic)[name]
+        assert not csv_df.empty, attr
+        pd.testing.assert_frame_equal(csv_df, parquet_df[csv_df.columns], check_freq=False,
+                                      check_index_type=False, check_names=False)
+
+
+def test_missing_marginal_cost_file_keeps_static_costs(small_data_dir):
+    loader = NetworkDataLoader(str(small_data_dir))
+    loader.get_timeseries_path("2024", "generators_marginal_cost").unlink()
+
+    network = loader.load_network_data()
+    static = network.generators.marginal_cost.copy()
+    network = loader.load_timeseries_data(network, "2024", "2024-01-02", "2024-01-03")
+
+    assert len(network.snapshots) == 48
+    assert network.generators_t.marginal_cost.empty
+    assert not network.generators_t.p_max_pu.empty
+    costs = network.get_switchable_as_dense("Generator", "marginal_cost")
+    assert (costs == static).all().all()
@@ -0,0 +1,105 @@
+"""
+Tests des calculs géographiques (utils.geo_utils).
+
+Les calculs vectorisés sont comparés à la formule de Haversine scalaire
+(GeoUtils.calculate_distance), point par point, et l'index spatial des bus
+à une recherche par force brute.
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.geo_utils import BusSpatialIndex, GeoUtils
+
+
+def random_points(n: int, seed: int) -> np.ndarray:
+    """Points (latitude, longitude) tirés sur le territoire du Québec."""
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(45.0, 62.0, n), rng.uniform(-79.5, -57.0, n)])
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_distances_match_scalar_haversine(seed):
+    geo = GeoUtils()
+    points, other = random_points(40, seed), random_points(30, seed + 10)
+    scalar = np.array([[geo.calculate_distance(p, q) for q in other] for p in points])
+
+    np.testing.assert_allclose(geo.distance_matrix(points, other), scalar, rtol=1e-10)
+    np.testing.assert_allclose(geo.distance_matrix(points, other, chunk_size=7), scalar, rtol=1e-10)
+    np.testing.assert_allclose(geo.distance_matrix(points, other, dtype=np.float32), scalar, rtol=1e-4)
+    np.testing.assert_allclose(geo.calculate_distances(points[:30], other), np.diag(scalar), rtol=1e-10)
+    # Un point seul est diffusé contre le tableau
+    np.testing.assert_allclose(geo.calculate_distances(points, tuple(other[0])), scalar[:, 0],
+                               rtol=1e-10)
+
+    square = geo.distance_matrix(points)
+    np.testing.assert_allclose(np.diag(square), 0.0, atol=1e-9)
+    np.testing.assert_allclose(square, square.T, rtol=1e-12)
+
+
+def test_line_lengths_match_scalar_haversine():
+    geo = GeoUtils()
+    points = random_points(20, seed=0)
+    lines = [points[:5], points[5:6], [], points[6:8], points[8:20]]
+
+    expected = [sum(geo.calculate_distance(a, b) for a, b in zip(line[:-1], line[1:]))
+                for line in lines]
+    np.testing.assert_allclose(geo.calculate_line_lengths(lines), expected, rtol=1e-10)
+    assert geo.calculate_line_length([tuple(p) for p in points[:5]]) == pytest.approx(expected[0])
+    assert geo.calculate_line_length([tuple(points[0])]) == 0.0
+
+
+def test_line_lengths_from_buses():
+    geo = GeoUtils()
+    buses = pd.DataFrame({'latitude': [45.5017, 46.8139, 99.0, 46.3432],
+                          'longitude': [-73.5673, -71.2080, 0.0, -72.5477]},
+                         index=["Montreal", "Quebec", "Montreal", "TroisRivieres"])
+    lines = pd.DataFrame({'bus0': ["Montreal", "Quebec", "Montreal"],
+                          'bus1': ["Quebec", "TroisRivieres", "Inconnu"]}, index=["L1", "L2", "L3"])
+
+    lengths = geo.calculate_line_lengths_from_buses(lines, buses)
+    # Nom en double : première occurrence ; bus inconnu : NaN
+    assert lengths["L1"] == pytest.approx(geo.calculate_distance((45.5017, -73.5673), (46.8139, -71.2080)))
+    assert lengths["L2"] == pytest.approx(geo.calculate_distance((46.8139, -71.2080), (46.3432, -72.5477)))
+    assert np.isnan(lengths["L3"])
+
+
+def make_buses(n: int, seed: int, prefix: str) -> pd.DataFrame:
+    points = random_points(n, seed)
+    return pd.DataFrame({'latitude': points[:, 0], 'longitude': points[:, 1]},
+                        index=[f"{prefix}{i}" for i in range(n)])
+
+
+@pytest.mark.parametrize("rebuild_ratio, rebuilds", [(1.0, 1), (0.1, 2)])
+def test_spatial_index_matches_brute_force_after_add(rebuild_ratio, rebuilds):
+    geo = GeoUtils()
+    buses = make_buses(200, seed=0, prefix="B")
+    added = make_buses(50, seed=1, prefix="N")
+    added.iloc[0] = np.nan  # bus sans coordonnées, ignoré
+
+    index = BusSpatialIndex(buses, rebuild_ratio=rebuild_ratio)
+    index.add(added)
+    # Ajouts cherchés par force brute, ou arbre reconstruit
+    assert index.n_rebuilds == rebuilds
+    all_buses = pd.concat([buses, added.iloc[1:]])
+    assert list(index.names) == list(all_buses.index)
+
+    queries = random_points(25, seed=2)
+    distances = geo.distance_matrix(queries, all_buses.to_numpy())
+    order = np.argsort(distances, axis=1)[:, :5]
+
+    found_km, found = index.query(queries, k=5)
+    np.testing.assert_array_equal(found, all_buses.index.to_numpy()[order])
+    np.testing.assert_allclose(found_km, np.take_along_axis(distances, order, axis=1), rtol=1e-9)
+
+    results = index.query_radius(queries, radius_km=150.0)
+    assert sum(len(result) for result in results) > len(queries)
+    for row, result in zip(distances, results):
+        inside = np.flatnonzero(row <= 150.0)
+        expected = pd.Series(row[inside], index=all_buses.index[inside]).sort_values()
+        assert list(result.index) == list(expected.index)
+        np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-9)
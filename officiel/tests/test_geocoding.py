@@ -0,0 +1,187 @@
+"""
+Tests du géocodage concurrent avec cache (utils.geocoding).
+
+Les requêtes sont envoyées à un serveur Nominatim local (ThreadingHTTPServer)
+dont les réponses dépendent du nom demandé :
+- 'Inconnu...' : réponse vide (nom introuvable)
+- 'Instable...' : erreur 503 à la première requête, puis réponse normale
+- 'Panne...' : erreur 500 tant que le serveur est en panne
+- autres noms : coordonnées
+
+Le dernier test passe par LineFilter.geolocate_nodes, du fichier des nœuds
+au fichier géolocalisé.
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from utils.geocoding import Geocoder, NominatimProvider, normalize_name
+from utils.lines_filter import LineFilter
+
+
+class StubNominatimHandler(BaseHTTPRequestHandler):
+    """Répond aux recherches comme Nominatim, selon le nom demandé."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        name = parse_qs(urlparse(self.path).query)['q'][0]
+        with server.lock:
+            server.hits.append((time.monotonic(), name))
+            count = Counter(hit for _, hit in server.hits)[name]
+
+        headers = {}
+        if name.startswith('Inconnu'):
+            status, body = 200, []
+        elif name.startswith('Instable') and count == 1:
+            status, body = 503, []
+            headers['Retry-After'] = '0'
+        elif name.startswith('Panne') and server.outage:
+            status, body = 500, []
+        else:
+            status, body = 200, [{'lat': '46.5', 'lon': str(-70.0 - len(name) / 100)}]
+
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def stub_server():
+    """Serveur Nominatim local, arrêté à la fin du test."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubNominatimHandler)
+    server.hits = []
+    server.lock = threading.Lock()
+    server.outage = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_geocoder(server, cache_path, rate_limit=1000.0, **kwargs):
+    """Crée un géocodeur pointant vers le serveur local."""
+    provider = NominatimProvider(base_url=f"http://127.0.0.1:{server.server_port}/search",
+                                 suffix="", rate_limit=rate_limit)
+    return Geocoder(provider, str(cache_path), **kwargs)
+
+
+def test_normalize_name():
+    assert normalize_name("Poste  Hértel ") == normalize_name("poste hertel")
+
+
+def test_duplicate_names_are_requested_once(stub_server, tmp_path):
+    geocoder = make_geocoder(stub_server, tmp_path / "cache.sqlite")
+    results = geocoder.geocode(["Hertel", "HERTEL", "Hértel ", "Hertel", "Outaouais"])
+    geocoder.cache.close()
+
+    assert len(stub_server.hits) == 2
+    assert list(results.index) == ["Hertel", "HERTEL", "Hértel ", "Outaouais"]
+    assert (results['status'] == 'ok').all()
+    assert results.loc["HERTEL", 'longitude'] == results.loc["Hertel", 'longitude']
+
+
+def test_cached_names_are_not_requested_again(stub_server, tmp_path):
+    cache_path = tmp_path / "cache.sqlite"
+    names = ["Hertel", "Outaouais", "Inconnu"]
+
+    geocoder = make_geocoder(stub_server, cache_path)
+    first = geocoder.geocode(names)
+    geocoder.cache.close()
+    assert first.loc["Inconnu", 'status'] == 'not_found'
+    assert len(stub_server.hits) == 3
+
+    # Nouvelle instance : le cache persistant suffit
+    geocoder = make_geocoder(stub_server, cache_path)
+    second = geocoder.geocode(names)
+    geocoder.cache.close()
+    assert len(stub_server.hits) == 3
+    assert geocoder.stats == {'cached': 3, 'requested': 0, 'failed': 0}
+    assert second.equals(first)
+
+    # Les noms introuvables ne sont redemandés que sur demande
+    geocoder = make_geocoder(stub_server, cache_path, retry_not_found=True)
+    geocoder.geocode(names)
+    geocoder.cache.close()
+    assert [name for _, name in stub_server.hits[3:]] == ["Inconnu"]
+
+
+def test_temporary_error_is_retried(stub_server, tmp_path):
+    geocoder = make_geocoder(stub_server, tmp_path / "cache.sqlite", max_retries=2)
+    results = geocoder.geocode(["Instable"])
+    geocoder.cache.close()
+
+    assert [name for _, name in stub_server.hits] == ["Instable", "Instable"]
+    assert results.loc["Instable", 'status'] == 'ok'
+    assert geocoder.stats['failed'] == 0
+
+
+def test_failed_names_are_requested_on_next_run(stub_server, tmp_path):
+    cache_path = tmp_path / "cache.sqlite"
+
+    geocoder = make_geocoder(stub_server, cache_path, max_retries=0)
+    results = geocoder.geocode(["Hertel", "Panne"])
+    geocoder.cache.close()
+    assert results.loc["Panne", 'status'] == 'error'
+    assert geocoder.stats['failed'] == 1
+
+    stub_server.outage = False
+    geocoder = make_geocoder(stub_server, cache_path, max_retries=0)
+    results = geocoder.geocode(["Hertel", "Panne"])
+    geocoder.cache.close()
+    assert Counter(name for _, name in stub_server.hits) == {"Hertel": 1, "Panne": 2}
+    assert results.loc["Panne", 'status'] == 'ok'
+
+
+def test_rate_limit_is_shared_between_threads(stub_server, tmp_path):
+    rate = 20.0
+    names = [f"Poste {i}" for i in range(6)]
+    geocoder = make_geocoder(stub_server, tmp_path / "cache.sqlite",
+                             rate_limit=rate, max_workers=4)
+    geocoder.geocode(names)
+    geocoder.cache.close()
+
+    times = sorted(t for t, _ in stub_server.hits)
+    assert len(times) == len(names)
+    # Seau d'un jeton : au plus une requête immédiate, puis rate par seconde
+    assert times[-1] - times[0] >= (len(names) - 1) / rate * 0.9
+
+
+def test_geolocate_nodes_writes_coordinates(stub_server, tmp_path):
+    nodes = pd.DataFrame({'node_name': ["Hertel", "Inconnu", "Outaouais", "HERTEL"]})
+    nodes.to_csv(tmp_path / "unique_nodes.csv", index=False)
+    output = tmp_path / "out" / "geolocated_nodes.csv"
+    provider = NominatimProvider(base_url=f"http://127.0.0.1:{stub_server.server_port}/search",
+                                 suffix="", rate_limit=1000.0)
+
+    LineFilter().geolocate_nodes(str(tmp_path / "unique_nodes.csv"), str(output),
+                                 provider=provider, cache_path=str(tmp_path / "cache.sqlite"))
+
+    result = pd.read_csv(output)
+    assert list(result['node_name']) == list(nodes['node_name'])
+    assert result.loc[[0, 2, 3], 'latitude'].eq(46.5).all()
+    assert result.loc[[0, 2], 'longitude'].tolist() == [-70.0 - len("Hertel") / 100,
+                                                        -70.0 - len("Outaouais") / 100]
+    assert result.loc[3, 'longitude'] == result.loc[0, 'longitude']
+    assert result.loc[1, ['latitude', 'longitude']].isna().all()
+    assert len(stub_server.hits) == 3
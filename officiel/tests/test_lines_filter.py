@@ -0,0 +1,92 @@
+"""
+Tests du remplissage des coordonnées manquantes (utils.lines_filter).
+
+La méthode 'sequential' vectorisée est comparée à la boucle d'origine
+(parcours ligne par ligne du point précédent et du point suivant).
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.lines_filter import LineFilter
+
+
+def reference_fill(df: pd.DataFrame) -> pd.DataFrame:
+    """Boucle d'origine de fill_missing_coordinates, en O(n²)."""
+    df = df.copy()
+    for index, row in df.iterrows():
+        if pd.isna(row['latitude']) or pd.isna(row['longitude']):
+            prev_index = None
+            for i in range(index - 1, -1, -1):
+                if not pd.isna(df.at[i, 'latitude']) and not pd.isna(df.at[i, 'longitude']):
+                    prev_index = i
+                    break
+            next_index = None
+            for i in range(index + 1, len(df)):
+                if not pd.isna(df.at[i, 'latitude']) and not pd.isna(df.at[i, 'longitude']):
+                    next_index = i
+                    break
+            if prev_index is not None and next_index is not None:
+                df.at[index, 'latitude'] = (df.at[prev_index, 'latitude'] + df.at[next_index, 'latitude']) / 2
+                df.at[index, 'longitude'] = (df.at[prev_index, 'longitude'] + df.at[next_index, 'longitude']) / 2
+    return df
+
+
+def make_nodes(n: int, missing_rate: float, seed: int) -> pd.DataFrame:
+    """Nœuds aléatoires dont une partie n'a pas de latitude, de longitude ou des deux."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'node_name': [f"Poste {i}" for i in range(n)],
+        'latitude': rng.uniform(45.0, 55.0, n),
+        'longitude': rng.uniform(-79.0, -60.0, n),
+    })
+    missing = rng.random(n) < missing_rate
+    which = rng.integers(0, 3, n)
+    df.loc[missing & (which != 1), 'latitude'] = np.nan
+    df.loc[missing & (which != 2), 'longitude'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("missing_rate", [0.1, 0.5, 0.9])
+def test_sequential_fill_matches_original_loop(seed, missing_rate):
+    df = make_nodes(200, missing_rate, seed)
+    filled = LineFilter()._fill_sequential(df)
+    pd.testing.assert_frame_equal(filled, reference_fill(df), check_exact=False, rtol=1e-12)
+
+
+def test_fill_missing_coordinates_writes_sequential_fill(tmp_path):
+    df = make_nodes(50, 0.4, seed=7)
+    df.to_csv(tmp_path / "geolocated.csv", index=False)
+    output = tmp_path / "out" / "filled.csv"
+
+    LineFilter().fill_missing_coordinates(str(tmp_path / "geolocated.csv"), str(output))
+    pd.testing.assert_frame_equal(pd.read_csv(output), reference_fill(df), check_exact=False)
+
+
+def test_neighbors_fill_uses_connected_nodes(tmp_path):
+    # A - X - Y - B : X et Y convergent vers les tiers du segment AB ;
+    # Z n'est relié à rien et est rempli par la méthode 'sequential'
+    nodes = pd.DataFrame({
+        'node_name': ["A", "X", "Z", "Y", "B"],
+        'latitude': [45.0, np.nan, np.nan, np.nan, 48.0],
+        'longitude': [-72.0, np.nan, np.nan, np.nan, -75.0],
+    })
+    lines = pd.DataFrame({'bus0': ["A", "X", "Y", "Y"], 'bus1': ["X", "Y", "B", "B"]})
+    nodes.to_csv(tmp_path / "geolocated.csv", index=False)
+    lines.to_csv(tmp_path / "lines.csv", index=False)
+    output = tmp_path / "out" / "filled.csv"
+
+    LineFilter().fill_missing_coordinates(str(tmp_path / "geolocated.csv"), str(output),
+                                          method='neighbors', lines_file=str(tmp_path / "lines.csv"),
+                                          tol=1e-12)
+    filled = pd.read_csv(output).set_index('node_name')
+
+    np.testing.assert_allclose(filled.loc["X"], [46.0, -73.0], atol=1e-9)
+    np.testing.assert_allclose(filled.loc["Y"], [47.0, -74.0], atol=1e-9)
+    # Z est entre X (rempli) et Y (rempli) dans la liste
+    np.testing.assert_allclose(filled.loc["Z"], [46.5, -73.5], atol=1e-9)
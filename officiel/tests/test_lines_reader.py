@@ -0,0 +1,137 @@
+"""
+Tests de la lecture du fichier des lignes de transmission (utils.lines_filter).
+
+Le classeur de test reproduit le format CEF : une seule colonne dont chaque
+cellule est une ligne CSV, avec des guillemets et des valeurs 'NULL'.
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import pandas as pd
+import pytest
+
+from utils.lines_filter import LineFilter
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+ROWS = [
+    # id, circuit, province, voltage, reactance, ttc_summer, notes
+    ("1", "C1", "QC", "735", "0.25", "2000", "Ligne A"),
+    ("2", "C2", "ON", "500", "NULL", "1500", ""),
+    ("3", "C3", "QC", "315", "0.10", "NULL", "Notes, avec virgule"),
+    ("4", "C4", "NB", "345", "0.30", "900", "NULL"),
+    ("5", "C5", "QC", "\"120\"", "0.05", "300", "\"Entre guillemets\""),
+]
+
+
+def make_row(line_id, circuit, province, voltage, reactance, ttc, notes):
+    """Ligne CSV du format CEF (colonnes absentes du test à NULL)."""
+    values = dict.fromkeys(LineFilter().column_names, "NULL")
+    values.update({
+        'transmission_line_id': line_id, 'transmission_circuit_id': circuit,
+        'owner': "\"Hydro\"", 'province': province, 'voltage': voltage,
+        'reactance': reactance, 'ttc_summer': ttc, 'ttc_winter': ttc,
+        'network_node_code_starting': f"N{line_id}_GSS",
+        'network_node_code_ending': f"N{line_id}_DSS", 'notes': notes,
+    })
+    return ",".join(values.values())
+
+
+def write_workbook(path, rows=ROWS):
+    """Classeur d'une colonne : en-tête CSV puis une cellule par ligne."""
+    header = ",".join(LineFilter().column_names)
+    pd.DataFrame({header: [make_row(*row) for row in rows]}).to_excel(path, index=False)
+    return path
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    return write_workbook(tmp_path / "lines.xlsx")
+
+
+def test_single_column_workbook_is_split_and_typed(workbook):
+    df = LineFilter()._parse_excel(workbook)
+
+    assert list(df.columns) == LineFilter().column_names
+    # La première ligne de données n'est pas prise pour l'en-tête
+    assert df['transmission_line_id'].tolist() == [1, 2, 3, 4, 5]
+    for column, dtype in LineFilter.COLUMN_TYPES.items():
+        assert str(df[column].dtype) == dtype
+    assert df['voltage'].tolist() == [735, 500, 315, 345, 120]
+
+    # NULL et cellules vides deviennent des valeurs manquantes
+    assert pd.isna(df.at[1, 'reactance']) and pd.isna(df.at[2, 'ttc_summer'])
+    assert pd.isna(df.at[1, 'notes']) and pd.isna(df.at[3, 'notes'])
+    assert df['line_length_km'].isna().all()
+
+    # Guillemets retirés, virgules conservées dans les notes
+    assert set(df['owner']) == {"Hydro"}
+    assert df.at[2, 'notes'] == "Notes, avec virgule"
+    assert df.at[4, 'notes'] == "Entre guillemets"
+
+
+def test_parquet_cache_is_reused_until_workbook_changes(workbook, monkeypatch):
+    line_filter = LineFilter()
+    cache = line_filter.convert_to_parquet(workbook)
+    assert cache == workbook.with_suffix('.parquet')
+    pd.testing.assert_frame_equal(pd.read_parquet(cache).sort_values('transmission_line_id')
+                                  .reset_index(drop=True), line_filter._parse_excel(workbook))
+
+    # Classeur inchangé : le cache est repris sans décodage
+    def fail(_):
+        raise AssertionError("classeur décodé à nouveau")
+    monkeypatch.setattr(line_filter, '_parse_excel', fail)
+    assert line_filter.convert_to_parquet(workbook) == cache
+    monkeypatch.undo()
+
+    write_workbook(workbook, ROWS[:2])
+    line_filter.convert_to_parquet(workbook)
+    assert sorted(pd.read_parquet(cache)['transmission_line_id']) == [1, 2]
+
+
+def test_province_filter_is_pushed_down(workbook, monkeypatch):
+    monkeypatch.setattr(LineFilter, 'PARQUET_ROW_GROUP_SIZE', 2)
+    cache = LineFilter().convert_to_parquet(workbook)
+
+    # Cache trié par province : chaque groupe de lignes n'en contient qu'une
+    metadata = pq.ParquetFile(cache).metadata
+    column = metadata.schema.names.index('province')
+    groups = [metadata.row_group(i).column(column).statistics for i in range(metadata.num_row_groups)]
+    assert [(s.min, s.max) for s in groups] == [("NB", "ON"), ("QC", "QC"), ("QC", "QC")]
+
+    filters = []
+    read_parquet = pd.read_parquet
+
+    def spy(path, **kwargs):
+        filters.append(kwargs.get('filters'))
+        return read_parquet(path, **kwargs)
+    monkeypatch.setattr(pd, 'read_parquet', spy)
+
+    df = LineFilter().read_lines(str(workbook), province='QC')
+    assert filters == [[('province', '==', 'QC')]]
+    assert df['transmission_line_id'].tolist() == [1, 3, 5]
+
+
+def test_read_lines_keeps_result_until_file_changes(workbook, monkeypatch):
+    line_filter = LineFilter()
+    calls = []
+    read_excel_file = line_filter._read_excel_file
+
+    def counting(path, province=None):
+        calls.append(province)
+        return read_excel_file(path, province)
+    monkeypatch.setattr(line_filter, '_read_excel_file', counting)
+
+    first = line_filter.read_lines(str(workbook))
+    province = first.at[0, 'province']
+    first.loc[0, 'province'] = "XX"
+    second = line_filter.read_lines(str(workbook))
+    assert calls == [None]
+    # Copie retournée : le résultat en mémoire n'est pas modifié
+    assert second.at[0, 'province'] == province
+
+    line_filter.read_lines(str(workbook), province='QC')
+    write_workbook(workbook, ROWS[:3])
+    assert len(line_filter.read_lines(str(workbook))) == 3
+    assert calls == [None, 'QC', None]
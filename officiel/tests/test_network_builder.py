@@ -0,0 +1,91 @@
+"""
+Tests du cache des réseaux construits (utils.network_cache, NetworkBuilder).
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import pickle
+
+import pandas as pd
+import pypsa
+import pytest
+
+from core.network_builder import NetworkBuilder
+from utils.network_cache import NetworkCache
+
+
+def make_network() -> pypsa.Network:
+    network = pypsa.Network()
+    network.add("Bus", ["A", "B"])
+    network.add("Line", "AB", bus0="A", bus1="B", x=1.0, s_nom=100.0)
+    return network
+
+
+@pytest.fixture
+def sources(tmp_path):
+    paths = [tmp_path / "buses.csv", tmp_path / "lines.csv"]
+    for path in paths:
+        path.write_text("name\nA\n")
+    return paths
+
+
+def test_key_follows_file_contents_and_params(tmp_path, sources):
+    cache = NetworkCache(tmp_path / "cache")
+    key = cache.compute_key(sources, year='2024')
+    # Ordre des fichiers et nouvelle instance sans effet
+    assert NetworkCache(tmp_path / "cache").compute_key(sources[::-1], year='2024') == key
+
+    assert cache.compute_key(sources, year='2035') != key
+    assert cache.compute_key(sources, year='2024', start_date='2024-01-01') != key
+    assert NetworkCache(tmp_path / "cache", fmt="netcdf").compute_key(sources, year='2024') != key
+
+    sources[1].write_text("name\nB\n")
+    assert cache.compute_key(sources, year='2024') != key
+
+
+def test_save_replaces_entries_atomically(tmp_path, monkeypatch):
+    cache = NetworkCache(tmp_path / "cache")
+    assert cache.load("cle") is None
+
+    cache.save("cle", make_network())
+    assert list(cache.load("cle").lines.index) == ["AB"]
+
+    # Écriture interrompue : l'entrée précédente reste lisible
+    def interrupted(*args, **kwargs):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(pickle, "dump", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        cache.save("cle", pypsa.Network())
+    monkeypatch.undo()
+    assert list(cache.load("cle").lines.index) == ["AB"]
+    assert [path.name for path in cache.cache_dir.iterdir()] == ["network_cle.pkl"]
+
+    # Entrée corrompue : ignorée, le réseau est reconstruit
+    cache.get_path("cle").write_bytes(b"tronque")
+    assert cache.load("cle") is None
+    assert cache.clear() == 1 and cache.get_stats()['entries'] == 0
+
+
+def test_create_network_hits_cache_until_sources_change(small_data_dir):
+    builder = NetworkBuilder(str(small_data_dir))
+    network = builder.create_network("2024")
+    assert builder.cache_info['hit'] is False
+    key = builder.cache_info['key']
+
+    builder = NetworkBuilder(str(small_data_dir))
+    cached = builder.create_network("2024")
+    assert builder.cache_info['hit'] is True and builder.cache_info['key'] == key
+    pd.testing.assert_frame_equal(cached.loads_t.p_set, network.loads_t.p_set)
+    pd.testing.assert_frame_equal(cached.lines, network.lines)
+
+    loads = small_data_dir / "timeseries" / "2024" / "loads-p_set.csv"
+    df = pd.read_csv(loads, index_col=0)
+    (df * 2).to_csv(loads)
+    builder.create_network("2024")
+    assert builder.cache_info['hit'] is False and builder.cache_info['key'] != key
+
+    # Sans cache : rien n'est écrit ni relu
+    builder = NetworkBuilder(str(small_data_dir), use_cache=False)
+    builder.create_network("2024")
+    assert builder.network_cache is None and builder.cache_info == {}
@@ -0,0 +1,146 @@
+"""
+Tests de la réduction spatiale du réseau (core.network_reduction).
+
+Le réseau de test compte deux zones éloignées (ouest et est), fortement
+maillées à l'intérieur et reliées par deux lignes de forte réactance. Les
+tensions nominales sont mélangées, y compris aux extrémités d'une même ligne.
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+import pytest
+
+from core.network_reduction import NetworkReducer
+
+BUSES = {
+    # nom : (latitude, longitude, v_nom)
+    "W1": (46.00, -74.00, 120.0),
+    "W2": (46.10, -74.20, 315.0),
+    "W3": (45.90, -74.10, 315.0),
+    "E1": (48.00, -68.00, 735.0),
+    "E2": (48.20, -68.10, 315.0),
+    "E3": (47.90, -68.20, 735.0),
+}
+LINES = [
+    # nom, bus0, bus1, x (ohm), s_nom (MW)
+    ("W1W2", "W1", "W2", 12.0, 500.0),
+    ("W2W3", "W2", "W3", 10.0, 500.0),
+    ("W1W3", "W1", "W3", 14.0, 500.0),
+    ("E1E2", "E1", "E2", 15.0, 500.0),
+    ("E2E3", "E2", "E3", 11.0, 500.0),
+    ("E1E3", "E1", "E3", 13.0, 500.0),
+    ("W3E1", "W3", "E1", 200.0, 400.0),
+    ("W2E2", "W2", "E2", 180.0, 400.0),
+]
+
+
+def make_network() -> pypsa.Network:
+    """Réseau de deux zones, production à l'ouest et charges à l'est."""
+    network = pypsa.Network()
+    network.set_snapshots(pd.date_range("2024-01-01", periods=3, freq="h"))
+    for name, (latitude, longitude, v_nom) in BUSES.items():
+        network.add("Bus", name, v_nom=v_nom)
+    network.buses['latitude'] = [value[0] for value in BUSES.values()]
+    network.buses['longitude'] = [value[1] for value in BUSES.values()]
+    for name, bus0, bus1, x, s_nom in LINES:
+        network.add("Line", name, bus0=bus0, bus1=bus1, x=x, r=x / 10, s_nom=s_nom)
+
+    scale = pd.Series([0.8, 1.0, 1.2], index=network.snapshots)
+    network.add("Generator", "G_W1", bus="W1", p_nom=1000.0, p_set=300.0 * scale)
+    network.add("Generator", "G_W2", bus="W2", p_nom=1000.0, p_set=100.0 * scale)
+    network.add("Load", "L_E2", bus="E2", p_set=250.0 * scale)
+    network.add("Load", "L_E3", bus="E3", p_set=150.0 * scale)
+    return network
+
+
+@pytest.fixture
+def reducer():
+    return NetworkReducer(make_network())
+
+
+def test_identity_busmap_keeps_flows_with_mixed_voltages(reducer):
+    buses = reducer.network.buses.index
+    reduced = reducer.reduce(busmap=pd.Series(buses, index=buses))
+
+    # Les réactances en p.u. (tension du bus0, comme PyPSA) sont celles d'origine
+    original = reducer.network.lines
+    equivalent = reduced.lines.loc[reducer.linemap[original.index]]
+    np.testing.assert_allclose(
+        (equivalent.x / equivalent.bus0.map(reduced.buses.v_nom) ** 2).to_numpy(),
+        (original.x / original.bus0.map(reducer.network.buses.v_nom) ** 2).to_numpy())
+
+    report = reducer.compare_flows()
+    assert report['reference_max_mw'].max() > 0
+    np.testing.assert_allclose(report['max_abs_error_mw'], 0.0, atol=1e-6)
+
+
+def test_kmeans_groups_the_two_areas(reducer):
+    busmap = reducer.get_busmap(method="kmeans", n_clusters=2)
+    assert busmap[["W1", "W2", "W3"]].nunique() == 1
+    assert busmap[["E1", "E2", "E3"]].nunique() == 1
+    assert busmap["W1"] != busmap["E1"]
+
+    reduced = reducer.reduce(busmap=busmap)
+    assert len(reduced.buses) == 2 and len(reduced.lines) == 1
+    # Deux lignes d'interconnexion en parallèle : capacités sommées
+    assert reduced.lines.s_nom.iloc[0] == 800.0
+
+
+def test_electrical_distance_groups_the_two_areas(reducer):
+    busmap = reducer.get_busmap(method="electrical", n_clusters=2)
+    assert busmap[["W1", "W2", "W3"]].nunique() == 1
+    assert busmap[["E1", "E2", "E3"]].nunique() == 1
+    assert busmap["W1"] != busmap["E1"]
+
+
+def test_electrical_distance_keeps_requested_buses(reducer):
+    busmap = reducer.get_busmap(method="electrical", n_clusters=2, keep_buses=["E2"])
+    assert busmap["E2"] == "E2"
+    assert (busmap.drop("E2") != "E2").all()
+    assert busmap.nunique() == 3
+
+
+def test_mrc_maps_buses_to_nearest_centroid(tmp_path):
+    mrc_file = tmp_path / NetworkReducer.MRC_FILE
+    mrc_file.parent.mkdir(parents=True)
+    pd.DataFrame({
+        'CDNAME': ["Ouest", "Est", "Nord"],
+        'centroid_x': [-74.1, -68.1, -71.0],
+        'centroid_y': [46.0, 48.0, 52.0],
+    }).to_csv(mrc_file, index=False)
+
+    reducer = NetworkReducer(make_network(), data_dir=str(tmp_path))
+    busmap = reducer.get_busmap(method="mrc")
+    assert busmap.to_dict() == {"W1": "Ouest", "W2": "Ouest", "W3": "Ouest",
+                                "E1": "Est", "E2": "Est", "E3": "Est"}
+
+    reduced = reducer.reduce(busmap=busmap)
+    assert sorted(reduced.buses.index) == ["Est", "Ouest"]
+    expanded = reducer.expand(pd.DataFrame([[1.0, 2.0]], columns=["Ouest", "Est"]))
+    assert expanded.loc[0].to_dict() == {"W1": 1.0, "W2": 1.0, "W3": 1.0,
+                                         "E1": 2.0, "E2": 2.0, "E3": 2.0}
+
+
+def test_equivalent_reactance_is_parallel_combination(reducer):
+    busmap = pd.Series(["W", "W", "W", "E", "E", "E"], index=reducer.network.buses.index)
+    reduced = reducer.reduce(busmap=busmap)
+    lines = reducer.network.lines.loc[["W3E1", "W2E2"]]
+    x_pu = lines.x / lines.bus0.map(reducer.network.buses.v_nom) ** 2
+    line = reduced.lines.iloc[0]
+    np.testing.assert_allclose(line.x / reduced.buses.at[line.bus0, 'v_nom'] ** 2,
+                               1.0 / (1.0 / x_pu).sum())
+
+
+def test_results_are_not_aggregated(reducer):
+    reducer.network.lpf()
+    busmap = pd.Series(["W", "W", "W", "E", "E", "E"], index=reducer.network.buses.index)
+    reduced = reducer.reduce(busmap=busmap)
+    assert reduced.lines_t.p0.empty and reduced.buses_t.p.empty
+    # Les séries d'entrée sont agrégées
+    np.testing.assert_allclose(reduced.loads_t.p_set.sum(axis=1),
+                               reducer.network.loads_t.p_set.sum(axis=1))
+    assert not reducer.network.lines_t.p0.empty
@@ -0,0 +1,71 @@
+"""
+Tests de l'optimisation par horizon glissant (core.optimization).
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+import pytest
+
+from core.optimization import NetworkOptimizer
+
+pytest.importorskip("highspy")
+
+SNAPSHOTS = pd.date_range("2024-01-01", periods=24, freq="h")
+INFLOW = 60.0
+
+
+def make_network() -> pypsa.Network:
+    """Un bus : éolien variable, gaz, réservoir à apports et batterie (Store)."""
+    network = pypsa.Network()
+    network.set_snapshots(SNAPSHOTS)
+    network.add("Bus", ["bus", "batterie"])
+    hours = np.arange(len(SNAPSHOTS))
+    network.add("Generator", "wind", bus="bus", p_nom=300.0,
+                p_max_pu=pd.Series(0.5 + 0.5 * np.sin(2 * np.pi * hours / 12), index=SNAPSHOTS))
+    network.add("Generator", "gas", bus="bus", p_nom=400.0, marginal_cost=60.0)
+    network.add("Load", "charge", bus="bus",
+                p_set=pd.Series(250.0 + 100.0 * np.cos(2 * np.pi * hours / 24), index=SNAPSHOTS))
+    # Apports supérieurs à la puissance : le réservoir se remplit sur l'horizon
+    network.add("StorageUnit", "reservoir", bus="bus", p_nom=40.0, max_hours=20.0,
+                efficiency_store=0.9, efficiency_dispatch=0.95, standing_loss=0.01,
+                state_of_charge_initial=100.0, marginal_cost=1.0, spill_cost=1000.0,
+                inflow=pd.Series(INFLOW, index=SNAPSHOTS))
+    # Niveau minimal : la batterie reste à moitié pleine aux jonctions
+    network.add("Store", "stock", bus="batterie", e_nom=200.0, e_initial=150.0, e_min_pu=0.5,
+                standing_loss=0.02)
+    network.add("Link", "charge_batterie", bus0="bus", bus1="batterie", p_nom=80.0,
+                p_min_pu=-1.0)
+    return network
+
+
+@pytest.mark.parametrize("overlap", [0, 3])
+def test_storage_level_is_continuous_across_windows(overlap):
+    network = make_network()
+    network, results = NetworkOptimizer(network).optimize_rolling_horizon(horizon=6, overlap=overlap)
+    assert len(results['windows']) == 4
+
+    # Bilan heure par heure du réservoir, y compris aux jonctions des fenêtres
+    unit = network.storage_units.loc["reservoir"]
+    soc = network.storage_units_t.state_of_charge["reservoir"].to_numpy()
+    dispatch = network.storage_units_t.p_dispatch["reservoir"].to_numpy()
+    store = network.storage_units_t.p_store["reservoir"].to_numpy()
+    spill = network.storage_units_t.spill["reservoir"].to_numpy()
+    # PyPSA n'applique pas les pertes à vide au niveau initial
+    previous = np.r_[100.0 / (1 - unit.standing_loss), soc[:-1]]
+    expected = (previous * (1 - unit.standing_loss) + unit.efficiency_store * store
+                - dispatch / unit.efficiency_dispatch + INFLOW - spill)
+    np.testing.assert_allclose(soc, expected, atol=1e-6)
+    # Le réservoir se remplit d'une fenêtre à l'autre
+    assert soc[-1] > soc[5] > 100.0
+
+    e = network.stores_t.e["stock"].to_numpy()
+    flow = network.links_t.p1["charge_batterie"].to_numpy()
+    np.testing.assert_allclose(e, np.r_[150.0 / 0.98, e[:-1]] * 0.98 - flow, atol=1e-6)
+
+    # Les niveaux initiaux d'origine sont restaurés
+    assert network.storage_units.at["reservoir", 'state_of_charge_initial'] == 100.0
+    assert network.stores.at["stock", 'e_initial'] == 150.0
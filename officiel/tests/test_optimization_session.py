@@ -0,0 +1,119 @@
+"""
+Tests de la session d'optimisation persistante (core.optimization_session).
+
+Chaque mise à jour sur place suivie d'une nouvelle résolution doit donner
+le même optimum qu'une optimisation complète du réseau modifié.
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+import pytest
+
+from core.optimization_session import OptimizationSession
+
+pytest.importorskip("highspy")
+
+SNAPSHOTS = pd.date_range("2024-01-01", periods=6, freq="h")
+
+
+def make_network(marginal_cost=None, p_max_pu=None, load=None, co2_limit=2000.0,
+                 gas_p_max_pu=1.0) -> pypsa.Network:
+    """Réseau de deux bus : hydro fixe, éolien fixe, gaz extensible et une charge."""
+    network = pypsa.Network()
+    network.set_snapshots(SNAPSHOTS)
+    network.add("Carrier", "hydro", co2_emissions=0.0)
+    network.add("Carrier", "wind", co2_emissions=0.0)
+    network.add("Carrier", "gas", co2_emissions=0.5)
+    network.add("Bus", ["Nord", "Sud"])
+    network.add("Line", "NS", bus0="Nord", bus1="Sud", x=0.1, r=0.01, s_nom=700.0)
+
+    wind = pd.Series([0.2, 0.5, 0.9, 0.7, 0.3, 0.1], index=SNAPSHOTS)
+    network.add("Generator", "hydro", bus="Nord", carrier="hydro", p_nom=400.0, marginal_cost=50.0)
+    network.add("Generator", "wind", bus="Nord", carrier="wind", p_nom=250.0,
+                p_max_pu=wind if p_max_pu is None else p_max_pu, marginal_cost=0.0)
+    network.add("Generator", "gas", bus="Sud", carrier="gas", p_nom_extendable=True,
+                capital_cost=10.0, marginal_cost=40.0, p_max_pu=gas_p_max_pu)
+    network.add("Load", "charge", bus="Sud",
+                p_set=pd.Series([500, 550, 600, 650, 600, 520], index=SNAPSHOTS, dtype=float)
+                if load is None else load)
+    network.add("GlobalConstraint", "co2_limit", type="primary_energy",
+                carrier_attribute="co2_emissions", sense="<=", constant=co2_limit)
+
+    if marginal_cost is not None:
+        network.generators_t.marginal_cost = marginal_cost
+    return network
+
+
+def reference_solution(**kwargs):
+    """Optimum d'une optimisation complète du réseau modifié."""
+    network = make_network(**kwargs)
+    status, _ = network.optimize(solver_name="highs")
+    assert status == "ok"
+    return network.objective, network.generators_t.p
+
+
+def assert_same_optimum(session, **kwargs):
+    result = session.solve()
+    objective, dispatch = reference_solution(**kwargs)
+    np.testing.assert_allclose(result['objective'], objective, rtol=1e-7)
+    np.testing.assert_allclose(session.network.generators_t.p[dispatch.columns].values,
+                               dispatch.values, atol=1e-5)
+
+
+@pytest.fixture
+def session():
+    return OptimizationSession(make_network(), solver_name="highs")
+
+
+def test_first_solve_matches_optimize(session):
+    assert_same_optimum(session)
+    assert session.history[0]['build_seconds'] > 0
+
+
+def test_marginal_cost_update_matches_rebuild(session):
+    session.solve()
+    costs = pd.DataFrame({'hydro': 45.0, 'gas': 30.0}, index=SNAPSHOTS)
+    session.update_marginal_cost(costs)
+    assert_same_optimum(session, marginal_cost=costs)
+
+
+def test_p_max_pu_update_matches_rebuild(session):
+    session.solve()
+    wind = pd.Series([0.9, 0.8, 0.1, 0.0, 0.6, 1.0], index=SNAPSHOTS)
+    session.update_p_max_pu(pd.DataFrame({'wind': wind}))
+    assert_same_optimum(session, p_max_pu=wind)
+
+
+def test_extendable_p_max_pu_update_matches_rebuild(session):
+    session.solve()
+    # Indisponibilité partielle du gaz : la capacité à construire augmente
+    gas = pd.Series([1.0, 0.9, 0.8, 0.7, 0.9, 1.0], index=SNAPSHOTS)
+    p_nom = session.network.generators.at['gas', 'p_nom_opt']
+    session.update_p_max_pu(pd.DataFrame({'gas': gas}))
+    assert_same_optimum(session, gas_p_max_pu=gas)
+    assert session.network.generators.at['gas', 'p_nom_opt'] > p_nom
+
+
+def test_load_update_matches_rebuild(session):
+    session.solve()
+    load = pd.Series([300, 350, 700, 750, 400, 380], index=SNAPSHOTS, dtype=float)
+    session.update_loads(pd.DataFrame({'charge': load}))
+    assert_same_optimum(session, load=load)
+
+
+def test_global_constraint_update_matches_rebuild(session):
+    session.solve()
+    emissions = 0.5 * session.network.generators_t.p['gas'].sum()
+    assert emissions > 500.0  # la nouvelle limite est contraignante
+    session.update_global_constraints({'co2_limit': 500.0})
+    assert_same_optimum(session, co2_limit=500.0)
+    assert len(session.get_history()) == 2
+
+
+def test_unknown_global_constraint_is_rejected(session):
+    with pytest.raises(ValueError):
+        session.update_global_constraints({'inconnue': 1.0})
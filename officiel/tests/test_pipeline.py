@@ -0,0 +1,185 @@
+"""
+Tests de la chaîne de traitement (utils.pipeline).
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import pandas as pd
+import pytest
+
+from utils.pipeline import Pipeline, PipelineStage
+
+# Appels des fonctions d'étape, et étapes à faire échouer
+CALLS = []
+FAILING = set()
+EXTERNAL = {'value': 1}
+
+
+def read_source(path):
+    CALLS.append('read')
+    with open(path) as f:
+        return pd.DataFrame({'x': [int(v) for v in f.read().split()]})
+
+
+def scale(df, factor=1):
+    CALLS.append('scale')
+    if 'scale' in FAILING:
+        raise OSError("disque plein")
+    return df * factor
+
+
+def scale_twice(df, factor=1):
+    CALLS.append('scale')
+    return df * factor * 2
+
+
+def total(df):
+    CALLS.append('total')
+    return pd.DataFrame({'total': [df['x'].sum()]})
+
+
+def external_state():
+    CALLS.append('external')
+    return pd.DataFrame({'x': [EXTERNAL['value']]})
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    CALLS.clear()
+    FAILING.clear()
+    EXTERNAL['value'] = 1
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "source.txt"
+    path.write_text("1 2 3")
+    return path
+
+
+def make_reader(source):
+    """Fonction d'étape sans argument qui lit le fichier source."""
+    def read():
+        return read_source(source)
+    return read
+
+
+def make_pipeline(tmp_path, source, factor=2, scale_func=scale):
+    """Chaîne read → scale → total, déclarée dans le désordre."""
+    return Pipeline([
+        PipelineStage('total', total, depends_on=['scale'], output=str(tmp_path / "total.csv")),
+        PipelineStage('scale', scale_func, depends_on=['read'], params={'factor': factor}),
+        PipelineStage('read', make_reader(source), sources=[str(source)]),
+    ], state_dir=str(tmp_path / ".pipeline"))
+
+
+def statuses(report):
+    return report['status'].to_dict()
+
+
+def test_stages_run_in_topological_order(tmp_path, source):
+    pipeline = make_pipeline(tmp_path, source)
+    assert pipeline.order == ['read', 'scale', 'total']
+
+    pipeline.run()
+    assert CALLS == ['read', 'scale', 'total']
+    assert pipeline.get_result('total')['total'].tolist() == [12]
+    assert pd.read_csv(tmp_path / "total.csv")['total'].tolist() == [12]
+
+
+@pytest.mark.parametrize("stages", [
+    [PipelineStage('a', total, depends_on=['b']), PipelineStage('b', total, depends_on=['a'])],
+    [PipelineStage('a', total, depends_on=['inconnue'])],
+    [PipelineStage('a', total), PipelineStage('a', total)],
+])
+def test_invalid_graphs_are_rejected(tmp_path, stages):
+    with pytest.raises(ValueError):
+        Pipeline(stages, state_dir=str(tmp_path))
+
+
+def test_unchanged_stages_are_skipped(tmp_path, source):
+    make_pipeline(tmp_path, source).run()
+    CALLS.clear()
+
+    report = make_pipeline(tmp_path, source).run()
+    assert CALLS == []
+    assert set(statuses(report).values()) == {'à jour'}
+    assert report.loc['total', 'rows'] == 1
+
+
+@pytest.mark.parametrize("change, rerun", [
+    ('params', ['scale', 'total']),
+    ('function', ['scale', 'total']),
+    ('source', ['read', 'scale', 'total']),
+])
+def test_key_changes_invalidate_downstream_stages(tmp_path, source, change, rerun):
+    make_pipeline(tmp_path, source).run()
+    CALLS.clear()
+
+    kwargs = {}
+    if change == 'params':
+        kwargs['factor'] = 3
+    elif change == 'function':
+        kwargs['scale_func'] = scale_twice
+    else:
+        source.write_text("1 2 4")
+
+    report = make_pipeline(tmp_path, source, **kwargs).run()
+    assert CALLS == rerun
+    assert [name for name, status in statuses(report).items() if status == 'exécutée'] == rerun
+
+
+def test_unchanged_upstream_output_keeps_downstream_up_to_date(tmp_path, source):
+    make_pipeline(tmp_path, source).run()
+    CALLS.clear()
+
+    # Nouvelle source, même contenu après lecture : scale et total restent à jour
+    source.write_text("1  2  3\n")
+    report = make_pipeline(tmp_path, source).run()
+    assert CALLS == ['read']
+    assert statuses(report) == {'read': 'exécutée', 'scale': 'à jour', 'total': 'à jour'}
+
+
+def test_always_run_stage_only_invalidates_on_changed_output(tmp_path):
+    def make():
+        return Pipeline([
+            PipelineStage('external', external_state, always_run=True),
+            PipelineStage('total', total, depends_on=['external']),
+        ], state_dir=str(tmp_path / ".pipeline"))
+
+    make().run()
+    CALLS.clear()
+    report = make().run()
+    assert CALLS == ['external']
+    assert statuses(report) == {'external': 'exécutée', 'total': 'à jour'}
+
+    CALLS.clear()
+    EXTERNAL['value'] = 5
+    make().run()
+    assert CALLS == ['external', 'total']
+    assert make().get_result('total')['total'].tolist() == [5]
+
+
+def test_failed_run_resumes_at_failed_stage(tmp_path, source):
+    FAILING.add('scale')
+    with pytest.raises(RuntimeError, match="scale"):
+        make_pipeline(tmp_path, source).run()
+    assert CALLS == ['read', 'scale']
+
+    CALLS.clear()
+    FAILING.clear()
+    report = make_pipeline(tmp_path, source).run()
+    assert CALLS == ['scale', 'total']
+    assert statuses(report) == {'read': 'à jour', 'scale': 'exécutée', 'total': 'exécutée'}
+
+
+def test_targets_select_stages_and_their_dependencies(tmp_path, source):
+    pipeline = make_pipeline(tmp_path, source)
+    report = pipeline.run(targets=['scale'])
+    assert CALLS == ['read', 'scale']
+    assert set(report.index) == {'read', 'scale'}
+    assert not (tmp_path / "total.csv").exists()
+
+    with pytest.raises(ValueError):
+        pipeline.run(targets=['inconnue'])
@@ -0,0 +1,274 @@
+"""
+Tests de l'analyse des flux de puissance (core.power_flow).
+
+Les facteurs LODF et l'analyse N-1 sont comparés à un recalcul complet
+(network.lpf) pour chaque ligne retirée, sur un petit réseau maillé. Les
+pertes et le chargement sont vérifiés sur les résultats d'un calcul AC.
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+import pytest
+
+from core.power_flow import PowerFlowAnalyzer
+
+LINES = [
+    # nom, bus0, bus1, x (ohm), s_nom (MW)
+    ("AB", "A", "B", 10.0, 400.0),
+    ("BC", "B", "C", 12.0, 250.0),
+    ("CD", "C", "D", 8.0, 250.0),
+    ("DE", "D", "E", 15.0, 300.0),
+    ("EA", "E", "A", 9.0, 300.0),
+    ("BE", "B", "E", 20.0, 150.0),
+    ("CF", "C", "F", 5.0, 200.0),  # ligne radiale : sa perte isole F
+]
+
+
+def make_meshed_network() -> pypsa.Network:
+    """Réseau maillé de six bus, avec une ligne radiale, sur quatre snapshots."""
+    network = pypsa.Network()
+    network.set_snapshots(pd.date_range("2024-01-01", periods=4, freq="h"))
+    network.add("Bus", list("ABCDEF"), v_nom=315.0)
+    for name, bus0, bus1, x, s_nom in LINES:
+        network.add("Line", name, bus0=bus0, bus1=bus1, x=x, r=x / 10, s_nom=s_nom)
+
+    scale = pd.Series([0.8, 1.0, 1.2, 1.4], index=network.snapshots)
+    network.add("Generator", "G_A", bus="A", p_nom=2000.0, control="Slack")
+    network.add("Generator", "G_D", bus="D", p_nom=500.0, p_set=150.0 * scale)
+    network.add("Load", "L_C", bus="C", p_set=220.0 * scale)
+    network.add("Load", "L_E", bus="E", p_set=180.0 * scale)
+    network.add("Load", "L_F", bus="F", p_set=90.0 * scale)
+    network.generators_t.p_set["G_A"] = (220.0 + 180.0 + 90.0 - 150.0) * scale
+    return network
+
+
+@pytest.fixture
+def solved_analyzer():
+    """Analyseur avec un calcul DC de base sur tous les snapshots."""
+    analyzer = PowerFlowAnalyzer(make_meshed_network(), mode="dc")
+    assert analyzer.run_power_flow()
+    return analyzer
+
+
+def outage_flows(line: str) -> pd.DataFrame:
+    """Flux DC après retrait d'une ligne, par un recalcul complet."""
+    network = make_meshed_network()
+    network.remove("Line", line)
+    network.lpf()
+    return network.lines_t.p0
+
+
+def test_lodf_matches_full_recalculation(solved_analyzer):
+    lodf = solved_analyzer.compute_lodf()
+    base = solved_analyzer.network.lines_t.p0
+
+    assert lodf["CF"].drop("CF").isna().all()
+    for outage in lodf.columns.drop("CF"):
+        expected = outage_flows(outage)
+        lines = expected.columns
+        predicted = (base[lines].values
+                     + lodf.loc[lines, outage].values[None, :] * base[outage].values[:, None])
+        np.testing.assert_allclose(predicted, expected.values, atol=1e-6)
+
+
+def test_contingency_analysis_matches_full_recalculation(solved_analyzer):
+    threshold = 90.0
+    results = solved_analyzer.run_contingency_analysis(threshold=threshold)
+    assert solved_analyzer.islanding_outages == ["CF"]
+    assert not results.empty
+
+    limits = solved_analyzer.network.lines.s_nom
+    expected = []
+    for outage in limits.index.drop("CF"):
+        loading = outage_flows(outage).abs() / limits * 100
+        for line in loading.columns[(loading > threshold).any()]:
+            expected.append((outage, line, loading[line].max(), int((loading[line] > threshold).sum()),
+                             loading[line].idxmax()))
+    expected = pd.DataFrame(expected, columns=['outage', 'line', 'loading_percent',
+                                               'n_snapshots_overloaded', 'worst_snapshot'])
+
+    merged = results.merge(expected, on=['outage', 'line'], how='outer',
+                           suffixes=('', '_expected'), indicator=True)
+    assert (merged['_merge'] == 'both').all()
+    np.testing.assert_allclose(merged['loading_percent'], merged['loading_percent_expected'])
+    assert (merged['n_snapshots_overloaded'] == merged['n_snapshots_overloaded_expected']).all()
+    assert (merged['worst_snapshot'] == merged['worst_snapshot_expected']).all()
+
+
+def test_contingency_analysis_process_pool_matches_serial(solved_analyzer):
+    serial = solved_analyzer.run_contingency_analysis(threshold=50.0)
+    # Petits blocs pour exercer le découpage, répartis sur deux processus
+    parallel = solved_analyzer.run_contingency_analysis(threshold=50.0, n_jobs=2, max_elements=50)
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_loss_redispatch_restores_network_set_points():
+    network = make_meshed_network()
+    original = network.generators_t.p_set.copy()
+    analyzer = PowerFlowAnalyzer(network, mode="ac")
+    result = analyzer.run_loss_redispatch(use_optimal_dispatch=False)
+
+    assert result['converged'] and result['iterations'] > 0
+    pd.testing.assert_frame_equal(network.generators_t.p_set, original)
+    # Les pertes prises par la référence ont été reportées sur G_D
+    np.testing.assert_allclose(result['p_set']["G_D"] - original["G_D"], result['losses'], rtol=0.05)
+
+
+def test_relieve_overloads_stops_at_threshold(solved_analyzer):
+    threshold = 85.0
+    result = solved_analyzer.relieve_overloads(
+        threshold=threshold, reinforce=False,
+        import_points={'Import_C': {'bus': 'C', 'p_nom': 2000.0, 'marginal_cost': 0.0}}
+    )
+    # Les lignes ramenées au seuil ne déclenchent pas d'itération supplémentaire
+    assert result['converged'] and result['iterations'] == 1
+    loading = solved_analyzer.get_line_loading().loading_percent
+    assert loading.max() == pytest.approx(threshold)
+
+
+def test_loss_redispatch_reports_diverged_power_flow():
+    network = make_meshed_network()
+    # Charge décuplée : le calcul AC du dernier snapshot (le plus chargé) diverge
+    network.loads_t.p_set *= 10
+    network.generators_t.p_set *= 10
+    network.generators.loc["G_D", "p_nom"] = 10000.0
+    original = network.generators_t.p_set.copy()
+
+    result = PowerFlowAnalyzer(network, mode="ac").run_loss_redispatch(use_optimal_dispatch=False)
+
+    assert result['pf_converged'].tolist() == [True, True, True, False]
+    assert not result['converged']
+    assert result['iterations'] > 0
+    # Le snapshot non convergé n'est pas redistribué
+    shift = result['p_set']["G_D"] - original["G_D"]
+    assert (shift.iloc[:3] > 0).all() and shift.iloc[3] == 0
+
+
+def make_two_level_network() -> pypsa.Network:
+    """Boucle à 735 kV et antenne à 315 kV reliées par un transformateur."""
+    network = pypsa.Network()
+    network.set_snapshots(pd.date_range("2024-01-01", periods=4, freq="h"))
+    network.add("LineType", ["315kV_line", "735kV_line"], f_nom=60.0, r_per_length=[0.039, 0.012],
+                x_per_length=[0.317, 0.28], c_per_length=0.0, i_nom=[1.5, 4.0])
+    network.add("Bus", ["A", "B", "C"], v_nom=735.0)
+    network.add("Bus", ["D", "E"], v_nom=315.0)
+    for name, bus0, bus1, line_type, length, s_nom in [
+            ("AB", "A", "B", "735kV_line", 300.0, 3000.0), ("BC", "B", "C", "735kV_line", 250.0, 3000.0),
+            ("CA", "C", "A", "735kV_line", 400.0, 3000.0), ("DE", "D", "E", "315kV_line", 80.0, 600.0)]:
+        network.add("Line", name, bus0=bus0, bus1=bus1, type=line_type, length=length, s_nom=s_nom)
+    network.add("Transformer", "TR", bus0="C", bus1="D", x=0.05, r=0.002, s_nom=1000.0)
+
+    scale = pd.Series([0.6, 0.9, 1.2, 1.5], index=network.snapshots)
+    network.add("Generator", "G_A", bus="A", control="Slack", p_set=0.0)
+    network.add("Generator", "G_B", bus="B", p_set=800.0 * scale)
+    network.add("Load", "L_C", bus="C", p_set=700.0 * scale)
+    network.add("Load", "L_E", bus="E", p_set=300.0 * scale)
+    return network
+
+
+def test_losses_and_loading_percentiles_on_two_levels():
+    network = make_two_level_network()
+    analyzer = PowerFlowAnalyzer(network, mode="ac")
+    assert analyzer.run_power_flow()
+
+    # Pertes d'une ligne : p0 + p1 (puissances injectées aux deux extrémités)
+    line_losses = network.lines_t.p0 + network.lines_t.p1
+    assert (line_losses > 0).all().all()
+    losses = analyzer.analyze_network_losses(time_resolved=True)
+
+    expected = line_losses.T.groupby(network.lines.type).sum().T
+    assert losses['losses_by_voltage'] == pytest.approx(expected.sum().to_dict())
+    pd.testing.assert_frame_equal(losses['losses_by_voltage_t'], expected[losses['losses_by_voltage_t'].columns],
+                                  check_names=False, check_column_type=False)
+    np.testing.assert_allclose(losses['losses_by_snapshot'], line_losses.sum(axis=1))
+    assert losses['total_losses_mw'] == pytest.approx(sum(losses['losses_by_voltage'].values()))
+
+    # Bilan : production - consommation = pertes des lignes et du transformateur
+    transformer_losses = network.transformers_t.p0 + network.transformers_t.p1
+    balance = network.generators_t.p.sum(axis=1) - network.loads_t.p.sum(axis=1)
+    np.testing.assert_allclose(balance, losses['losses_by_snapshot'] + transformer_losses.sum(axis=1),
+                               atol=1e-4)
+    assert losses['losses_percent'] == pytest.approx(
+        100 * losses['total_losses_mw'] / network.generators_t.p.sum().sum())
+
+    loading = network.lines_t.p0.abs() / network.lines.s_nom * 100
+    percentiles = analyzer.get_loading_percentiles((50, 95))
+    np.testing.assert_allclose(percentiles['p50'], loading.quantile(0.5))
+    np.testing.assert_allclose(percentiles['p95'], loading.quantile(0.95))
+    np.testing.assert_allclose(analyzer.get_line_loading()['loading_percent'], loading.max())
+
+
+def make_network_with_dc_link() -> pypsa.Network:
+    """Réseau maillé complété d'un sous-réseau à courant continu de trois bus."""
+    network = make_meshed_network()
+    network.add("Bus", ["DC1", "DC2", "DC3"], v_nom=450.0, carrier="DC")
+    for name, bus0, bus1, r in [("DC12", "DC1", "DC2", 4.0), ("DC23", "DC2", "DC3", 6.0),
+                                ("DC13", "DC1", "DC3", 5.0)]:
+        network.add("Line", name, bus0=bus0, bus1=bus1, r=r, s_nom=1000.0)
+    network.add("Generator", "G_DC", bus="DC1", p_nom=1000.0, control="Slack",
+                p_set=pd.Series(400.0, index=network.snapshots))
+    network.add("Load", ["L_DC2", "L_DC3"], bus=["DC2", "DC3"], p_set=[150.0, 250.0])
+    return network
+
+
+def assert_ptdf_flows_match_lpf(analyzer):
+    """Flux PTDF comparés à un calcul network.lpf sur une copie du réseau."""
+    assert analyzer.run_power_flow()
+    reference = analyzer.network.copy()
+    reference.lpf()
+    lines = analyzer.compute_ptdf().index
+    pd.testing.assert_frame_equal(analyzer.network.lines_t.p0[lines], reference.lines_t.p0[lines],
+                                  check_names=False, atol=1e-8)
+
+
+def test_ptdf_flow_matches_lpf_and_follows_topology():
+    network = make_network_with_dc_link()
+    analyzer = PowerFlowAnalyzer(network, mode="ptdf")
+    assert_ptdf_flows_match_lpf(analyzer)
+
+    # Sous-réseau DC : facteurs calculés avec la résistance, nuls hors de l'îlot
+    ptdf = analyzer.compute_ptdf()
+    assert len(ptdf) == len(network.lines)
+    assert (ptdf.loc[["DC12", "DC23", "DC13"], list("ABCDEF")] == 0).all().all()
+    assert ptdf.loc["DC12", "DC2"] != 0
+    assert analyzer.compute_ptdf() is ptdf
+
+    # Réactance modifiée, puis ligne retirée : matrice recalculée
+    network.lines.loc["BE", 'x'] = 40.0
+    assert_ptdf_flows_match_lpf(analyzer)
+    assert analyzer.compute_ptdf() is not ptdf
+
+    ptdf = analyzer.compute_ptdf()
+    network.remove("Line", "DE")
+    assert_ptdf_flows_match_lpf(analyzer)
+    assert "DE" not in analyzer.compute_ptdf().index
+
+
+def test_memoized_results_follow_solves_and_arguments(solved_analyzer):
+    loading = solved_analyzer.get_line_loading()
+    assert solved_analyzer.get_line_loading() is loading
+    assert solved_analyzer.get_line_loading(time_resolved=True) is not loading
+    # Arguments de type liste : même clé qu'un second appel identique
+    percentiles = solved_analyzer.get_loading_percentiles([50, 90])
+    assert solved_analyzer.get_loading_percentiles([50, 90]) is percentiles
+    assert list(solved_analyzer.get_loading_percentiles([10]).columns) == ["p10"]
+
+    # Nouveau calcul sur des consignes modifiées : résultats recalculés
+    network = solved_analyzer.network
+    network.loads_t.p_set *= 0.5
+    network.generators_t.p_set *= 0.5
+    assert solved_analyzer.run_power_flow()
+    updated = solved_analyzer.get_line_loading()
+    assert updated is not loading
+    np.testing.assert_allclose(updated['power_flow_mw'], loading['power_flow_mw'] * 0.5)
+
+    # Résultats modifiés hors de l'analyseur : cache vidé explicitement
+    network.lines_t.p0 *= 2
+    assert solved_analyzer.get_line_loading() is updated
+    solved_analyzer.invalidate_results()
+    np.testing.assert_allclose(solved_analyzer.get_line_loading()['power_flow_mw'],
+                               loading['power_flow_mw'])
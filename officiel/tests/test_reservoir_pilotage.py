@@ -0,0 +1,95 @@
+"""
+Tests du pilotage des réservoirs (core.reservoir_pilotage).
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+import pytest
+
+from core.reservoir_pilotage import ReservoirPilot
+
+SNAPSHOTS = pd.date_range("2024-01-01", periods=48, freq="h")
+
+
+def make_network(**reservoir) -> pypsa.Network:
+    """Réseau d'un bus : un réservoir, une centrale au gaz et une charge."""
+    network = pypsa.Network()
+    network.set_snapshots(SNAPSHOTS)
+    network.add("Carrier", ["hydro_reservoir", "gas"])
+    network.add("Bus", "bus")
+    network.add("Generator", "reservoir", bus="bus", carrier="hydro_reservoir",
+                **({'p_nom': 100.0} | reservoir))
+    network.add("Generator", "gas", bus="bus", carrier="gas", p_nom=500.0, marginal_cost=50.0)
+    network.add("Load", "charge", bus="bus", p_set=150.0)
+    return network
+
+
+def test_extendable_reservoir_uses_optimised_capacity():
+    network = make_network(p_nom=0.0, p_nom_extendable=True, p_nom_max=80.0, capital_cost=1.0)
+    pilot = ReservoirPilot(network, reservoirs=pd.DataFrame({'max_hours': [10.0]}, index=["reservoir"]))
+    # Avant optimisation : borne de l'extension
+    assert pilot.reservoirs.at["reservoir", 'e_nom'] == 800.0
+
+    network.generators.loc["reservoir", 'p_nom_opt'] = 60.0
+    pilot = ReservoirPilot(network, reservoirs=pd.DataFrame({'max_hours': [10.0]}, index=["reservoir"]))
+    assert pilot.reservoirs.at["reservoir", 'e_nom'] == 600.0
+
+
+@pytest.mark.parametrize("reservoir", [{'p_nom': 0.0},
+                                       {'p_nom': 0.0, 'p_nom_extendable': True}])
+def test_reservoir_without_capacity_is_rejected(reservoir):
+    with pytest.raises(ValueError):
+        ReservoirPilot(make_network(**reservoir))
+
+
+def test_levels_follow_inflow_and_dispatch():
+    network = make_network()
+    inflow = pd.DataFrame({'reservoir': 20.0}, index=SNAPSHOTS)
+    pilot = ReservoirPilot(network, inflow=inflow,
+                           reservoirs=pd.DataFrame({'max_hours': [10.0], 'initial_level': [0.5]},
+                                                   index=["reservoir"]))
+    dispatch = pd.DataFrame({'reservoir': 70.0}, index=SNAPSHOTS[:4])
+    state = pilot.compute_levels(dispatch)
+    np.testing.assert_allclose(state['end']['reservoir'], [0.45, 0.40, 0.35, 0.30])
+    np.testing.assert_allclose(state['spill']['reservoir'], 0.0)
+
+
+def reference_levels(pilot, dispatch):
+    """Bilan heure par heure, niveau borné entre 0 et la capacité."""
+    e_nom = pilot.reservoirs['e_nom']
+    energy = pilot.reservoirs['initial_level'] * e_nom
+    levels, spills, shortfalls = [], [], []
+    for snapshot in dispatch.index:
+        energy = energy + pilot.inflow.loc[snapshot] - dispatch.loc[snapshot]
+        spills.append(energy.sub(e_nom).clip(lower=0))
+        shortfalls.append((-energy).clip(lower=0))
+        energy = energy.clip(lower=0, upper=e_nom)
+        levels.append(energy / e_nom)
+    return pd.DataFrame(levels), pd.DataFrame(spills), pd.DataFrame(shortfalls)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_levels_stay_within_capacity(seed):
+    network = make_network()
+    network.add("Generator", "reservoir_2", bus="bus", carrier="hydro_reservoir", p_nom=50.0)
+    rng = np.random.default_rng(seed)
+    inflow = pd.DataFrame(rng.uniform(0, 150, (len(SNAPSHOTS), 2)), index=SNAPSHOTS,
+                          columns=["reservoir", "reservoir_2"])
+    reservoirs = pd.DataFrame({'max_hours': [3.0, 4.0], 'initial_level': [0.5, 0.1]},
+                              index=["reservoir", "reservoir_2"])
+    pilot = ReservoirPilot(network, inflow=inflow, reservoirs=reservoirs)
+    # Production tantôt nulle, tantôt maximale : les réservoirs passent du plein au vide
+    dispatch = pd.DataFrame(rng.choice([0.0, 1.0], (len(SNAPSHOTS), 2)) * [200.0, 120.0],
+                            index=SNAPSHOTS, columns=["reservoir", "reservoir_2"])
+
+    state = pilot.compute_levels(dispatch)
+    levels, spill, shortfall = reference_levels(pilot, dispatch)
+
+    assert (state['shortfall'] > 0).any().any() and (state['spill'] > 0).any().any()
+    np.testing.assert_allclose(state['end'], levels, atol=1e-9)
+    np.testing.assert_allclose(state['spill'], spill, atol=1e-9)
+    np.testing.assert_allclose(state['shortfall'], shortfall, atol=1e-9)
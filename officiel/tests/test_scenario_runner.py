@@ -0,0 +1,166 @@
+"""
+Tests de l'exécution de scénarios multi-années (core.scenario_runner).
+
+Les scénarios sont optimisés sur un petit jeu de données complet écrit dans
+tmp_path (quatre bus, quatre centrales). Comme dans les données du projet,
+l'année 2035 n'a pas de coûts marginaux horaires : les coûts statiques des
+générateurs sont alors utilisés.
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+import pytest
+
+from core.scenario_runner import ScenarioRunner, _apply_scenario
+
+pytest.importorskip("highspy")
+
+SCENARIOS = {
+    'reference': {},
+    'forte_demande': {'load_scale': 1.2, 'capacity_scale': {'hydro_reservoir': 1.5}},
+}
+# Mesures de durée, différentes d'une exécution à l'autre
+TIMING_METRICS = ['solve_seconds', 'total_seconds']
+
+STATIC_FILES = {
+    "regions/buses.csv": """name,voltage,latitude,longitude,type,PQ_PV
+Nord,315,50.0,-70.0,prod,PV
+Centre,315,47.0,-71.0,ligne,PQ
+Sud,315,45.5,-73.5,conso,PQ
+Est,315,48.5,-68.5,conso,PQ
+""",
+    "topology/lines/line_types.csv": """name,f_nom,r_per_length,x_per_length
+315kV_line,60,0.0390,0.3170
+""",
+    "topology/lines/lines.csv": """name,bus0,bus1,type,length,capital_cost,s_nom
+L1,Nord,Centre,315kV_line,300,0,2000
+L2,Centre,Sud,315kV_line,200,0,2000
+L3,Centre,Est,315kV_line,150,0,2000
+L4,Sud,Est,315kV_line,400,0,2000
+""",
+    "topology/centrales/carriers.csv": """name,co2_emissions,color
+hydro_reservoir,0.008,#2171b5
+hydro_fil,0.004,#6baed6
+wind,0.0,#74c476
+gas,0.4,#d94801
+""",
+    "topology/centrales/generators_non_pilotable.csv": """name,bus,type,p_nom,p_nom_extendable,p_nom_min,carrier,marginal_cost
+Fil,Nord,non_pilotable,300,False,0,hydro_fil,0.1
+Eolien,Est,non_pilotable,200,False,0,wind,0.0
+""",
+    "topology/centrales/generators_pilotable.csv": """name,bus,type,p_nom,p_nom_extendable,p_nom_min,p_max_pu,carrier,marginal_cost
+Reservoir,Nord,pilotable,600,False,0,1,hydro_reservoir,5.0
+Gaz,Sud,pilotable,800,False,0,1,gas,60.0
+""",
+    "topology/constraints/global_constraints.csv": """name,attribute,sense,constant
+co2_limit,co2_emissions,<=,100000
+""",
+}
+
+
+def write_timeseries(data_dir, year, load_scale, marginal_cost=True):
+    """Écrit 48 heures de charges, de p_max_pu et (facultatif) de coûts marginaux."""
+    index = pd.date_range("2024-01-01", periods=48, freq="h", name="snapshot")
+    hours = np.arange(len(index))
+    profile = 1 + 0.3 * np.sin(2 * np.pi * hours / 24)
+
+    folder = data_dir / "timeseries" / year
+    (folder / "generation").mkdir(parents=True)
+    pd.DataFrame({'Sud': 500 * profile, 'Est': 300 * profile},
+                 index=index).mul(load_scale).to_csv(folder / "loads-p_set.csv")
+    pd.DataFrame({'Fil': 1.0, 'Eolien': 0.5 + 0.4 * np.cos(2 * np.pi * hours / 24)},
+                 index=index).to_csv(folder / "generation" / "generators-p_max_pu.csv")
+    if marginal_cost:
+        pd.DataFrame({'Reservoir': 3.0, 'Gaz': 80.0 + 10 * profile},
+                     index=index).to_csv(folder / "generation" / "generators-marginal_cost.csv")
+
+
+@pytest.fixture
+def scenario_data_dir(tmp_path):
+    """Jeu de données complet : 2024 avec coûts horaires, 2035 sans."""
+    data_dir = tmp_path / "data"
+    for relative_path, content in STATIC_FILES.items():
+        path = data_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    write_timeseries(data_dir, "2024", load_scale=1.0)
+    write_timeseries(data_dir, "2035", load_scale=1.3, marginal_cost=False)
+    return data_dir
+
+
+def run(data_dir, max_workers):
+    runner = ScenarioRunner(data_dir=str(data_dir), max_workers=max_workers)
+    results = runner.run(['2024', '2035'], SCENARIOS)
+    return runner, results
+
+
+def test_serial_run_covers_every_year_and_scenario(scenario_data_dir):
+    runner, results = run(scenario_data_dir, max_workers=1)
+    assert runner.errors == []
+
+    objective = results[results.metric == 'objective'].set_index(['year', 'scenario'])['value']
+    assert set(objective.index) == {(year, name) for year in ['2024', '2035'] for name in SCENARIOS}
+
+    load = results[results.metric == 'total_load_mwh'].set_index(['year', 'scenario'])['value']
+    np.testing.assert_allclose(load['2024', 'forte_demande'], 1.2 * load['2024', 'reference'])
+    np.testing.assert_allclose(load['2035', 'reference'], 1.3 * load['2024', 'reference'])
+
+
+def test_process_pool_matches_serial_run(scenario_data_dir):
+    _, serial = run(scenario_data_dir, max_workers=1)
+    runner, parallel = run(scenario_data_dir, max_workers=2)
+    assert runner.errors == []
+
+    def stable(results):
+        return results[~results.metric.isin(TIMING_METRICS)].reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(stable(serial), stable(parallel))
+
+
+def test_failed_combinations_are_recorded(scenario_data_dir):
+    runner = ScenarioRunner(data_dir=str(scenario_data_dir), max_workers=1)
+    results = runner.run(['2024', '2099'], {'reference': {}})
+    assert [error['year'] for error in runner.errors] == ['2099']
+    assert set(results['year']) == {'2024'}
+
+
+def make_network() -> pypsa.Network:
+    """Réseau d'un bus avec deux générateurs, une charge et une contrainte CO2."""
+    network = pypsa.Network()
+    network.set_snapshots(pd.date_range("2024-01-01", periods=2, freq="h"))
+    network.add("Bus", "bus")
+    network.add("Generator", ["hydro", "gas"], bus="bus", carrier=["hydro_reservoir", "gas"],
+                p_nom=[100.0, 50.0], marginal_cost=[1.0, 40.0])
+    network.generators_t.marginal_cost = pd.DataFrame({'gas': [40.0, 60.0]}, index=network.snapshots)
+    network.add("Load", "charge", bus="bus", p_set=[80.0, 120.0])
+    network.add("GlobalConstraint", "co2_limit", sense="<=", constant=1000.0)
+    return network
+
+
+def test_apply_scenario_scales_the_network():
+    network = make_network()
+    _apply_scenario(network, {
+        'load_scale': 1.5,
+        'marginal_cost_scale': 2.0,
+        'capacity_scale': {'gas': 3.0},
+        'global_constraints': {'co2_limit': 10.0},
+    })
+    assert network.loads_t.p_set['charge'].tolist() == [120.0, 180.0]
+    assert network.generators.marginal_cost.tolist() == [2.0, 80.0]
+    assert network.generators_t.marginal_cost['gas'].tolist() == [80.0, 120.0]
+    assert network.generators.p_nom.tolist() == [100.0, 150.0]
+    assert network.global_constraints.constant.tolist() == [10.0]
+
+
+@pytest.mark.parametrize("params", [{'co2_scale': 2.0},
+                                    {'global_constraints': {'inconnue': 1.0}}])
+def test_apply_scenario_rejects_unknown_parameters(params):
+    network = make_network()
+    with pytest.raises(ValueError):
+        _apply_scenario(network, params)
+    # Rien n'est appliqué, aucune contrainte n'est ajoutée
+    assert list(network.global_constraints.index) == ['co2_limit']
@@ -0,0 +1,69 @@
+"""
+Tests de la réduction des snapshots (utils.time_aggregation).
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+import pytest
+from scipy.spatial.distance import cdist
+
+from utils.time_aggregation import SnapshotReducer
+
+PROFILES = {
+    "plat": np.full(24, 500.0),
+    "pointe": 400.0 + 300.0 * np.exp(-0.5 * ((np.arange(24) - 18) / 2) ** 2),
+    "nuit": 600.0 - 200.0 * np.sin(np.pi * np.arange(24) / 24),
+}
+
+
+def make_network(days) -> pypsa.Network:
+    """Réseau d'un bus dont chaque jour reprend exactement un des profils PROFILES."""
+    network = pypsa.Network()
+    network.set_snapshots(pd.date_range("2024-01-01", periods=24 * len(days), freq="h"))
+    network.add("Bus", "bus")
+    network.add("Generator", "gen", bus="bus", p_nom=1000.0)
+    network.add("Load", "charge", bus="bus",
+                p_set=pd.Series(np.concatenate([PROFILES[day] for day in days]),
+                                index=network.snapshots))
+    return network
+
+
+def test_collapsed_medoids_are_reseeded():
+    features = np.array([[0.0], [1.0], [2.0], [10.0], [11.0]])
+    # Les deux premiers centroïdes ont le même jour le plus proche
+    centroids = np.array([[0.1], [0.2], [10.5]])
+    reducer = SnapshotReducer(make_network(["plat"]))
+    medoids = reducer._seed_medoids(cdist(features, features), cdist(features, centroids), 3)
+    np.testing.assert_array_equal(medoids, [0, 2, 3])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_kmedoids_keeps_requested_number_of_days(seed):
+    days = ["plat"] * 8 + ["pointe"] * 3 + ["nuit"]
+    reducer = SnapshotReducer(make_network(days))
+    reduced = reducer.cluster_days(n_days=3, method="kmedoids", keep_peak_day=False, seed=seed)
+
+    assert len(reduced.snapshots) == 3 * 24
+    assert reduced.snapshot_weightings.objective.sum() == len(days) * 24
+    # Chaque profil est représenté exactement
+    full = reducer.network.loads_t.p_set['charge']
+    np.testing.assert_array_equal(reducer.expand(reduced.loads_t.p_set)['charge'], full)
+
+
+def test_kmedoids_rejects_too_few_distinct_days():
+    reducer = SnapshotReducer(make_network(["plat"] * 5 + ["pointe"] * 5))
+    with pytest.raises(ValueError):
+        reducer.cluster_days(n_days=3, method="kmedoids", keep_peak_day=False)
+
+
+def test_only_input_series_are_clustered():
+    network = make_network(["plat", "pointe"])
+    network.generators_t.p_max_pu["gen"] = 0.9
+    # Résultat d'un calcul précédent, ignoré
+    network.generators_t.p["gen"] = network.loads_t.p_set["charge"]
+    reducer = SnapshotReducer(network)
+    assert sorted(reducer._series) == ["Generator.p_max_pu", "Load.p_set"]
@@ -0,0 +1,147 @@
+"""
+Tests de la construction des lignes et des bus PyPSA (utils.lines_filter).
+
+L'ordre et le dédoublonnage des bus, ainsi que les colonnes des lignes
+autres que s_nom, sont comparés aux boucles d'origine (parcours ligne par
+ligne du fichier des lignes).
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.lines_filter import LineFilter
+
+
+def reference_buses(df: pd.DataFrame) -> pd.DataFrame:
+    """Boucle d'origine de _extract_buses, sans le typage aléatoire."""
+    buses = []
+    for index, row in df.iterrows():
+        buses.append([row['network_node_name_starting'], row['voltage'], row['latitude_starting'], row['longitude_starting']])
+        buses.append([row['network_node_name_ending'], row['voltage'], row['latitude_ending'], row['longitude_ending']])
+    buses_df = pd.DataFrame(buses, columns=['name', 'voltage', 'latitude', 'longitude'])
+    return buses_df.drop_duplicates(subset=['name', 'voltage']).reset_index(drop=True)
+
+
+def reference_lines(df: pd.DataFrame) -> pd.DataFrame:
+    """Boucle d'origine de _extract_lines, sans la capacité s_nom."""
+    df = df.reset_index(drop=True)
+    new_lines = []
+    for index, row in df.iterrows():
+        length = row['line_segment_length_km']
+        new_lines.append([f"L{index + 1:04d}", row['network_node_name_starting'],
+                          row['network_node_name_ending'], f"{row['voltage']}kV_line",
+                          length, length * 1000])
+    return pd.DataFrame(new_lines, columns=['name', 'bus0', 'bus1', 'type', 'length', 'capital_cost'])
+
+
+def make_lines(n: int, seed: int) -> pd.DataFrame:
+    """Lignes aléatoires entre quelques nœuds, avec doublons et tensions mélangées."""
+    rng = np.random.default_rng(seed)
+    names = [f"Poste{i}" for i in range(12)]
+    kinds = ["GSS", "DSS", "ISS", "TSS", "SWS", "JCT"]
+    codes = {name: f"QC_{name.upper()}_{kinds[i % len(kinds)]}" for i, name in enumerate(names)}
+    coordinates = {name: (45 + rng.random() * 5, -75 + rng.random() * 5) for name in names}
+
+    starting = rng.choice(names, n)
+    ending = rng.choice(names, n)
+    return pd.DataFrame({
+        'network_node_name_starting': starting,
+        'network_node_code_starting': [codes[name] for name in starting],
+        'latitude_starting': [coordinates[name][0] for name in starting],
+        'longitude_starting': [coordinates[name][1] for name in starting],
+        'network_node_name_ending': ending,
+        'network_node_code_ending': [codes[name] for name in ending],
+        'latitude_ending': [coordinates[name][0] for name in ending],
+        'longitude_ending': [coordinates[name][1] for name in ending],
+        'voltage': rng.choice([120, 315, 735], n),
+        'line_segment_length_km': rng.uniform(1, 300, n).round(1),
+        'ttc_summer': pd.array(rng.integers(500, 3000, n), dtype='Int64'),
+        'ttc_winter': pd.array(rng.integers(500, 3000, n), dtype='Int64'),
+    })
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_extract_buses_matches_original_loop(seed):
+    df = make_lines(60, seed)
+    buses = LineFilter()._extract_buses(df)
+    pd.testing.assert_frame_equal(buses[['name', 'voltage', 'latitude', 'longitude']],
+                                  reference_buses(df))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_extraction_is_deterministic(seed):
+    df = make_lines(60, seed)
+    line_filter = LineFilter()
+    pd.testing.assert_frame_equal(line_filter._extract_buses(df, ["Poste3"], ["Poste4"]),
+                                  LineFilter()._extract_buses(df, ["Poste3"], ["Poste4"]))
+    pd.testing.assert_frame_equal(line_filter._extract_lines(df), line_filter._extract_lines(df))
+
+
+def test_extract_lines_matches_original_loop():
+    df = make_lines(40, seed=0)
+    lines = LineFilter()._extract_lines(df)
+    pd.testing.assert_frame_equal(lines.drop(columns='s_nom'), reference_lines(df))
+
+
+@pytest.mark.parametrize("rating, expected", [
+    ('summer', [1000, 900, 1500, 700, 700]),
+    ('winter', [1200, 800, 1400, 650, 650]),
+    ('min', [1000, 800, 1400, 650, 650]),
+])
+def test_line_capacity_follows_rating(rating, expected):
+    df = pd.DataFrame({
+        'network_node_name_starting': list("ABCDE"),
+        'network_node_name_ending': list("BCDEA"),
+        'voltage': [315, 315, 735, 120, 120],
+        'line_segment_length_km': 10.0,
+        'ttc_summer': pd.array([1000, 900, 1500, 700, None], dtype='Int64'),
+        'ttc_winter': pd.array([1200, 800, 1400, 650, None], dtype='Int64'),
+    })
+    # La dernière ligne, sans TTC, prend la médiane des lignes de 120 kV
+    lines = LineFilter()._extract_lines(df, rating=rating)
+    assert lines['s_nom'].tolist() == expected
+
+
+def test_missing_capacity_uses_rounded_voltage_median():
+    df = pd.DataFrame({
+        'network_node_name_starting': list("ABCD"),
+        'network_node_name_ending': list("BCDA"),
+        'voltage': [315, 315, 315, 735],
+        'line_segment_length_km': 10.0,
+        'ttc_summer': pd.array([1000, 1001, None, None], dtype='Int64'),
+        'ttc_winter': pd.array([1000, 1001, None, None], dtype='Int64'),
+    })
+    s_nom = LineFilter()._extract_lines(df)['s_nom']
+    # Médiane 1000.5 arrondie ; aucune ligne de 735 kV n'a de TTC
+    assert s_nom.iloc[2] == 1000
+    assert pd.isna(s_nom.iloc[3])
+
+
+def test_unsupported_rating_is_rejected():
+    with pytest.raises(ValueError):
+        LineFilter()._extract_lines(make_lines(3, seed=0), rating='peak')
+
+
+def test_buses_are_classified_from_codes_and_markers():
+    nodes = pd.DataFrame({
+        'name': ["Prod", "Dist", "Indus", "Trans", "Centrale", "Region", "Mixte", "Mixte"],
+        'code': ["QC_PROD_GSS", "QC_DIST_DSS", "QC_INDUS_ISS", "QC_TRANS_TSS",
+                 "QC_CTR_TSS", "QC_REG_SWS", "QC_MIXTE_DSS", "QC_MIXTE_GSS"],
+    })
+    # Centrale raccordée par son code de poste, région de charge par son nom
+    types = LineFilter()._classify_buses(nodes, generator_buses=["CTR"], load_regions=["Region"])
+    assert types.to_dict() == {"Prod": 'prod', "Dist": 'conso', "Indus": 'conso',
+                               "Trans": 'ligne', "Centrale": 'prod', "Region": 'conso',
+                               "Mixte": 'prod'}
+
+
+def test_bus_control_follows_type():
+    df = make_lines(30, seed=1)
+    buses = LineFilter()._extract_buses(df, generator_buses=["Poste4"], load_regions=["Poste5"])
+    assert buses.set_index('name').loc["Poste4", 'type'].eq('prod').all()
+    assert (buses['PQ_PV'] == np.where(buses['type'] == 'prod', 'PV', 'PQ')).all()
+    assert set(buses['type']) == {'prod', 'conso', 'ligne'}
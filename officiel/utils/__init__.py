@@ -1,16 +1,29 @@
 from .data_loader import NetworkDataLoader, DataLoadError
 from .validators import NetworkValidator
-from .geo_utils import GeoUtils
+from .geo_utils import GeoUtils, BusSpatialIndex
 from .time_utils import TimeSeriesManager
 from .lines_filter import LineFilter
 from .visualization_utils import NetworkVisualizer
+from .network_cache import NetworkCache
+from .time_aggregation import SnapshotReducer
+from .geocoding import Geocoder, GeocodingCache, GeocodingProvider, NominatimProvider
+from .pipeline import Pipeline, PipelineStage
 
 __all__ = [
     'NetworkDataLoader',
     'DataLoadError',
     'NetworkValidator',
     'GeoUtils',
+    'BusSpatialIndex',
     'TimeSeriesManager',
-    'LineFilter'
-    'NetworkVisualizer'
+    'LineFilter',
+    'NetworkVisualizer',
+    'NetworkCache',
+    'SnapshotReducer',
+    'Geocoder',
+    'GeocodingCache',
+    'GeocodingProvider',
+    'NominatimProvider',
+    'Pipeline',
+    'PipelineStage'
 ]
\ No newline at end of file
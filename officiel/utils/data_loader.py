@@ -42,17 +42,18 @@ Notes:
             └── 2024/
                 ├── generation/
                 │   ├── generators-p_max_pu.csv  # Production maximale par unité pour les centrales non pilotables
-                │   └── generators-marginal_cost.csv # Coûts marginaux pour les centrales pilotables
+                │   └── generators-marginal_cost.csv # Coûts marginaux pour les centrales pilotables (facultatif)
                 └── loads-p_set.csv              # Profils de charge
 
 Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
                 Add Contributor here
 """
 
+import time
 import pypsa
 import pandas as pd
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 
 class DataLoadError(Exception):
@@ -69,29 +70,97 @@ class NetworkDataLoader:
 
     Attributes:
         data_dir (Path): Chemin vers le répertoire des données
+        timeseries_backend (str): Format des séries temporelles ('csv' ou 'parquet')
     """
 
-    def __init__(self, data_dir: str = "data"):
+    TIMESERIES_BACKENDS = {"csv": ".csv", "parquet": ".parquet"}
+    CSV_CHUNK_SIZE = 24 * 7  # Lignes lues par bloc lors d'une lecture fenêtrée
+
+    def __init__(self, data_dir: str = "data", timeseries_backend: str = "csv"):
         """
         Initialise le chargeur de données.
 
         Args:
             data_dir: Chemin vers le répertoire des données.
                 Defaults to "data".
+            timeseries_backend: Format de lecture des séries temporelles,
+                'csv' ou 'parquet' (voir convert_timeseries_to_parquet).
+                Defaults to "csv".
 
         Raises:
-            DataLoadError: Si le répertoire n'existe pas.
+            DataLoadError: Si le répertoire n'existe pas ou si le format
+                n'est pas supporté.
         """
         self.data_dir = Path(data_dir)
         if not self.data_dir.exists():
             raise DataLoadError(f"Le répertoire {data_dir} n'existe pas")
+        if timeseries_backend not in self.TIMESERIES_BACKENDS:
+            raise DataLoadError(f"Format de séries temporelles non supporté: {timeseries_backend}")
+        self.timeseries_backend = timeseries_backend
+
+    # Fichiers statiques (relatifs à data_dir) et composant PyPSA associé,
+    # dans l'ordre d'insertion dans le réseau
+    STATIC_COMPONENTS = [
+        ("Bus", Path("regions") / "buses.csv"),
+        ("LineType", Path("topology") / "lines" / "line_types.csv"),
+        ("Line", Path("topology") / "lines" / "lines.csv"),
+        ("Carrier", Path("topology") / "centrales" / "carriers.csv"),
+        ("Generator", Path("topology") / "centrales" / "generators_non_pilotable.csv"),
+        ("Generator", Path("topology") / "centrales" / "generators_pilotable.csv"),
+        ("GlobalConstraint", Path("topology") / "constraints" / "global_constraints.csv"),
+    ]
+
+    # Fichiers temporels (relatifs à data_dir/timeseries/<année>)
+    TIMESERIES_FILES = {
+        "loads_p_set": Path("loads-p_set.csv"),
+        "generators_marginal_cost": Path("generation") / "generators-marginal_cost.csv",
+        "generators_p_max_pu": Path("generation") / "generators-p_max_pu.csv",
+    }
+
+    def get_source_files(self, year: Optional[str] = None) -> List[Path]:
+        """
+        Liste les fichiers lus pour construire le réseau.
+
+        Args:
+            year: Année des séries temporelles (seulement les fichiers
+                statiques si None)
+
+        Returns:
+            Liste des chemins des fichiers sources
+        """
+        files = [self.data_dir / relative_path for _, relative_path in self.STATIC_COMPONENTS]
+        if year is not None:
+            files += [self.get_timeseries_path(year, name) for name in self.TIMESERIES_FILES]
+        return files
+
+    def get_timeseries_path(self, year: str, name: str,
+                            backend: Optional[str] = None) -> Path:
+        """
+        Retourne le chemin d'un fichier de séries temporelles.
+
+        Args:
+            year: Année des données (ex: '2024')
+            name: Clé du fichier dans TIMESERIES_FILES (ex: 'loads_p_set')
+            backend: Format du fichier (utilise timeseries_backend si None)
+
+        Returns:
+            Chemin du fichier CSV ou Parquet
+        """
+        suffix = self.TIMESERIES_BACKENDS[backend or self.timeseries_backend]
+        return (self.data_dir / "timeseries" / year / self.TIMESERIES_FILES[name]).with_suffix(suffix)
 
-    def load_network_data(self) -> pypsa.Network:
+    def load_network_data(self, bulk: bool = True) -> pypsa.Network:
         """
         Charge les données statiques du réseau.
 
         Cette méthode charge la topologie du réseau (buses, lignes, générateurs)
-        en utilisant la fonction native de PyPSA import_from_csv_folder.
+        à partir des fichiers CSV. Par défaut, chaque fichier est inséré en un
+        seul appel groupé par type de composant (madd), ce qui est beaucoup plus
+        rapide que l'ajout ligne par ligne sur les grands réseaux.
+
+        Args:
+            bulk: Si True, insertion groupée par composant. Si False, insertion
+                ligne par ligne (ancien comportement, conservé pour comparaison).
 
         Returns:
             pypsa.Network: Réseau PyPSA configuré avec les données statiques.
@@ -101,81 +170,97 @@ class NetworkDataLoader:
         """
         try:
             network = pypsa.Network()
-            
-            # Chargement des données régionales (buses)
-            buses_df = pd.read_csv(self.data_dir / "regions" / "buses.csv")
-            buses_df = buses_df.set_index('name')
-            
-            # Création des bus
-            for idx, row in buses_df.iterrows():
-                network.add("Bus", name=idx, **row.to_dict())
-                
+            add_components = self._add_components if bulk else self._add_components_rowwise
+
+            for component, relative_path in self.STATIC_COMPONENTS:
+                df = pd.read_csv(self.data_dir / relative_path).set_index('name')
+                add_components(network, component, df)
+
                 # Création des charges pour les bus de type "conso"
-                if row['type'] == 'conso':
-                    network.add("Load", 
-                              name=f"load_{idx}",
-                              bus=idx,
-                              # Valeurs par défaut qui seront écrasées par les séries temporelles
-                              p_set=0,  
-                              q_set=0
-                    )
-            
-            # Chargement des lignes
-            line_types_df = pd.read_csv(self.data_dir / "topology" / "lines" / "line_types.csv")
-            line_types_df = line_types_df.set_index('name')
-            for idx, row in line_types_df.iterrows():
-                network.add("LineType", name=idx, **row.to_dict())
-            
-            lines_df = pd.read_csv(self.data_dir / "topology" / "lines" / "lines.csv")
-            lines_df = lines_df.set_index('name')
-            for idx, row in lines_df.iterrows():
-                network.add("Line", name=idx, **row.to_dict())
-
-            # Chargement des générateurs 
-            carriers_df = pd.read_csv(self.data_dir / "topology" / "centrales" / "carriers.csv")
-            carriers_df = carriers_df.set_index('name')
-            for idx, row in carriers_df.iterrows():
-                network.add("Carrier", name=idx, **row.to_dict())
-
-            # Chargement des générateurs non pilotables
-            generators_non_pilotable_df = pd.read_csv(
-                self.data_dir / "topology" / "centrales" / "generators_non_pilotable.csv"
-            ).set_index('name')
-            for idx, row in generators_non_pilotable_df.iterrows():
-                network.add("Generator", name=idx, **row.to_dict())
-
-            # Chargement des générateurs pilotables
-            generators_pilotable_df = pd.read_csv(
-                self.data_dir / "topology" / "centrales" / "generators_pilotable.csv"
-            ).set_index('name')
-            for idx, row in generators_pilotable_df.iterrows():
-                network.add("Generator", name=idx, **row.to_dict())
-            
-            # Chargement des contraintes
-            global_constraints_df = pd.read_csv(
-                self.data_dir / "topology" / "constraints" / "global_constraints.csv"
-            ).set_index('name')
-            for idx, row in global_constraints_df.iterrows():
-                network.add("GlobalConstraint", name=idx, **row.to_dict())
-                
+                if component == "Bus":
+                    add_components(network, "Load", self._build_loads(df))
+
             return network
             
         except Exception as e:
             raise DataLoadError(f"Erreur lors du chargement des données: {str(e)}")
 
+    @staticmethod
+    def _build_loads(buses_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Construit la table des charges associées aux bus de type "conso".
+
+        Args:
+            buses_df: Table des bus indexée par nom
+
+        Returns:
+            DataFrame des charges indexé par 'load_<bus>'
+        """
+        conso_buses = buses_df.index[buses_df['type'] == 'conso']
+        return pd.DataFrame({
+            'bus': conso_buses,
+            # Valeurs par défaut qui seront écrasées par les séries temporelles
+            'p_set': 0.0,
+            'q_set': 0.0,
+        }, index=pd.Index([f"load_{bus}" for bus in conso_buses], name='name'))
+
+    @staticmethod
+    def _add_components(network: pypsa.Network, component: str, df: pd.DataFrame) -> None:
+        """
+        Ajoute tous les composants d'une table en un seul appel groupé.
+
+        Les noms en double sont ignorés (seule la première occurrence est
+        conservée), comme le fait PyPSA lors de l'ajout ligne par ligne.
+
+        Args:
+            network: Réseau PyPSA à compléter
+            component: Type de composant PyPSA (ex: 'Bus', 'Line')
+            df: Table des composants indexée par nom
+        """
+        df = df[~df.index.duplicated(keep='first')]
+        if df.empty:
+            return
+
+        # madd n'existe plus dans les versions récentes de PyPSA, où add est vectorisé
+        bulk_add = getattr(network, "madd", network.add)
+        bulk_add(component, df.index, **{col: df[col] for col in df.columns})
+
+    @staticmethod
+    def _add_components_rowwise(network: pypsa.Network, component: str, df: pd.DataFrame) -> None:
+        """
+        Ajoute les composants d'une table un par un (insertion historique).
+
+        Args:
+            network: Réseau PyPSA à compléter
+            component: Type de composant PyPSA (ex: 'Bus', 'Line')
+            df: Table des composants indexée par nom
+        """
+        for idx, row in df.iterrows():
+            network.add(component, name=idx, **row.to_dict())
+
     def load_timeseries_data(self, 
                            network: pypsa.Network,
                            year: str,
                            start_date: Optional[str] = None,
-                           end_date: Optional[str] = None) -> pypsa.Network:
+                           end_date: Optional[str] = None,
+                           project_columns: bool = False) -> pypsa.Network:
         """
         Ajoute les données temporelles au réseau.
 
+        La fenêtre [start_date, end_date] est appliquée de la même façon aux
+        charges, aux coûts marginaux et aux p_max_pu : seules les lignes de la
+        fenêtre sont chargées en mémoire et deviennent des snapshots. Les
+        coûts marginaux horaires sont facultatifs : sans fichier pour
+        l'année, les coûts statiques des générateurs (generators.marginal_cost)
+        sont utilisés.
+
         Args:
             network: Réseau PyPSA à compléter avec les données temporelles
             year: Année des données (ex: '2024')
             start_date: Date de début au format 'YYYY-MM-DD' (optionnel)
-            end_date: Date de fin au format 'YYYY-MM-DD' (optionnel)
+            end_date: Date de fin au format 'YYYY-MM-DD', incluse (optionnel)
+            project_columns: Si True, ne lit que les colonnes correspondant
+                à des charges ou générateurs présents dans le réseau
 
         Returns:
             pypsa.Network: Réseau avec les données temporelles ajoutées
@@ -184,25 +269,40 @@ class NetworkDataLoader:
             DataLoadError: Si les données sont inaccessibles ou mal formatées
         """
         try:
+            load_columns = gen_columns = None
+            if project_columns:
+                #Les colonnes des charges correspondent aux noms des bus (load_<bus>)
+                load_columns = [name[len("load_"):] for name in network.loads.index]
+                gen_columns = list(network.generators.index)
+
             # Chargement des séries temporelles pour les charges (loads)
-            loads_path = self.data_dir / "timeseries" / year / "loads-p_set.csv"
             #Les noms des colonnes dans les données et dans les loads doivent être identiques
-            loads_df = pd.read_csv(loads_path, index_col=0, parse_dates=True)
+            loads_df = self.read_timeseries(year, "loads_p_set", start_date, end_date, load_columns)
             loads_df.columns = [f"load_{col}" for col in loads_df.columns]
             network.loads_t.p_set = loads_df
 
             
             # Chargement des coûts marginaux pour les générateurs pilotables
-            gen_cost_path = self.data_dir / "timeseries" / year / "generation" / "generators-marginal_cost.csv"
-            gen_cost_df = pd.read_csv(gen_cost_path, index_col=0, parse_dates=True)
-            network.generators_t.marginal_cost = gen_cost_df
+            if self.get_timeseries_path(year, "generators_marginal_cost").exists():
+                gen_cost_df = self.read_timeseries(
+                    year, "generators_marginal_cost", start_date, end_date, gen_columns
+                )
+                network.generators_t.marginal_cost = gen_cost_df
+            else:
+                print(f"Pas de coûts marginaux horaires pour {year} : coûts statiques utilisés")
 
             # Chargement de la production maximale (p_max_pu) pour les générateurs non pilotables
-            gen_pmax_path = self.data_dir / "timeseries" / year / "generation" / "generators-p_max_pu.csv"
-            gen_pmax_df = pd.read_csv(gen_pmax_path, index_col=0, parse_dates=True)
+            gen_pmax_df = self.read_timeseries(
+                year, "generators_p_max_pu", start_date, end_date, gen_columns
+            )
             network.generators_t.p_max_pu = gen_pmax_df
             
-            # Définition des snapshots
+            if len(loads_df.index) == 0:
+                raise DataLoadError(
+                    f"Aucune donnée entre {start_date} et {end_date} pour l'année {year}"
+                )
+
+            # Définition des snapshots (même fenêtre pour les trois séries)
             network.set_snapshots(loads_df.index)
             
             return network
@@ -211,5 +311,205 @@ class NetworkDataLoader:
             raise DataLoadError(
                 f"Erreur lors du chargement des données temporelles: {str(e)}"
             )
-        
+
+    def read_timeseries(self,
+                        year: str,
+                        name: str,
+                        start_date: Optional[str] = None,
+                        end_date: Optional[str] = None,
+                        columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Lit un fichier de séries temporelles indexé par snapshot.
+
+        Seules les lignes de la fenêtre [start_date, end_date] sont conservées.
+        Avec le format Parquet, la sélection des colonnes et le filtre sur
+        la fenêtre sont appliqués à la lecture : seuls les groupes de lignes
+        et les colonnes utiles sont décodés. En CSV, le fichier est lu par
+        blocs et la lecture s'arrête dès que la fin de la fenêtre est dépassée.
+
+        Args:
+            year: Année des données (ex: '2024')
+            name: Clé du fichier dans TIMESERIES_FILES (ex: 'loads_p_set')
+            start_date: Date de début au format 'YYYY-MM-DD' (optionnel)
+            end_date: Date de fin au format 'YYYY-MM-DD', incluse (optionnel)
+            columns: Colonnes à lire (toutes si None). Les colonnes absentes
+                du fichier sont ignorées.
+
+        Returns:
+            DataFrame indexé par snapshot
+        """
+        path = self.get_timeseries_path(year, name)
+
+        if self.timeseries_backend == "parquet":
+            pq = self._import_parquet()
+            if columns is not None:
+                available = set(pq.read_schema(path).names)
+                columns = [col for col in columns if col in available]
+
+            filters = []
+            start, end = self._window_bounds(start_date, end_date)
+            if start is not None:
+                filters.append(("snapshot", ">=", start))
+            if end is not None:
+                filters.append(("snapshot", "<", end))
+
+            return pd.read_parquet(path, columns=columns, filters=filters or None)
+
+        if columns is not None:
+            header = pd.read_csv(path, nrows=0).columns
+            columns = [header[0]] + [col for col in header[1:] if col in set(columns)]
+
+        if start_date is None and end_date is None:
+            return pd.read_csv(path, index_col=0, parse_dates=True, usecols=columns)
+
+        # Lecture par blocs : seules les lignes de la fenêtre sont conservées
+        start, end = self._window_bounds(start_date, end_date)
+        chunks = []
+        reader = pd.read_csv(path, index_col=0, parse_dates=True, usecols=columns,
+                             chunksize=self.CSV_CHUNK_SIZE)
+        with reader:
+            for chunk in reader:
+                mask = pd.Series(True, index=chunk.index)
+                if start is not None:
+                    mask &= chunk.index >= start
+                if end is not None:
+                    mask &= chunk.index < end
+                chunks.append(chunk[mask.values])
+
+                # Les séries sont chronologiques : inutile de lire au-delà de la fenêtre
+                if end is not None and chunk.index.is_monotonic_increasing and chunk.index[-1] >= end:
+                    break
+
+        return pd.concat(chunks)
+
+    @staticmethod
+    def _window_bounds(start_date: Optional[str],
+                       end_date: Optional[str]) -> Tuple[Optional[pd.Timestamp], Optional[pd.Timestamp]]:
+        """
+        Convertit une fenêtre temporelle en bornes [début, fin[.
+
+        Une date de fin sans heure ('YYYY-MM-DD') inclut toute la journée,
+        comme la sélection par chaîne de caractères de pandas.
+
+        Args:
+            start_date: Date de début (optionnelle)
+            end_date: Date de fin incluse (optionnelle)
+
+        Returns:
+            Tuple (borne inférieure incluse, borne supérieure exclue)
+        """
+        start = pd.Timestamp(start_date) if start_date else None
+        end = None
+        if end_date:
+            end = pd.Timestamp(end_date)
+            if len(str(end_date)) <= 10:
+                end += pd.Timedelta(days=1)
+            else:
+                end += pd.Timedelta(microseconds=1)
+        return start, end
+
+    @staticmethod
+    def _import_parquet():
+        """
+        Importe pyarrow.parquet, requis par le format Parquet.
+
+        Raises:
+            DataLoadError: Si pyarrow n'est pas installé
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise DataLoadError(
+                "Le format Parquet nécessite pyarrow (pip install pyarrow)"
+            )
+        return pq
+
+    def convert_timeseries_to_parquet(self,
+                                      years: Optional[List[str]] = None,
+                                      row_group_size: int = 24 * 7) -> List[Path]:
+        """
+        Convertit les séries temporelles CSV en fichiers Parquet.
+
+        Chaque fichier CSV est écrit à côté de l'original avec l'extension
+        .parquet, trié par snapshot et découpé en groupes de lignes d'une
+        semaine horaire par défaut, ce qui permet d'ignorer à la lecture les
+        groupes hors de la fenêtre demandée.
+
+        Args:
+            years: Années à convertir (tous les sous-dossiers de timeseries si None)
+            row_group_size: Nombre de lignes par groupe Parquet
+
+        Returns:
+            Liste des fichiers Parquet écrits
+
+        Example:
+            >>> loader.convert_timeseries_to_parquet(['2024'])
+            >>> loader = NetworkDataLoader(timeseries_backend='parquet')
+        """
+        self._import_parquet()
+
+        if years is None:
+            years = sorted(p.name for p in (self.data_dir / "timeseries").iterdir() if p.is_dir())
+
+        written = []
+        for year in years:
+            for name in self.TIMESERIES_FILES:
+                csv_path = self.get_timeseries_path(year, name, backend="csv")
+                if not csv_path.exists():
+                    continue
+
+                df = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+                df.index.name = "snapshot"
+                parquet_path = self.get_timeseries_path(year, name, backend="parquet")
+                df.sort_index().to_parquet(parquet_path, row_group_size=row_group_size)
+                written.append(parquet_path)
+
+        return written
+
+    def benchmark_network_loading(self) -> Dict[str, float]:
+        """
+        Compare les temps de construction groupée et ligne par ligne.
+
+        Les deux réseaux obtenus sont comparés composant par composant pour
+        s'assurer que l'insertion groupée produit un réseau identique.
+
+        Returns:
+            Dict contenant :
+            - Temps de chargement ligne par ligne (s)
+            - Temps de chargement groupé (s)
+            - Facteur d'accélération
+            - Indicateur d'identité des deux réseaux
+
+        Example:
+            >>> timings = loader.benchmark_network_loading()
+            >>> print(f"Accélération : x{timings['speedup']:.1f}")
+        """
+        start = time.perf_counter()
+        rowwise_network = self.load_network_data(bulk=False)
+        rowwise_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bulk_network = self.load_network_data(bulk=True)
+        bulk_time = time.perf_counter() - start
+
+        identical = True
+        for component in ["Bus", "Load", "LineType", "Line", "Carrier",
+                          "Generator", "GlobalConstraint"]:
+            list_name = bulk_network.components[component]["list_name"]
+            bulk_df = getattr(bulk_network, list_name)
+            rowwise_df = getattr(rowwise_network, list_name)
+            try:
+                pd.testing.assert_frame_equal(
+                    bulk_df, rowwise_df[bulk_df.columns], check_dtype=False
+                )
+            except (AssertionError, KeyError):
+                identical = False
+
+        return {
+            'rowwise_seconds': rowwise_time,
+            'bulk_seconds': bulk_time,
+            'speedup': rowwise_time / bulk_time if bulk_time > 0 else float('inf'),
+            'identical': identical
+        }
+
     # Add new method here
\ No newline at end of file
@@ -7,9 +7,13 @@ du réseau et l'optimisation des tracés des lignes de transmission.
 
 Classes:
     GeoUtils: Classe principale pour les calculs géographiques.
+    BusSpatialIndex: Index spatial des bus (plus proches voisins, rayon).
 
 Functions:
     calculate_distance: Calcule la distance entre deux points.
+    calculate_distances: Calcule les distances entre deux tableaux de points.
+    distance_matrix: Calcule la matrice des distances entre tous les points.
+    calculate_line_lengths: Calcule la longueur de plusieurs tracés en un appel.
     optimize_line_path: Optimise le tracé d'une ligne entre deux points.
 
 Example:
@@ -31,11 +35,39 @@ Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
 
 import numpy as np
 import math
-from typing import Tuple, List, Dict, Optional
+import time
+import pandas as pd
+from scipy.spatial import cKDTree
+from typing import Tuple, List, Dict, Optional, Sequence
 from dataclasses import dataclass
 from math import radians, sin, cos, sqrt, atan2
 
 
+def _haversine(lat1: np.ndarray,
+               lon1: np.ndarray,
+               cos_lat1: np.ndarray,
+               lat2: np.ndarray,
+               lon2: np.ndarray,
+               cos_lat2: np.ndarray,
+               radius: float) -> np.ndarray:
+    """
+    Formule de Haversine sur des tableaux de coordonnées en radians.
+
+    Les cosinus des latitudes sont fournis pour ne pas les recalculer à
+    chaque bloc d'une matrice de distances. Les tableaux sont diffusés
+    (broadcasting) entre eux.
+    """
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + cos_lat1 * cos_lat2 * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * radius * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def to_unit_vectors(points: np.ndarray) -> np.ndarray:
+    """Convertit des (latitude, longitude) en degrés en vecteurs unitaires 3D."""
+    lat, lon = np.radians(np.asarray(points, dtype=float).reshape(-1, 2)).T
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
 @dataclass
 class Point:
     """
@@ -51,6 +83,145 @@ class Point:
     name: Optional[str] = None
 
 
+class BusSpatialIndex:
+    """
+    Index spatial des bus pour les recherches de proximité.
+
+    Les bus sont placés sur la sphère unité (vecteurs 3D) dans un arbre
+    k-d : la distance euclidienne entre deux vecteurs (corde) croît avec
+    la distance à vol d'oiseau, ce qui rend les résultats identiques à
+    ceux de la formule de Haversine. Les bus ajoutés après la construction
+    sont cherchés par force brute jusqu'à ce que leur nombre justifie une
+    reconstruction de l'arbre.
+
+    Attributes:
+        names (pd.Index): Noms des bus indexés (ajouts compris)
+        rebuild_ratio (float): Part de bus en attente déclenchant la reconstruction
+        n_rebuilds (int): Nombre de constructions de l'arbre
+
+    Example:
+        >>> index = BusSpatialIndex(network.buses)
+        >>> distances, buses = index.query([(45.5017, -73.5673)], k=3)
+        >>> index.query_radius([(46.8139, -71.2080)], radius_km=50)
+    """
+
+    EARTH_RADIUS = 6371.0
+
+    def __init__(self, buses: pd.DataFrame, rebuild_ratio: float = 0.1):
+        """
+        Construit l'index.
+
+        Args:
+            buses: Bus indexés par nom avec les colonnes latitude et longitude
+                (les bus sans coordonnées sont ignorés)
+            rebuild_ratio: Reconstruction quand les bus en attente dépassent
+                cette part des bus indexés
+        """
+        self.rebuild_ratio = rebuild_ratio
+        self.n_rebuilds = 0
+        self._names = np.empty(0, dtype=object)
+        self._points = np.empty((0, 2))
+        self._tree = None
+        self._n_indexed = 0
+        self.add(buses)
+
+    @property
+    def names(self) -> pd.Index:
+        return pd.Index(self._names)
+
+    def add(self, buses: pd.DataFrame) -> None:
+        """
+        Ajoute des bus à l'index.
+
+        Args:
+            buses: Bus indexés par nom avec les colonnes latitude et longitude
+        """
+        coords = buses[['latitude', 'longitude']].dropna()
+        self._names = np.concatenate([self._names, coords.index.to_numpy(dtype=object)])
+        self._points = np.vstack([self._points, coords.to_numpy(dtype=float)])
+
+        pending = len(self._names) - self._n_indexed
+        if self._tree is None or pending > self.rebuild_ratio * self._n_indexed:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        """Reconstruit l'arbre avec tous les bus."""
+        self._tree = cKDTree(to_unit_vectors(self._points)) if len(self._points) else None
+        self._n_indexed = len(self._points)
+        self.n_rebuilds += 1
+
+    def query(self, points, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cherche les k bus les plus proches de chaque point.
+
+        Args:
+            points: Tableau (N, 2) ou point (latitude, longitude)
+            k: Nombre de voisins
+
+        Returns:
+            Tuple (distances en km (N, k), noms des bus (N, k)), triés par
+            distance croissante
+
+        Raises:
+            ValueError: Si k dépasse le nombre de bus indexés
+        """
+        if not 1 <= k <= len(self._names):
+            raise ValueError(f"k doit être compris entre 1 et {len(self._names)}")
+
+        vectors = to_unit_vectors(points)
+        k_tree = min(k, self._n_indexed)
+        chord, positions = self._tree.query(vectors, k=k_tree)
+        chord = chord.reshape(len(vectors), k_tree)
+        positions = positions.reshape(len(vectors), k_tree)
+
+        # Bus ajoutés depuis la dernière construction : force brute
+        if self._n_indexed < len(self._names):
+            pending = to_unit_vectors(self._points[self._n_indexed:])
+            pending_chord = np.linalg.norm(vectors[:, None, :] - pending[None, :, :], axis=2)
+            chord = np.hstack([chord, pending_chord])
+            positions = np.hstack([positions, np.broadcast_to(
+                np.arange(self._n_indexed, len(self._names)), pending_chord.shape)])
+            order = np.argsort(chord, axis=1, kind="stable")[:, :k]
+            chord = np.take_along_axis(chord, order, axis=1)
+            positions = np.take_along_axis(positions, order, axis=1)
+
+        return self._chord_to_km(chord), self._names[positions]
+
+    def query_radius(self, points, radius_km: float) -> List[pd.Series]:
+        """
+        Cherche les bus situés à moins d'une distance donnée de chaque point.
+
+        Args:
+            points: Tableau (N, 2) ou point (latitude, longitude)
+            radius_km: Rayon de recherche en kilomètres
+
+        Returns:
+            Liste (une par point) de Series distance en km indexées par
+            nom de bus, triées par distance croissante
+        """
+        vectors = to_unit_vectors(points)
+        chord_radius = 2 * np.sin(min(radius_km / self.EARTH_RADIUS, np.pi) / 2)
+        matches = (self._tree.query_ball_point(vectors, chord_radius)
+                   if self._tree is not None else [[] for _ in vectors])
+
+        pending = to_unit_vectors(self._points[self._n_indexed:])
+        results = []
+        for vector, found in zip(vectors, matches):
+            positions = np.asarray(found, dtype=int)
+            if len(pending):
+                pending_chord = np.linalg.norm(pending - vector, axis=1)
+                positions = np.r_[positions, self._n_indexed
+                                  + np.flatnonzero(pending_chord <= chord_radius)]
+            chord = np.linalg.norm(to_unit_vectors(self._points[positions]) - vector, axis=1)
+            results.append(pd.Series(self._chord_to_km(chord), index=self._names[positions],
+                                     name='distance_km').sort_values(kind="stable"))
+        return results
+
+    def _chord_to_km(self, chord: np.ndarray) -> np.ndarray:
+        """Convertit une corde de la sphère unité en distance à vol d'oiseau."""
+        return 2 * self.EARTH_RADIUS * np.arcsin(np.clip(chord / 2, 0, 1))
+
+
 class GeoUtils:
     """
     Classe utilitaire pour les calculs géographiques du réseau.
@@ -61,6 +232,9 @@ class GeoUtils:
     
     Note:
         Tous les calculs de distance utilisent la formule de Haversine (Length_calculator.py).
+        Les méthodes calculate_distances, distance_matrix et
+        calculate_line_lengths traitent des tableaux de points en une seule
+        opération NumPy.
     """
 
     EARTH_RADIUS = 6371.0  # Rayon moyen de la Terre en km
@@ -114,9 +288,218 @@ class GeoUtils:
             >>> line_points = [(45.5, -73.5), (46.0, -72.8), (46.8, -71.2)]
             >>> length = geo.calculate_line_length(line_points)
         """
-        total_length = 0.0
-        for i in range(len(points) - 1):
-            total_length += self.calculate_distance(points[i], points[i + 1])
-        return total_length
-    
+        if len(points) < 2:
+            return 0.0
+        return float(self.calculate_line_lengths([points])[0])
+
+    def calculate_distances(self, points1, points2, dtype=np.float64) -> np.ndarray:
+        """
+        Calcule les distances entre deux tableaux de points, paire par paire.
+
+        Args:
+            points1: Tableau (N, 2) ou point (latitude, longitude)
+            points2: Tableau (N, 2) ou point (latitude, longitude), diffusé
+                contre points1
+            dtype: Précision du calcul (np.float32 ou np.float64)
+
+        Returns:
+            Tableau (N,) des distances en kilomètres
+
+        Example:
+            >>> geo = GeoUtils()
+            >>> buses = network.buses[['latitude', 'longitude']].to_numpy()
+            >>> geo.calculate_distances(buses, (45.5017, -73.5673))  # à Montréal
+        """
+        lat1, lon1 = np.radians(np.asarray(points1, dtype=dtype)).T
+        lat2, lon2 = np.radians(np.asarray(points2, dtype=dtype)).T
+        return _haversine(lat1, lon1, np.cos(lat1), lat2, lon2, np.cos(lat2),
+                          np.dtype(dtype).type(self.EARTH_RADIUS))
+
+    def distance_matrix(self,
+                        points,
+                        other=None,
+                        dtype=np.float64,
+                        chunk_size: Optional[int] = None) -> np.ndarray:
+        """
+        Calcule la matrice des distances entre deux ensembles de points.
+
+        Args:
+            points: Tableau (N, 2) des (latitude, longitude)
+            other: Tableau (M, 2) ; points lui-même si None (matrice N × N)
+            dtype: Précision de la matrice (np.float32 divise la mémoire par deux)
+            chunk_size: Nombre de lignes calculées à la fois ; limite la
+                mémoire des tableaux intermédiaires (tout d'un bloc si None)
+
+        Returns:
+            Matrice (N, M) des distances en kilomètres
+
+        Example:
+            >>> coords = network.buses[['latitude', 'longitude']].to_numpy()
+            >>> distances = geo.distance_matrix(coords, dtype=np.float32, chunk_size=1000)
+        """
+        lat1, lon1 = np.radians(np.asarray(points, dtype=dtype)).T
+        if other is None:
+            lat2, lon2 = lat1, lon1
+        else:
+            lat2, lon2 = np.radians(np.asarray(other, dtype=dtype)).T
+        cos1, cos2 = np.cos(lat1), np.cos(lat2)
+        radius = np.dtype(dtype).type(self.EARTH_RADIUS)
+
+        step = len(lat1) if not chunk_size else chunk_size
+        distances = np.empty((len(lat1), len(lat2)), dtype=dtype)
+        for start in range(0, len(lat1), max(step, 1)):
+            rows = slice(start, start + step)
+            distances[rows] = _haversine(lat1[rows, None], lon1[rows, None], cos1[rows, None],
+                                         lat2[None, :], lon2[None, :], cos2[None, :], radius)
+        return distances
+
+    def calculate_line_lengths(self, lines: Sequence[Sequence[Tuple[float, float]]]) -> np.ndarray:
+        """
+        Calcule la longueur de plusieurs tracés en une seule opération.
+
+        Tous les points sont mis bout à bout ; les segments entre le dernier
+        point d'un tracé et le premier du suivant sont ignorés.
+
+        Args:
+            lines: Liste de tracés, chacun une liste de (latitude, longitude)
+
+        Returns:
+            Tableau des longueurs en kilomètres (0 pour un tracé de moins
+            de deux points)
+
+        Example:
+            >>> geo.calculate_line_lengths([[mtl, trois_rivieres, qc], [mtl, qc]])
+        """
+        sizes = np.array([len(line) for line in lines])
+        if sizes.sum() < 2:
+            return np.zeros(len(sizes))
+
+        points = np.concatenate([np.asarray(line, dtype=float).reshape(-1, 2)
+                                 for line in lines])
+        segments = self.calculate_distances(points[:-1], points[1:])
+
+        # Segment i valide si les points i et i+1 appartiennent au même tracé
+        line_of_point = np.repeat(np.arange(len(sizes)), sizes)
+        segments[line_of_point[:-1] != line_of_point[1:]] = 0.0
+        return np.bincount(line_of_point[:-1], weights=segments, minlength=len(sizes))
+
+    def calculate_line_lengths_from_buses(self,
+                                          lines: pd.DataFrame,
+                                          buses: pd.DataFrame) -> pd.Series:
+        """
+        Calcule la longueur à vol d'oiseau de toutes les lignes.
+
+        Args:
+            lines: Lignes avec les colonnes bus0 et bus1 (ex: lines.csv)
+            buses: Bus indexés par nom avec les colonnes latitude et longitude.
+                Un nom en double (même poste à plusieurs niveaux de tension,
+                ex: regions/buses.csv) prend les coordonnées de sa première
+                occurrence
+
+        Returns:
+            Series des longueurs en kilomètres indexée comme lines (NaN si
+            un bus ou ses coordonnées sont inconnus)
+        """
+        coords = buses[['latitude', 'longitude']]
+        coords = coords[~coords.index.duplicated()]
+        start = coords.reindex(lines['bus0']).to_numpy(dtype=float)
+        end = coords.reindex(lines['bus1']).to_numpy(dtype=float)
+        return pd.Series(self.calculate_distances(start, end), index=lines.index, name='length')
+
+    def build_spatial_index(self, buses: pd.DataFrame, rebuild_ratio: float = 0.1) -> BusSpatialIndex:
+        """
+        Construit l'index spatial des bus et le conserve pour les appels suivants.
+
+        Args:
+            buses: Bus indexés par nom avec les colonnes latitude et longitude
+                (ex: buses.csv ou network.buses)
+            rebuild_ratio: Voir BusSpatialIndex
+
+        Returns:
+            Index spatial, également accessible par l'attribut spatial_index
+        """
+        self.spatial_index = BusSpatialIndex(buses, rebuild_ratio=rebuild_ratio)
+        return self.spatial_index
+
+    def find_nearest_buses(self, points, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cherche les bus les plus proches avec l'index spatial courant.
+
+        Args:
+            points: Tableau (N, 2) ou point (latitude, longitude)
+            k: Nombre de voisins
+
+        Returns:
+            Tuple (distances en km (N, k), noms des bus (N, k))
+
+        Raises:
+            RuntimeError: Si l'index n'a pas été construit (build_spatial_index)
+        """
+        if getattr(self, 'spatial_index', None) is None:
+            raise RuntimeError("Index spatial non construit (voir build_spatial_index)")
+        return self.spatial_index.query(points, k=k)
+
+    def benchmark_spatial_index(self,
+                                n_buses: int = 10000,
+                                n_queries: int = 10000,
+                                k: int = 1,
+                                seed: int = 0) -> Dict[str, float]:
+        """
+        Compare l'index spatial à la recherche par force brute.
+
+        Les bus et les points recherchés sont tirés au hasard sur le
+        territoire du Québec. La force brute calcule la matrice complète des
+        distances (par blocs) puis en extrait les k plus petites.
+
+        Args:
+            n_buses: Nombre de bus indexés
+            n_queries: Nombre de points recherchés
+            k: Nombre de voisins
+            seed: Graine du tirage
+
+        Returns:
+            Dict contenant :
+            - Temps de construction de l'index (s)
+            - Temps de recherche avec l'index (s)
+            - Temps de recherche par force brute (s)
+            - Facteur d'accélération
+            - Indicateur d'identité des voisins trouvés
+
+        Example:
+            >>> timings = geo.benchmark_spatial_index(n_buses=20000)
+            >>> print(f"Accélération : x{timings['speedup']:.1f}")
+        """
+        rng = np.random.default_rng(seed)
+        low, high = [45.0, -79.5], [62.5, -57.0]
+        buses = pd.DataFrame(rng.uniform(low, high, (n_buses, 2)),
+                             columns=['latitude', 'longitude'],
+                             index=[f"bus_{i}" for i in range(n_buses)])
+        queries = rng.uniform(low, high, (n_queries, 2))
+
+        start = time.perf_counter()
+        index = BusSpatialIndex(buses)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, index_names = index.query(queries, k=k)
+        index_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        brute_names = np.empty((n_queries, k), dtype=object)
+        for rows in range(0, n_queries, 1000):
+            distances = self.distance_matrix(queries[rows:rows + 1000], buses.to_numpy())
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            nearest = np.take_along_axis(nearest, np.argsort(
+                np.take_along_axis(distances, nearest, axis=1), axis=1), axis=1)
+            brute_names[rows:rows + 1000] = buses.index.to_numpy()[nearest]
+        brute_time = time.perf_counter() - start
+
+        return {
+            'build_seconds': build_time,
+            'index_seconds': index_time,
+            'brute_force_seconds': brute_time,
+            'speedup': brute_time / (build_time + index_time),
+            'identical': bool((index_names == brute_names).all())
+        }
+
     # Add new method here
\ No newline at end of file
@@ -0,0 +1,411 @@
+"""
+Module de géocodage des nœuds du réseau.
+
+Ce module géolocalise les noms de nœuds (postes, centrales) à partir d'un
+service de géocodage. Les réponses sont conservées dans un cache SQLite
+persistant, indexé par le nom normalisé du nœud : une nouvelle exécution
+n'interroge le service que pour les noms nouveaux ou dont la requête a
+échoué. Chaque réponse est enregistrée dès sa réception, si bien qu'une
+exécution interrompue reprend là où elle s'était arrêtée.
+
+Les requêtes sont envoyées en parallèle par un nombre borné de threads,
+chacun avec sa session HTTP (connexions réutilisées). Un seau à jetons
+partagé limite le débit au maximum autorisé par le service.
+
+Classes:
+    GeocodingProvider: Interface d'un service de géocodage.
+    NominatimProvider: Service Nominatim (OpenStreetMap).
+    GeocodingCache: Cache SQLite des réponses.
+    TokenBucket: Limiteur de débit partagé entre threads.
+    Geocoder: Géocodage concurrent avec cache et limitation de débit.
+
+Example:
+    >>> from network.utils import Geocoder, NominatimProvider
+    >>> geocoder = Geocoder(NominatimProvider(), "data/topology/geocoding_cache.sqlite")
+    >>> coordinates = geocoder.geocode(["Hertel", "Outaouais"])
+
+Notes:
+    Un service de test (serveur local) s'utilise en passant son adresse :
+    NominatimProvider(base_url="http://127.0.0.1:8000/search", rate_limit=100).
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import pandas as pd
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalise un nom de nœud pour l'indexation du cache.
+
+    Les accents, la casse et les espaces multiples sont ignorés :
+    'Poste  Hertel' et 'poste hertel' partagent la même entrée.
+
+    Args:
+        name: Nom du nœud
+
+    Returns:
+        Nom normalisé
+    """
+    decomposed = unicodedata.normalize("NFKD", str(name))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", stripped).strip().casefold()
+
+
+class GeocodingProvider:
+    """
+    Interface d'un service de géocodage.
+
+    Une sous-classe définit la requête et l'interprétation de la réponse.
+
+    Attributes:
+        name (str): Identifiant du service, utilisé dans les clés du cache
+        rate_limit (float): Nombre maximal de requêtes par seconde
+    """
+
+    name = "provider"
+    rate_limit = 1.0
+
+    def geocode(self, session: requests.Session, name: str) -> Optional[Tuple[float, float]]:
+        """
+        Géolocalise un nom.
+
+        Args:
+            session: Session HTTP du thread appelant
+            name: Nom du nœud
+
+        Returns:
+            Tuple (latitude, longitude), ou None si le service ne trouve rien
+
+        Raises:
+            requests.RequestException: Si la requête échoue (réseau, statut HTTP)
+        """
+        raise NotImplementedError
+
+
+class NominatimProvider(GeocodingProvider):
+    """
+    Service Nominatim d'OpenStreetMap.
+
+    La politique d'utilisation du service public limite le débit à une
+    requête par seconde et exige un User-Agent identifiant l'application.
+    """
+
+    name = "nominatim"
+
+    def __init__(self,
+                 base_url: str = "https://nominatim.openstreetmap.org/search",
+                 user_agent: str = "PIV",
+                 suffix: str = ", Québec",
+                 rate_limit: float = 1.0,
+                 timeout: float = 10.0):
+        """
+        Initialise le service.
+
+        Args:
+            base_url: Adresse de recherche (serveur local pour les tests)
+            user_agent: Identifiant de l'application
+            suffix: Texte ajouté au nom pour restreindre la recherche
+            rate_limit: Nombre maximal de requêtes par seconde
+            timeout: Délai maximal d'une requête en secondes
+        """
+        self.base_url = base_url
+        self.headers = {'User-Agent': user_agent, 'Accept': 'application/json'}
+        self.suffix = suffix
+        self.rate_limit = rate_limit
+        self.timeout = timeout
+
+    def geocode(self, session: requests.Session, name: str) -> Optional[Tuple[float, float]]:
+        params = {'q': name + self.suffix, 'format': 'json', 'limit': 1}
+        response = session.get(self.base_url, params=params, headers=self.headers,
+                               timeout=self.timeout)
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            return None
+        return float(results[0]['lat']), float(results[0]['lon'])
+
+
+class GeocodingCache:
+    """
+    Cache SQLite des réponses de géocodage.
+
+    Une entrée par (service, nom normalisé), avec le statut de la dernière
+    requête : 'ok' (coordonnées trouvées), 'not_found' (réponse vide) ou
+    'error' (échec, à redemander).
+
+    Attributes:
+        path (Path): Fichier de la base
+    """
+
+    def __init__(self, path: str):
+        """
+        Ouvre (ou crée) la base.
+
+        Args:
+            path: Chemin du fichier SQLite
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS geocoding ("
+            " provider TEXT NOT NULL, key TEXT NOT NULL, name TEXT,"
+            " latitude REAL, longitude REAL, status TEXT NOT NULL, updated REAL,"
+            " PRIMARY KEY (provider, key))"
+        )
+        self._connection.commit()
+
+    def get(self, provider: str, keys: Iterable[str]) -> pd.DataFrame:
+        """
+        Lit les entrées de plusieurs noms normalisés.
+
+        Args:
+            provider: Identifiant du service
+            keys: Noms normalisés
+
+        Returns:
+            DataFrame indexé par nom normalisé (latitude, longitude, status),
+            limité aux noms présents dans le cache
+        """
+        keys = list(dict.fromkeys(keys))
+        rows = []
+        with self._lock:
+            # Lecture par paquets : SQLite limite le nombre de paramètres
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows += self._connection.execute(
+                    f"SELECT key, latitude, longitude, status FROM geocoding"
+                    f" WHERE provider = ? AND key IN ({placeholders})",
+                    [provider] + chunk
+                ).fetchall()
+        return pd.DataFrame(rows, columns=['key', 'latitude', 'longitude', 'status']).set_index('key')
+
+    def put(self,
+            provider: str,
+            key: str,
+            name: str,
+            coordinates: Optional[Tuple[float, float]],
+            status: str) -> None:
+        """
+        Enregistre (ou remplace) une entrée et la valide immédiatement.
+
+        Args:
+            provider: Identifiant du service
+            key: Nom normalisé
+            name: Nom d'origine
+            coordinates: Tuple (latitude, longitude) ou None
+            status: 'ok', 'not_found' ou 'error'
+        """
+        latitude, longitude = coordinates if coordinates is not None else (None, None)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO geocoding VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (provider, key, name, latitude, longitude, status, time.time())
+            )
+            self._connection.commit()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Retourne le nombre d'entrées par statut.
+
+        Returns:
+            Dict {statut: nombre d'entrées}
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*) FROM geocoding GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        """Ferme la connexion à la base."""
+        with self._lock:
+            self._connection.close()
+
+
+class TokenBucket:
+    """
+    Limiteur de débit à seau à jetons, partagé entre threads.
+
+    Le seau se remplit de rate jetons par seconde, jusqu'à capacity jetons.
+    Chaque requête consomme un jeton et attend s'il n'y en a plus.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initialise le seau (plein).
+
+        Args:
+            rate: Jetons ajoutés par seconde
+            capacity: Nombre maximal de jetons (taille des rafales)
+
+        Raises:
+            ValueError: Si rate ou capacity n'est pas positif
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate et capacity doivent être positifs")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Consomme un jeton, en attendant qu'il soit disponible."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class Geocoder:
+    """
+    Géocodage concurrent avec cache persistant et limitation de débit.
+
+    Attributes:
+        provider (GeocodingProvider): Service interrogé
+        cache (GeocodingCache): Cache des réponses
+        bucket (TokenBucket): Limiteur de débit partagé par les threads
+        max_workers (int): Nombre maximal de requêtes simultanées
+        stats (Dict[str, int]): Bilan du dernier appel (cache, requêtes, échecs)
+    """
+
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self,
+                 provider: GeocodingProvider,
+                 cache_path: str,
+                 max_workers: int = 4,
+                 rate_limit: Optional[float] = None,
+                 max_retries: int = 3,
+                 retry_not_found: bool = False):
+        """
+        Initialise le géocodage.
+
+        Args:
+            provider: Service à interroger
+            cache_path: Fichier SQLite du cache
+            max_workers: Nombre maximal de requêtes simultanées
+            rate_limit: Requêtes par seconde (limite du service si None)
+            max_retries: Nouvelles tentatives sur erreur temporaire
+                (429, 5xx, réseau), avec attente croissante
+            retry_not_found: Redemande aussi les noms sans résultat
+        """
+        self.provider = provider
+        self.cache = GeocodingCache(cache_path)
+        self.bucket = TokenBucket(rate_limit or provider.rate_limit)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_not_found = retry_not_found
+        self.stats = {}
+        self._local = threading.local()
+
+    def geocode(self, names: Iterable[str]) -> pd.DataFrame:
+        """
+        Géolocalise des noms de nœuds.
+
+        Seuls les noms absents du cache ou en échec sont envoyés au service.
+        Une interruption (Ctrl+C) conserve les réponses déjà reçues.
+
+        Args:
+            names: Noms des nœuds
+
+        Returns:
+            DataFrame indexé par nom (latitude, longitude, status)
+        """
+        names = pd.Index(pd.unique(pd.Series(list(names), dtype=object)))
+        keys = pd.Series([normalize_name(name) for name in names], index=names)
+
+        cached = self.cache.get(self.provider.name, keys)
+        done_status = {'ok'} if self.retry_not_found else {'ok', 'not_found'}
+        done = cached.index[cached['status'].isin(done_status)]
+        pending = keys[~keys.isin(done)].drop_duplicates()
+
+        self.stats = {'cached': int(keys.isin(done).sum()), 'requested': len(pending), 'failed': 0}
+        print(f"Géocodage : {self.stats['cached']} noms en cache, {len(pending)} à interroger")
+
+        if len(pending):
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            futures = {executor.submit(self._geocode_one, name): name
+                       for name in pending.index}
+            try:
+                for i, future in enumerate(as_completed(futures), 1):
+                    coordinates, status = future.result()
+                    self.cache.put(self.provider.name, pending[futures[future]],
+                                   futures[future], coordinates, status)
+                    if status == 'error':
+                        self.stats['failed'] += 1
+                    if i % 50 == 0 or i == len(futures):
+                        print(f"  {i}/{len(futures)} requêtes traitées")
+            except KeyboardInterrupt:
+                print("Géocodage interrompu : les réponses reçues sont conservées dans le cache")
+                raise
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        results = self.cache.get(self.provider.name, keys)
+        return (results.reindex(keys.values)
+                .set_axis(names)
+                .fillna({'status': 'error'}))
+
+    def _get_session(self) -> requests.Session:
+        """Retourne la session HTTP du thread courant (créée au premier appel)."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def _geocode_one(self, name: str) -> Tuple[Optional[Tuple[float, float]], str]:
+        """
+        Interroge le service pour un nom, avec nouvelles tentatives.
+
+        Returns:
+            Tuple (coordonnées ou None, statut)
+        """
+        session = self._get_session()
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                coordinates = self.provider.geocode(session, name)
+                return coordinates, 'ok' if coordinates is not None else 'not_found'
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status not in self.RETRY_STATUS:
+                    print(f"Erreur lors de la requête pour {name}: {status}")
+                    return None, 'error'
+                retry_after = e.response.headers.get('Retry-After', '')
+                delay = float(retry_after) if retry_after.isdigit() else 2.0 ** attempt
+            except (ValueError, KeyError, IndexError) as e:
+                # Réponse illisible : une nouvelle tentative n'y changera rien
+                print(f"Réponse invalide pour {name}: {str(e)}")
+                return None, 'error'
+            except requests.RequestException:
+                delay = 2.0 ** attempt
+            if attempt < self.max_retries:
+                time.sleep(delay)
+
+        print(f"Échec de la géolocalisation de {name} après {self.max_retries + 1} tentatives")
+        return None, 'error'
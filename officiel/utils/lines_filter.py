@@ -6,9 +6,11 @@ Il utilise les fonctions de lecture de fichiers Excel/CSV pour extraire
 des informations sur les lignes et les nœuds du réseau électrique.
 
 Functions:
+    convert_to_parquet: Convertit le classeur CEF en cache Parquet typé.
+    read_lines: Lit les lignes (Excel, Parquet ou CSV) sans relecture.
     filter_quebec_lines: Filtre les lignes de transmission du Québec.
     get_unique_nodes: Récupère tous les nœuds uniques.
-    geolocate_nodes: Géolocalise les nœuds en utilisant l'API Nominatim.
+    geolocate_nodes: Géolocalise les nœuds (API Nominatim, avec cache).
 
 Classes:
     LineFilter: Classe principale pour le filtrage et la géolocalisation.
@@ -21,13 +23,34 @@ Example:
     >>> line_filter.geolocate_nodes('unique_nodes.csv', 'geolocated_nodes.csv')
 """
 
+import hashlib
+import numpy as np
 import pandas as pd
-import requests
-import time
 import os
-import random
+from pathlib import Path
+from scipy import sparse
+
+from .geocoding import Geocoder, NominatimProvider
+from .pipeline import Pipeline, PipelineStage
 
 class LineFilter:
+    # Colonnes numériques du fichier CEF, les autres restent des chaînes
+    COLUMN_TYPES = {
+        'transmission_line_id': 'Int64',
+        'number_of_circuits': 'Int64',
+        'line_segment_length_km': 'float64',
+        'line_segment_length_mi': 'float64',
+        'line_length_km': 'float64',
+        'line_length_mi': 'float64',
+        'voltage': 'Int64',
+        'reactance': 'float64',
+        'ttc_summer': 'Int64',
+        'ttc_winter': 'Int64'
+    }
+    PARQUET_ROW_GROUP_SIZE = 512
+    # Type de poste (suffixe du code de nœud CEF) -> type de bus, 'ligne' par défaut
+    NODE_CODE_TYPES = {'GSS': 'prod', 'DSS': 'conso', 'ISS': 'conso'}
+
     def __init__(self):
         self.column_names = [
             'transmission_line_id', 'transmission_circuit_id', 'owner', 'province',
@@ -37,33 +60,159 @@ class LineFilter:
             'network_node_name_starting', 'network_node_code_starting',
             'network_node_name_ending', 'network_node_code_ending', 'notes'
         ]
+        # Lignes lues, conservées en mémoire (voir read_lines)
+        self._frames = {}
 
-    def _read_excel_file(self, input_file):
+    def _read_excel_file(self, input_file, province=None):
         """
-        Méthode pour lire et préparer le fichier Excel
+        Lit le fichier Excel des lignes de transmission (format CEF).
+
+        Le classeur n'est décodé qu'une fois : il est converti en cache
+        Parquet typé (voir convert_to_parquet), puis lu depuis ce cache. Le
+        filtre par province est appliqué à la lecture, seuls les groupes de
+        lignes de la province sont décodés.
+
+        Args:
+            input_file (str): Chemin du fichier Excel
+            province (str): Code de province à conserver (ex: 'QC'), toutes si None
+
+        Returns:
+            pd.DataFrame: Lignes de transmission typées, ou None en cas d'erreur
         """
         try:
-            # Lire le fichier Excel
-            df = pd.read_excel(input_file, engine='openpyxl')
-            
-            # Si toutes les données sont dans une seule colonne
-            if len(df.columns) == 1:
-                # Diviser chaque ligne en utilisant la virgule
-                df = pd.DataFrame([x.split(',') for x in df[df.columns[0]]])
-                # Ignorer la première ligne (qui contient les en-têtes) et utiliser nos noms de colonnes
-                df = df.iloc[1:].reset_index(drop=True)
-                df.columns = self.column_names
-            
-            # Nettoyer les guillemets des valeurs
-            df = df.apply(lambda x: x.str.strip('"') if x.dtype == "object" else x)
-            
-            return df
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                # Sans pyarrow : lecture directe du classeur, sans cache
+                df = self._parse_excel(input_file)
+                return df if province is None else df[df['province'] == province].reset_index(drop=True)
+
+            cache_file = self.convert_to_parquet(input_file)
+            filters = [('province', '==', province)] if province is not None else None
+            return pd.read_parquet(cache_file, filters=filters)
             
         except Exception as e:
             print(f"Une erreur est survenue lors de la lecture du fichier : {str(e)}")
             return None
 
-    def filter_quebec_lines(self, input_file, output_file):
+    def _parse_excel(self, input_file):
+        """
+        Décode le classeur Excel et type ses colonnes.
+
+        Si toutes les données sont dans une seule colonne (lignes CSV dans
+        un classeur), la colonne est découpée en une opération vectorisée.
+        Les valeurs 'NULL' deviennent des valeurs manquantes.
+
+        Args:
+            input_file (str): Chemin du fichier Excel
+
+        Returns:
+            pd.DataFrame: Lignes de transmission typées
+        """
+        df = pd.read_excel(input_file, engine='openpyxl', dtype=str)
+
+        # Si toutes les données sont dans une seule colonne
+        if len(df.columns) == 1:
+            # La dernière colonne (notes) conserve ses éventuelles virgules
+            df = df[df.columns[0]].str.split(',', n=len(self.column_names) - 1, expand=True)
+            df.columns = self.column_names
+            # Ligne d'en-têtes répétée dans les données, le cas échéant
+            df = df[df['transmission_line_id'] != 'transmission_line_id'].reset_index(drop=True)
+
+        # Nettoyer les guillemets des valeurs
+        for column in df.columns:
+            df[column] = df[column].str.strip('"')
+        df = df.mask(df.isin(['NULL', 'null', '']))
+
+        for column, dtype in self.COLUMN_TYPES.items():
+            if column in df.columns:
+                df[column] = pd.to_numeric(df[column], errors='coerce').astype(dtype)
+        return df
+
+    def convert_to_parquet(self, input_file, output_file=None, force=False):
+        """
+        Convertit le classeur des lignes de transmission en cache Parquet typé.
+
+        Le cache est écrit à côté du classeur (même nom, extension .parquet)
+        avec l'empreinte SHA-256 du classeur dans ses métadonnées : il n'est
+        régénéré que si le classeur change. Les lignes sont triées par
+        province (tri stable) afin que le filtre par province ne décode que
+        les groupes de lignes concernés.
+
+        Args:
+            input_file (str): Chemin du fichier Excel
+            output_file (str): Chemin du cache (à côté du classeur si None)
+            force (bool): Régénère le cache même s'il est à jour
+
+        Returns:
+            Path: Chemin du cache Parquet
+
+        Example:
+            >>> line_filter.convert_to_parquet('data/topology/transmission_lines.xlsx')
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        source = Path(input_file)
+        output = Path(output_file) if output_file else source.with_suffix('.parquet')
+        digest = hashlib.sha256(source.read_bytes()).hexdigest().encode()
+
+        if not force and output.exists():
+            metadata = pq.read_schema(output).metadata or {}
+            if metadata.get(b'source_sha256') == digest:
+                return output
+
+        df = self._parse_excel(source)
+        if 'province' in df.columns:
+            df = df.sort_values('province', kind='stable')
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                               b'source_sha256': digest})
+        tmp_output = output.with_name(output.name + '.tmp')
+        pq.write_table(table, tmp_output, row_group_size=self.PARQUET_ROW_GROUP_SIZE)
+        os.replace(tmp_output, output)
+
+        print(f"Cache Parquet écrit : {output} ({len(df)} lignes)")
+        return output
+
+    def read_lines(self, input_file, province=None):
+        """
+        Lit un fichier de lignes de transmission (Excel, Parquet ou CSV).
+
+        Le résultat est conservé en mémoire, indexé par le chemin, la date de
+        modification et la taille du fichier : les étapes successives
+        (filtrage, nœuds uniques, nettoyage) ne relisent pas la source.
+
+        Args:
+            input_file (str): Chemin du fichier
+            province (str): Code de province à conserver (ex: 'QC'), toutes si None
+
+        Returns:
+            pd.DataFrame: Copie des lignes lues, ou None en cas d'erreur de lecture
+        """
+        path = os.path.abspath(input_file)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size, province)
+
+        if key not in self._frames:
+            if path.endswith('.csv'):
+                df = pd.read_csv(path)
+            elif path.endswith('.parquet'):
+                filters = [('province', '==', province)] if province is not None else None
+                df = pd.read_parquet(path, filters=filters)
+            else:
+                df = self._read_excel_file(path, province)
+                if df is None:
+                    return None
+
+            if province is not None:
+                df = df[df['province'] == province].reset_index(drop=True)
+            self._frames[key] = df
+
+        return self._frames[key].copy()
+
+    def filter_quebec_lines(self, input_file, output_file, province='QC'):
         """
         Filtre les lignes de transmission du Québec à partir d'un fichier Excel
         et les exporte dans un fichier CSV.
@@ -71,15 +220,14 @@ class LineFilter:
         Args:
             input_file (str): Chemin du fichier Excel d'entrée
             output_file (str): Chemin du fichier CSV de sortie
+            province (str): Code de la province à conserver
         """
         try:
-            df = self._read_excel_file(input_file)
-            if df is None:
+            # Filtrer les lignes du Québec (filtre appliqué à la lecture)
+            quebec_df = self.read_lines(input_file, province)
+            if quebec_df is None:
                 return
             
-            # Filtrer les lignes du Québec
-            quebec_df = df[df['province'] == 'QC']
-            
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
             
             # Exporter en CSV
@@ -90,8 +238,6 @@ class LineFilter:
             
         except Exception as e:
             print(f"Une erreur est survenue : {str(e)}")
-            if 'df' in locals():
-                print("Colonnes dans le fichier :", df.columns.tolist())
 
     def get_unique_nodes(self, input_file, output_file):
         """
@@ -103,27 +249,13 @@ class LineFilter:
             output_file (str): Chemin du fichier CSV de sortie
         """
         try:
-            # Lire le fichier selon son extension
-            if input_file.endswith('.csv'):
-                df = pd.read_csv(input_file)
-            else:
-                df = self._read_excel_file(input_file)
+            # Lire le fichier (CSV, Parquet ou Excel), sans relecture s'il est déjà en mémoire
+            df = self.read_lines(input_file)
             
             if df is None:
                 return
         
-            # Récupérer tous les nœuds de départ et d'arrivée
-            starting_nodes = df['network_node_name_starting'].unique()
-            ending_nodes = df['network_node_name_ending'].unique()
-        
-            # Créer un DataFrame avec tous les nœuds uniques
-            all_nodes = pd.DataFrame({
-                'node_name': sorted(list(set(starting_nodes) | set(ending_nodes))),
-            })
-        
-            # Ajouter des colonnes indiquant si le nœud est utilisé comme départ et/ou arrivée
-            all_nodes['used_as_start'] = all_nodes['node_name'].isin(starting_nodes)
-            all_nodes['used_as_end'] = all_nodes['node_name'].isin(ending_nodes)
+            all_nodes = self._unique_nodes(df)
         
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
         
@@ -146,74 +278,61 @@ class LineFilter:
         
         except Exception as e:
             print(f"Une erreur est survenue lors de la récupération des nœuds : {str(e)}")
+
+    def _unique_nodes(self, df):
+        """
+        Construit la liste triée des nœuds uniques (départ et arrivée).
+
+        Args:
+            df (pd.DataFrame): Lignes de transmission
+
+        Returns:
+            pd.DataFrame: Nœuds (node_name, used_as_start, used_as_end)
+        """
+        # Récupérer tous les nœuds de départ et d'arrivée
+        starting_nodes = df['network_node_name_starting'].unique()
+        ending_nodes = df['network_node_name_ending'].unique()
+    
+        # Créer un DataFrame avec tous les nœuds uniques
+        all_nodes = pd.DataFrame({
+            'node_name': sorted(list(set(starting_nodes) | set(ending_nodes))),
+        })
     
-    def geolocate_nodes(self, input_nodes_file, output_geolocated_file):
+        # Ajouter des colonnes indiquant si le nœud est utilisé comme départ et/ou arrivée
+        all_nodes['used_as_start'] = all_nodes['node_name'].isin(starting_nodes)
+        all_nodes['used_as_end'] = all_nodes['node_name'].isin(ending_nodes)
+        return all_nodes
+    
+    def geolocate_nodes(self, input_nodes_file, output_geolocated_file,
+                        provider=None, cache_path=None, max_workers=4, rate_limit=None,
+                        retry_not_found=False):
         """
-        Géolocalise les nœuds à partir de leurs noms en utilisant l'API Nominatim.
+        Géolocalise les nœuds à partir de leurs noms (API Nominatim par défaut).
+
+        Les réponses sont conservées dans un cache SQLite : une nouvelle
+        exécution n'interroge le service que pour les noms nouveaux ou en
+        échec, et reprend après une interruption (voir utils.geocoding).
         
         Args:
             input_nodes_file (str): Chemin du fichier CSV contenant les nœuds
             output_geolocated_file (str): Chemin du fichier CSV de sortie avec les coordonnées
+            provider (GeocodingProvider): Service de géocodage (Nominatim si None)
+            cache_path (str): Fichier du cache (geocoding_cache.sqlite à côté
+                du fichier de sortie si None)
+            max_workers (int): Nombre maximal de requêtes simultanées
+            rate_limit (float): Requêtes par seconde (limite du service si None)
+            retry_not_found (bool): Redemande aussi les noms restés sans résultat
         """
         
         try:
             df = pd.read_csv(input_nodes_file)
-            
-            # Préparer les colonnes pour les coordonnées
-            df['latitude'] = None
-            df['longitude'] = None
-            
-            # API Nominatim
-            base_url = "https://nominatim.openstreetmap.org/search"
-            headers = {
-                'User-Agent': 'PIV',  # Identifiant Nominatim
-                'Accept': 'application/json'
-            }
-            
-            print(f"Début de la géolocalisation de {len(df)} nœuds...")
-            
-            # Parcourir chaque nœud
-            for index, row in df.iterrows():
-                node_name = row['node_name']
-                
-                # Préparer les paramètres de la requête
-                params = {
-                    'q':node_name + ", Québec",
-                    'format': 'json',               
-                    'limit': 1  # On prend que le premier résultat
-                }
-                
-                try:
-                    # Faire la requête à l'API
-                    response = requests.get(base_url, params=params, headers=headers)
-                    
-                    if response.status_code == 200:
-                        results = response.json()
-                        
-                        if results:
-                            # Stocker les coordonnées
-                            df.at[index, 'latitude'] = float(results[0]['lat'])
-                            df.at[index, 'longitude'] = float(results[0]['lon'])
-                            
-                            print(f"Nœud {node_name} géolocalisé : {results[0]['lat']}, {results[0]['lon']}")
-                        else:
-                            print(f"Aucun résultat trouvé pour le nœud {node_name}")
-                    
-                    else:
-                        print(f"Erreur lors de la requête pour {node_name}: {response.status_code}")
-                    
-                    # Attendre entre chaque requête
-                    time.sleep(0.25)
-                    
-                except Exception as e:
-                    print(f"Erreur lors de la géolocalisation de {node_name}: {str(e)}")
-                    continue
-            
-            total_nodes = len(df)
-            geolocated_nodes = df['latitude'].notna().sum()
-            
-            #print(f"Nœuds géolocalisés : {geolocated_nodes}")
-            #print(f"Pourcentage de réussite : {(geolocated_nodes/total_nodes)*100:.2f}%")
+
+            if cache_path is None:
+                cache_path = os.path.join(os.path.dirname(output_geolocated_file),
+                                          "geocoding_cache.sqlite")
+            df = self._geolocate(df, cache_path, provider=provider,
+                                 max_workers=max_workers, rate_limit=rate_limit,
+                                 retry_not_found=retry_not_found)
             
             os.makedirs(os.path.dirname(output_geolocated_file), exist_ok=True)
             
@@ -224,53 +343,188 @@ class LineFilter:
         except Exception as e:
             print(f"Une erreur est survenue : {str(e)}")
 
-    def fill_missing_coordinates(self, input_geolocated_file, output_filled_file):
-            """
-            Remplit les coordonnées manquantes en utilisant la moyenne des coordonnées
-            du point précédent et du point suivant dans la liste.
+    def _geolocate(self, df, cache_path, provider=None, max_workers=4, rate_limit=None,
+                   retry_not_found=False):
+        """
+        Ajoute les colonnes latitude et longitude aux nœuds.
+
+        Args:
+            df (pd.DataFrame): Nœuds (colonne node_name)
+            cache_path (str): Fichier du cache de géocodage
+            provider (GeocodingProvider): Service de géocodage (Nominatim si None)
+            max_workers (int): Nombre maximal de requêtes simultanées
+            rate_limit (float): Requêtes par seconde (limite du service si None)
+            retry_not_found (bool): Redemande aussi les noms restés sans résultat
+
+        Returns:
+            pd.DataFrame: Copie de df avec les coordonnées (vides si introuvables)
+        """
+        df = df.copy()
+        geocoder = Geocoder(provider or NominatimProvider(), cache_path,
+                            max_workers=max_workers, rate_limit=rate_limit,
+                            retry_not_found=retry_not_found)
+        
+        print(f"Début de la géolocalisation de {len(df)} nœuds...")
+        try:
+            results = geocoder.geocode(df['node_name'])
+        finally:
+            geocoder.cache.close()
+
+        coordinates = results.reindex(df['node_name'])
+        df['latitude'] = coordinates['latitude'].to_numpy()
+        df['longitude'] = coordinates['longitude'].to_numpy()
+        
+        total_nodes = len(df)
+        geolocated_nodes = df['latitude'].notna().sum()
+        
+        print(f"Nœuds géolocalisés : {geolocated_nodes}/{total_nodes} "
+              f"({geocoder.stats['requested']} requêtes, {geocoder.stats['failed']} échecs)")
+        return df
+
+    def fill_missing_coordinates(self, input_geolocated_file, output_filled_file,
+                                 method='sequential', lines_file=None, max_iter=1000, tol=1e-9):
+        """
+        Remplit les coordonnées manquantes des nœuds.
+
+        Deux méthodes sont disponibles :
+        - 'sequential' : moyenne des coordonnées du point précédent et du point
+          suivant dans la liste (voir _fill_sequential)
+        - 'neighbors' : moyenne des coordonnées des nœuds reliés par une ligne
+          (voir _fill_from_neighbors) ; les nœuds non reliés à un nœud
+          géolocalisé sont ensuite remplis par la méthode 'sequential'
+        
+        Args:
+            input_geolocated_file (str): Chemin du fichier CSV contenant les nœuds géolocalisés
+            output_filled_file (str): Chemin du fichier CSV de sortie avec les coordonnées remplies
+            method (str): 'sequential' ou 'neighbors'
+            lines_file (str): Fichier des lignes (bus0/bus1 comme lines.csv, ou
+                network_node_name_starting/ending), requis pour 'neighbors'
+            max_iter (int): Nombre maximal d'itérations de la méthode 'neighbors'
+            tol (float): Variation maximale (degrés) marquant la convergence
+        """
+        try:
+            df = pd.read_csv(input_geolocated_file)
+
+            if method == 'neighbors':
+                if lines_file is None:
+                    raise ValueError("lines_file est requis pour la méthode 'neighbors'")
+                lines = pd.read_csv(lines_file)
+                df = self._fill_from_neighbors(df, lines, max_iter=max_iter, tol=tol)
+            elif method != 'sequential':
+                raise ValueError(f"Méthode non supportée: {method}")
+            df = self._fill_sequential(df)
+
+            print(f"Nœuds sans coordonnées après remplissage : "
+                  f"{(df['latitude'].isna() | df['longitude'].isna()).sum()}")
             
-            Args:
-                input_geolocated_file (str): Chemin du fichier CSV contenant les nœuds géolocalisés
-                output_filled_file (str): Chemin du fichier CSV de sortie avec les coordonnées remplies
-            """
-            try:
-                df = pd.read_csv(input_geolocated_file)
-                
-                # Parcourir chaque ligne pour trouver les coordonnées manquantes
-                for index, row in df.iterrows():
-                    if pd.isna(row['latitude']) or pd.isna(row['longitude']):
-                        prev_index = None
-                        for i in range(index - 1, -1, -1):
-                            if not pd.isna(df.at[i, 'latitude']) and not pd.isna(df.at[i, 'longitude']):
-                                prev_index = i
-                                break
-                        # Trouver le point suivant avec des coordonnées valides
-                        next_index = None
-                        for i in range(index + 1, len(df)):
-                            if not pd.isna(df.at[i, 'latitude']) and not pd.isna(df.at[i, 'longitude']):
-                                next_index = i
-                                break
-                        if prev_index is not None and next_index is not None:
-                            prev_lat = df.at[prev_index, 'latitude']
-                            prev_lon = df.at[prev_index, 'longitude']
-                            next_lat = df.at[next_index, 'latitude']
-                            next_lon = df.at[next_index, 'longitude']
-                            
-                            if not pd.isna(prev_lat) and not pd.isna(next_lat):
-                                df.at[index, 'latitude'] = (prev_lat + next_lat) / 2
-                            if not pd.isna(prev_lon) and not pd.isna(next_lon):
-                                df.at[index, 'longitude'] = (prev_lon + next_lon) / 2
-                
-                os.makedirs(os.path.dirname(output_filled_file), exist_ok=True)
-                
-                # Sauvegarder le résultat
-                df.to_csv(output_filled_file, index=False, encoding='utf-8')
-                print(f"Résultats avec coordonnées remplies sauvegardés dans : {output_filled_file}")
-                
-            except Exception as e:
-                print(f"Une erreur est survenue lors du remplissage des coordonnées : {str(e)}")
+            os.makedirs(os.path.dirname(output_filled_file), exist_ok=True)
+            
+            # Sauvegarder le résultat
+            df.to_csv(output_filled_file, index=False, encoding='utf-8')
+            print(f"Résultats avec coordonnées remplies sauvegardés dans : {output_filled_file}")
+            
+        except Exception as e:
+            print(f"Une erreur est survenue lors du remplissage des coordonnées : {str(e)}")
+
+    def _fill_sequential(self, df):
+        """
+        Remplit chaque nœud sans coordonnées par la moyenne du point précédent
+        et du point suivant dans la liste.
+
+        Les points déjà remplis servent de point précédent : dans une suite de
+        k nœuds manquants entre P et N, le i-ème nœud vaut N + (P - N) / 2^i.
+        Le calcul est vectorisé (propagation avant/arrière du dernier point
+        valide). Les nœuds avant le premier ou après le dernier point valide
+        ne sont pas remplis.
 
+        Args:
+            df (pd.DataFrame): Nœuds avec colonnes latitude et longitude
+
+        Returns:
+            pd.DataFrame: Copie de df avec les coordonnées remplies
+        """
+        df = df.copy()
+        coords = df[['latitude', 'longitude']].astype(float).reset_index(drop=True)
+        valid = coords.notna().all(axis=1)
+
+        previous = coords.where(valid).ffill()
+        following = coords.where(valid).bfill()
+
+        # Rang de chaque nœud manquant dans sa suite de nœuds manquants
+        run = valid.cumsum()
+        rank = (~valid).groupby(run).cumsum()
 
+        filled = following + (previous - following).mul(0.5 ** rank, axis=0)
+        fill = ~valid & previous.notna().all(axis=1) & following.notna().all(axis=1)
+
+        df.loc[fill.to_numpy(), ['latitude', 'longitude']] = filled[fill].to_numpy()
+        return df
+
+    def _fill_from_neighbors(self, df, lines, max_iter=1000, tol=1e-9):
+        """
+        Remplit les nœuds sans coordonnées par la moyenne des coordonnées des
+        nœuds auxquels ils sont reliés par une ligne.
+
+        Le calcul est itéré jusqu'à un point fixe : un nœud rempli sert de
+        voisin aux itérations suivantes, et la valeur des nœuds remplis est
+        recalculée jusqu'à ce qu'elle ne varie plus. Chaque itération est un
+        produit matrice creuse × vecteur.
+
+        Args:
+            df (pd.DataFrame): Nœuds (node_name, latitude, longitude)
+            lines (pd.DataFrame): Lignes (bus0/bus1 ou
+                network_node_name_starting/network_node_name_ending)
+            max_iter (int): Nombre maximal d'itérations
+            tol (float): Variation maximale (degrés) marquant la convergence
+
+        Returns:
+            pd.DataFrame: Copie de df avec les coordonnées remplies (les nœuds
+            non reliés à un nœud géolocalisé restent vides)
+        """
+        df = df.copy()
+        if {'bus0', 'bus1'}.issubset(lines.columns):
+            ends = lines[['bus0', 'bus1']]
+        else:
+            ends = lines[['network_node_name_starting', 'network_node_name_ending']]
+
+        names = pd.Index(df['node_name'])
+        start = names.get_indexer(ends.iloc[:, 0])
+        end = names.get_indexer(ends.iloc[:, 1])
+        keep = (start >= 0) & (end >= 0) & (start != end)
+        start, end = start[keep], end[keep]
+
+        n = len(names)
+        adjacency = sparse.coo_matrix(
+            (np.ones(2 * len(start)), (np.r_[start, end], np.r_[end, start])), shape=(n, n)
+        ).tocsr()
+        adjacency.data[:] = 1.0  # Lignes parallèles comptées une fois
+
+        coords = df[['latitude', 'longitude']].to_numpy(dtype=float, copy=True)
+        known = ~np.isnan(coords).any(axis=1)
+        missing = np.flatnonzero(~known)
+        values = np.where(known[:, None], coords, 0.0)
+        has_value = known.astype(float)
+        rows = adjacency[missing]
+
+        for iteration in range(1, max_iter + 1):
+            counts = rows @ has_value
+            sums = rows @ values
+            reached = counts > 0
+            update = np.zeros_like(sums)
+            update[reached] = sums[reached] / counts[reached, None]
+
+            delta = np.abs(update - values[missing])[reached].max(initial=0.0)
+            newly_reached = (reached & (has_value[missing] == 0)).any()
+            values[missing] = update
+            has_value[missing] = reached
+            if not newly_reached and delta < tol:
+                break
+
+        filled = missing[has_value[missing] > 0]
+        df.loc[df.index[filled], ['latitude', 'longitude']] = values[filled]
+        print(f"Coordonnées déduites des voisins : {len(filled)}/{len(missing)} nœuds "
+              f"({iteration} itérations)")
+        return df
 
     def add_coordinates_to_lines(self, lines_file, geolocated_nodes_file):
         """
@@ -285,24 +539,7 @@ class LineFilter:
             lines_df = pd.read_csv(lines_file)
             geolocated_nodes_df = pd.read_csv(geolocated_nodes_file)
             
-            # Créer un dictionnaire pour les coordonnées géographiques
-            coordinates_dict = geolocated_nodes_df.set_index('node_name')[['latitude', 'longitude']].to_dict('index')
-            
-            # Ajouter ou mettre à jour les colonnes pour les coordonnées géographiques
-            lines_df['latitude_starting'] = lines_df['network_node_name_starting'].map(lambda x: coordinates_dict.get(x, {}).get('latitude'))
-            lines_df['longitude_starting'] = lines_df['network_node_name_starting'].map(lambda x: coordinates_dict.get(x, {}).get('longitude'))
-            lines_df['latitude_ending'] = lines_df['network_node_name_ending'].map(lambda x: coordinates_dict.get(x, {}).get('latitude'))
-            lines_df['longitude_ending'] = lines_df['network_node_name_ending'].map(lambda x: coordinates_dict.get(x, {}).get('longitude'))
-            
-            # Réorganiser les colonnes pour insérer les coordonnées juste après les noms des villes
-            cols = list(lines_df.columns)
-            starting_index = cols.index('network_node_name_starting')
-            ending_index = cols.index('network_node_name_ending') 
-            cols.insert(starting_index + 1, cols.pop(cols.index('latitude_starting')))
-            cols.insert(starting_index + 2, cols.pop(cols.index('longitude_starting')))
-            cols.insert(ending_index + 1, cols.pop(cols.index('latitude_ending')))
-            cols.insert(ending_index + 2, cols.pop(cols.index('longitude_ending')))
-            lines_df = lines_df[cols]
+            lines_df = self._add_coordinates(lines_df, geolocated_nodes_df)
             
             # Sauvegarder le résultat en écrasant le fichier d'entrée
             lines_df.to_csv(lines_file, index=False, encoding='utf-8')
@@ -311,9 +548,41 @@ class LineFilter:
         except Exception as e:
             print(f"Une erreur est survenue lors de l'ajout des coordonnées : {str(e)}")
 
+    def _add_coordinates(self, lines_df, geolocated_nodes_df):
+        """
+        Ajoute les coordonnées des nœuds de départ et d'arrivée aux lignes.
 
+        Args:
+            lines_df (pd.DataFrame): Lignes de transmission
+            geolocated_nodes_df (pd.DataFrame): Nœuds (node_name, latitude, longitude)
 
-    def extract_lines(self, input_file, output_file):
+        Returns:
+            pd.DataFrame: Lignes avec les colonnes latitude/longitude_starting/ending
+        """
+        lines_df = lines_df.copy()
+
+        # Créer un dictionnaire pour les coordonnées géographiques
+        coordinates_dict = geolocated_nodes_df.set_index('node_name')[['latitude', 'longitude']].to_dict('index')
+        
+        # Ajouter ou mettre à jour les colonnes pour les coordonnées géographiques
+        lines_df['latitude_starting'] = lines_df['network_node_name_starting'].map(lambda x: coordinates_dict.get(x, {}).get('latitude'))
+        lines_df['longitude_starting'] = lines_df['network_node_name_starting'].map(lambda x: coordinates_dict.get(x, {}).get('longitude'))
+        lines_df['latitude_ending'] = lines_df['network_node_name_ending'].map(lambda x: coordinates_dict.get(x, {}).get('latitude'))
+        lines_df['longitude_ending'] = lines_df['network_node_name_ending'].map(lambda x: coordinates_dict.get(x, {}).get('longitude'))
+        
+        # Réorganiser les colonnes pour insérer les coordonnées juste après les noms des villes
+        cols = list(lines_df.columns)
+        starting_index = cols.index('network_node_name_starting')
+        ending_index = cols.index('network_node_name_ending') 
+        cols.insert(starting_index + 1, cols.pop(cols.index('latitude_starting')))
+        cols.insert(starting_index + 2, cols.pop(cols.index('longitude_starting')))
+        cols.insert(ending_index + 1, cols.pop(cols.index('latitude_ending')))
+        cols.insert(ending_index + 2, cols.pop(cols.index('longitude_ending')))
+        return lines_df[cols]
+
+
+
+    def extract_lines(self, input_file, output_file, rating='min'):
         """
         Extrait les informations des lignes de transmission du fichier lignes_quebec.csv
         et les sauvegarde dans le fichier lines.csv avec les colonnes spécifiées.
@@ -321,26 +590,12 @@ class LineFilter:
         Args:
             input_file (str): Chemin du fichier CSV d'entrée (lignes_quebec.csv)
             output_file (str): Chemin du fichier CSV de sortie (lines.csv)
+            rating (str): Capacité retenue pour s_nom (voir _extract_lines)
         """
         try:
             df = pd.read_csv(input_file)
             
-            # Initialiser une liste pour stocker les nouvelles lignes
-            new_lines = []
-            
-            for index, row in df.iterrows():
-                name = f"L{index + 1:04d}"
-                bus0 = row['network_node_name_starting']
-                bus1 = row['network_node_name_ending']
-                type_line = f"{row['voltage']}kV_line"
-                length = row['line_segment_length_km']
-                capital_cost = length * 1000  # Estimation du coût
-                s_nom = 10000 + (index % 2) * 10000  # Alternance entre 10000 et 20000
-                
-                new_lines.append([name, bus0, bus1, type_line, length, capital_cost, s_nom])
-            
-            # Créer un DataFrame avec les nouvelles lignes
-            new_lines_df = pd.DataFrame(new_lines, columns=['name', 'bus0', 'bus1', 'type', 'length', 'capital_cost', 's_nom'])
+            new_lines_df = self._extract_lines(df, rating=rating)
             
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
             
@@ -353,6 +608,44 @@ class LineFilter:
         except Exception as e:
             print(f"Une erreur est survenue lors de l'extraction des lignes : {str(e)}")
 
+    def _extract_lines(self, df, rating='min'):
+        """
+        Construit les lignes PyPSA à partir des lignes de transmission.
+
+        La capacité s_nom (MW) est la capacité de transfert (TTC) de la ligne :
+        'summer', 'winter', ou 'min' (la plus faible des deux, valable toute
+        l'année). Une ligne sans TTC prend la médiane (arrondie au MW) des
+        lignes de même tension.
+
+        Args:
+            df (pd.DataFrame): Lignes de transmission
+            rating (str): 'min', 'summer' ou 'winter'
+
+        Returns:
+            pd.DataFrame: Lignes (name, bus0, bus1, type, length, capital_cost, s_nom)
+
+        Raises:
+            ValueError: Si rating n'est pas supporté
+        """
+        ratings = {'min': ['ttc_summer', 'ttc_winter'],
+                   'summer': ['ttc_summer'], 'winter': ['ttc_winter']}
+        if rating not in ratings:
+            raise ValueError(f"Capacité non supportée: {rating}")
+
+        s_nom = df[ratings[rating]].astype(float).min(axis=1)
+        s_nom = s_nom.fillna(s_nom.groupby(df['voltage']).transform('median')).round().astype('Int64')
+        length = df['line_segment_length_km']
+
+        return pd.DataFrame({
+            # Numérotation par position, comme après relecture d'un CSV
+            'name': [f"L{i:04d}" for i in range(1, len(df) + 1)],
+            'bus0': df['network_node_name_starting'].to_numpy(),
+            'bus1': df['network_node_name_ending'].to_numpy(),
+            'type': (df['voltage'].astype(str) + "kV_line").to_numpy(),
+            'length': length.to_numpy(),
+            'capital_cost': (length * 1000).to_numpy(),  # Estimation du coût
+            's_nom': s_nom.to_numpy(),
+        })
 
     def clean_lines(self, input_file, output_file):
         """
@@ -364,10 +657,9 @@ class LineFilter:
             output_file (str): Chemin du fichier CSV de sortie (lignes_quebec_clean.csv)
         """
         try:
-            df = pd.read_csv(input_file)
+            df = self.read_lines(input_file)
             
-            # Supprimer les doublons
-            df_cleaned = df.drop_duplicates(subset=['network_node_name_starting', 'network_node_name_ending', 'voltage'])
+            df_cleaned = self._clean_lines(df)
             
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
             
@@ -380,8 +672,12 @@ class LineFilter:
         except Exception as e:
             print(f"Une erreur est survenue lors du nettoyage des lignes : {str(e)}")
 
+    def _clean_lines(self, df):
+        """Supprime les lignes en double (mêmes nœuds et même tension)."""
+        return df.drop_duplicates(subset=['network_node_name_starting', 'network_node_name_ending', 'voltage'])
+
 
-    def extract_buses(self, input_file, output_file):
+    def extract_buses(self, input_file, output_file, data_dir=None):
         """
         Extrait les informations des bus du fichier lignes_quebec.csv
         et les sauvegarde dans le fichier buses.csv avec les colonnes spécifiées.
@@ -389,40 +685,17 @@ class LineFilter:
         Args:
             input_file (str): Chemin du fichier CSV d'entrée (lignes_quebec.csv)
             output_file (str): Chemin du fichier CSV de sortie (buses.csv)
+            data_dir (str): Répertoire data contenant les centrales et les
+                séries de charge, utilisés pour typer les bus (répertoire
+                data du projet si None)
         """
         try:
             df = pd.read_csv(input_file)
             
-            # Initialiser une liste pour stocker les nouveaux bus
-            buses = []
-            
-            # Extraire les bus de départ et d'arrivée
-            for index, row in df.iterrows():
-                buses.append([row['network_node_name_starting'], row['voltage'], row['latitude_starting'], row['longitude_starting']])
-                buses.append([row['network_node_name_ending'], row['voltage'], row['latitude_ending'], row['longitude_ending']])
-            
-            # Créer un DataFrame avec les bus
-            buses_df = pd.DataFrame(buses, columns=['name', 'voltage', 'latitude', 'longitude'])
-            
-            # Supprimer les doublons
-            buses_df = buses_df.drop_duplicates(subset=['name', 'voltage'])
-            
-            # Ajouter les colonnes 'type' et 'PQ_PV'
-            buses_df['type'] = None
-            buses_df['PQ_PV'] = None
-            
-            # Définir les types et PQ_PV
-            for index, row in buses_df.iterrows():
-                rand_val = random.random()
-                if rand_val < 0.5:
-                    buses_df.at[index, 'type'] = 'conso'
-                    buses_df.at[index, 'PQ_PV'] = 'PQ'
-                elif rand_val < 0.7:
-                    buses_df.at[index, 'type'] = 'prod'
-                    buses_df.at[index, 'PQ_PV'] = 'PV'
-                else:
-                    buses_df.at[index, 'type'] = 'ligne'
-                    buses_df.at[index, 'PQ_PV'] = 'PQ'
+            if data_dir is None:
+                data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+            generator_buses, load_regions = self._read_bus_markers(data_dir)
+            buses_df = self._extract_buses(df, generator_buses, load_regions)
             
             os.makedirs(os.path.dirname(output_file), exist_ok=True)
             
@@ -435,54 +708,198 @@ class LineFilter:
         except Exception as e:
             print(f"Une erreur est survenue lors de l'extraction des bus : {str(e)}")
 
-# ajouter module 
+    def _extract_buses(self, df, generator_buses=(), load_regions=()):
+        """
+        Construit les bus à partir des nœuds de départ et d'arrivée des lignes.
 
+        Les nœuds sont empilés dans l'ordre des lignes (départ puis arrivée
+        de chaque ligne) et dédoublonnés par (nom, tension). Le type de chaque
+        bus est déterminé par _classify_buses : le résultat ne dépend que des
+        données d'entrée.
 
-    
+        Args:
+            df (pd.DataFrame): Lignes de transmission avec coordonnées
+            generator_buses (Iterable[str]): Bus des centrales (generators_*.csv)
+            load_regions (Iterable[str]): Régions des séries de charge
 
+        Returns:
+            pd.DataFrame: Bus (name, voltage, latitude, longitude, type, PQ_PV)
+        """
+        ends = []
+        for position, end in enumerate(['starting', 'ending']):
+            ends.append(pd.DataFrame({
+                'name': df[f'network_node_name_{end}'].to_numpy(),
+                'voltage': df['voltage'].to_numpy(),
+                'latitude': df[f'latitude_{end}'].to_numpy(),
+                'longitude': df[f'longitude_{end}'].to_numpy(),
+                'code': df[f'network_node_code_{end}'].to_numpy(),
+                'order': np.arange(len(df)) * 2 + position,
+            }))
+        nodes = pd.concat(ends, ignore_index=True).sort_values('order', kind='stable')
+
+        types = self._classify_buses(nodes, generator_buses, load_regions)
+
+        # Supprimer les doublons
+        buses_df = nodes.drop_duplicates(subset=['name', 'voltage'])
+        buses_df = buses_df[['name', 'voltage', 'latitude', 'longitude']].reset_index(drop=True)
+        buses_df['type'] = buses_df['name'].map(types).to_numpy()
+        buses_df['PQ_PV'] = np.where(buses_df['type'] == 'prod', 'PV', 'PQ')
+        return buses_df
+
+    def _classify_buses(self, nodes, generator_buses=(), load_regions=()):
+        """
+        Détermine le type de chaque bus à partir de règles.
 
-# Chemins des fichiers
+        Un bus est :
+        - 'prod' si l'un de ses codes CEF est un poste de production (GSS)
+          ou si une centrale y est raccordée (nom ou code de poste)
+        - 'conso' sinon, si l'un de ses codes est un poste de distribution
+          ou industriel (DSS, ISS) ou s'il porte une région de charge
+        - 'ligne' sinon (postes de transport, de sectionnement, jonctions)
 
+        Args:
+            nodes (pd.DataFrame): Nœuds (name, code au format 'QC_HIF_GSS')
+            generator_buses (Iterable[str]): Bus des centrales
+            load_regions (Iterable[str]): Régions des séries de charge
 
-if __name__ == "__main__":
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    
-    # Chemins des fichiers
-    input_file = os.path.join(project_root, "data", "topology", "transmission_lines.xlsx")
-    output_quebec_file = os.path.join(project_root, "data", "topology", "lignes_quebec.csv")
-    output_nodes_file = os.path.join(project_root, "data", "topology", "unique_nodes.csv")
-    output_geolocated_file = os.path.join(project_root, "data", "topology", "geolocated_nodes.csv")
-    output_filled_file = os.path.join(project_root, "data", "topology", "filled_geolocated_nodes.csv")
-    input_file = os.path.join(project_root, "data", "topology", "lignes_quebec.csv")
-    output_lines_file = os.path.join(project_root, "data", "topology", "lines", "lines.csv")
-    input_file = os.path.join(project_root, "data", "topology", "lignes_quebec.csv")
-    output_cleaned_file = os.path.join(project_root, "data", "topology", "lignes_quebec.csv")
-    input_file = os.path.join(project_root, "data", "topology", "lignes_quebec.csv")
-    output_buses_file = os.path.join(project_root, "data", "regions", "buses.csv") 
-
-
-    line_filter = LineFilter()
-    
+        Returns:
+            pd.Series: Type indexé par nom de bus
+        """
+        parts = nodes['code'].astype(str).str.extract(r'^[^_]+_(?P<station>.+)_(?P<kind>[^_]+)$')
+        kind = parts['kind'].map(self.NODE_CODE_TYPES).fillna('ligne')
 
-    # # Exécuter le filtrage des lignes du Québec
-    #line_filter.filter_quebec_lines(input_file, output_quebec_file)
-    
-    # # Exporter les nœuds uniques
-    #line_filter.get_unique_nodes(output_quebec_file, output_nodes_file)
+        generator_buses, load_regions = set(generator_buses), set(load_regions)
+        is_prod = ((kind == 'prod') | parts['station'].isin(generator_buses)
+                   | nodes['name'].isin(generator_buses))
+        is_conso = ((kind == 'conso') | parts['station'].isin(load_regions)
+                    | nodes['name'].isin(load_regions))
 
-    #line_filter.geolocate_nodes(output_nodes_file, output_geolocated_file )
-    
-    # Remplir les coordonnées manquantes
-    #line_filter.fill_missing_coordinates(output_geolocated_file, output_filled_file)
+        flags = pd.DataFrame({'prod': is_prod.to_numpy(), 'conso': is_conso.to_numpy()},
+                             index=nodes['name'].to_numpy()).groupby(level=0).any()
+        return pd.Series(np.select([flags['prod'], flags['conso']], ['prod', 'conso'], 'ligne'),
+                         index=flags.index)
+
+    def _read_bus_markers(self, data_dir):
+        """
+        Lit les bus des centrales et les régions de charge du répertoire data.
 
-    # Ajouter les coordonnées géographiques aux lignes de transmission
-    #line_filter.add_coordinates_to_lines(output_quebec_file, output_filled_file)
+        Args:
+            data_dir (str): Répertoire data du projet
 
-    # Extraire les lignes et sauvegarder dans lines.csv
-    #line_filter.extract_lines(input_file, output_lines_file)
+        Returns:
+            Tuple (bus des centrales, régions de charge), listes triées
+        """
+        data_dir = Path(data_dir)
+        generator_buses = set()
+        for path in sorted(data_dir.glob("topology/centrales/generators_*.csv")):
+            generator_buses.update(pd.read_csv(path, usecols=['bus'])['bus'].dropna().astype(str))
 
-    # Nettoyer les lignes et sauvegarder dans lignes_quebec_clean.csv
-    #line_filter.clean_lines(input_file, output_cleaned_file)
+        load_regions = set()
+        for path in sorted(data_dir.glob("timeseries/*/loads-p_set.csv")):
+            load_regions.update(pd.read_csv(path, index_col=0, nrows=0).columns.astype(str))
 
-    # Extraire les bus et sauvegarder dans buses.csv
-    line_filter.extract_buses(input_file, output_buses_file)
+        return sorted(generator_buses), sorted(load_regions)
+
+    def build_pipeline(self, data_dir, province='QC', fill_method='sequential',
+                       rating='min', provider=None, max_workers=2, retry_not_found=False):
+        """
+        Construit la chaîne de reconstruction de la topologie.
+
+        Étapes (dépendances entre crochets) :
+        - quebec_lines : lignes de la province, lues du classeur CEF
+        - unique_nodes [quebec_lines] -> topology/unique_nodes.csv
+        - geolocated_nodes [unique_nodes] -> topology/geolocated_nodes.csv
+        - filled_nodes [geolocated_nodes (, quebec_lines)] -> topology/filled_geolocated_nodes.csv
+        - located_lines [quebec_lines, filled_nodes] : lignes avec coordonnées
+        - clean_lines [located_lines] -> topology/lignes_quebec.csv
+        - lines [clean_lines] -> topology/lines/lines.csv
+        - buses [clean_lines] -> regions/buses.csv
+
+        Les résultats passent d'une étape à l'autre en mémoire ; les fichiers
+        CSV ne sont que des exports. Une étape n'est recalculée que si son
+        classeur source, son code, ses paramètres ou le résultat d'une étape
+        amont ont changé (voir utils.pipeline.Pipeline). Seule exception,
+        geolocated_nodes est exécutée à chaque lancement : le cache SQLite
+        évite de redemander les noms connus et les échecs des exécutions
+        précédentes sont redemandés ; les étapes aval ne sont recalculées que
+        si des coordonnées ont changé.
+
+        Args:
+            data_dir (str): Répertoire data du projet
+            province (str): Code de la province à conserver
+            fill_method (str): Méthode de fill_missing_coordinates
+                ('sequential' ou 'neighbors')
+            rating (str): Capacité retenue pour s_nom ('min', 'summer', 'winter')
+            provider (GeocodingProvider): Service de géocodage (Nominatim si None)
+            max_workers (int): Nombre maximal d'étapes exécutées simultanément
+            retry_not_found (bool): Redemande aussi les noms que le service
+                n'a pas trouvés lors des exécutions précédentes
+
+        Returns:
+            Pipeline: Chaîne prête à être exécutée (pipeline.run())
+
+        Example:
+            >>> pipeline = LineFilter().build_pipeline('data')
+            >>> report = pipeline.run()
+        """
+        topology = os.path.join(data_dir, "topology")
+        source = os.path.join(topology, "transmission_lines.xlsx")
+        cache_path = os.path.join(topology, "geocoding_cache.sqlite")
+        generator_buses, load_regions = self._read_bus_markers(data_dir)
+
+        if fill_method == 'neighbors':
+            fill_stage = PipelineStage(
+                'filled_nodes',
+                lambda nodes, lines: self._fill_sequential(self._fill_from_neighbors(nodes, lines)),
+                depends_on=['geolocated_nodes', 'quebec_lines'],
+                output=os.path.join(topology, "filled_geolocated_nodes.csv")
+            )
+        else:
+            fill_stage = PipelineStage(
+                'filled_nodes', self._fill_sequential,
+                depends_on=['geolocated_nodes'],
+                output=os.path.join(topology, "filled_geolocated_nodes.csv")
+            )
+
+        stages = [
+            PipelineStage('quebec_lines', self.read_lines, sources=[source],
+                          params={'input_file': source, 'province': province}),
+            PipelineStage('unique_nodes', self._unique_nodes, depends_on=['quebec_lines'],
+                          output=os.path.join(topology, "unique_nodes.csv")),
+            # Toujours exécutée : le cache évite de réinterroger les noms déjà connus
+            PipelineStage('geolocated_nodes',
+                          lambda nodes, provider_name: self._geolocate(
+                              nodes, cache_path, provider=provider,
+                              retry_not_found=retry_not_found),
+                          depends_on=['unique_nodes'],
+                          output=os.path.join(topology, "geolocated_nodes.csv"),
+                          params={'provider_name': (provider or NominatimProvider()).name},
+                          always_run=True),
+            fill_stage,
+            PipelineStage('located_lines', self._add_coordinates,
+                          depends_on=['quebec_lines', 'filled_nodes']),
+            PipelineStage('clean_lines', self._clean_lines, depends_on=['located_lines'],
+                          output=os.path.join(topology, "lignes_quebec.csv")),
+            PipelineStage('lines', self._extract_lines, depends_on=['clean_lines'],
+                          output=os.path.join(topology, "lines", "lines.csv"),
+                          params={'rating': rating}),
+            # Les bus des centrales et les régions de charge font partie de la clé
+            PipelineStage('buses', self._extract_buses, depends_on=['clean_lines'],
+                          output=os.path.join(data_dir, "regions", "buses.csv"),
+                          params={'generator_buses': generator_buses,
+                                  'load_regions': load_regions}),
+        ]
+        return Pipeline(stages, state_dir=os.path.join(topology, ".pipeline"),
+                        max_workers=max_workers)
+
+
+if __name__ == "__main__":
+    # Reconstruction de la topologie :
+    # python -m utils.lines_filter [--force] [--retry-not-found]
+    import sys
+
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    pipeline = LineFilter().build_pipeline(os.path.join(project_root, "data"),
+                                           retry_not_found='--retry-not-found' in sys.argv)
+    report = pipeline.run(force='--force' in sys.argv)
+    print(report.to_string())
@@ -0,0 +1,177 @@
+"""
+Module de cache binaire des réseaux construits.
+
+Ce module conserve sur disque les réseaux PyPSA déjà construits afin d'éviter
+de relire tous les fichiers CSV et de reconstruire le réseau à chaque exécution.
+Chaque entrée est adressée par le contenu : la clé est une empreinte SHA-256
+des fichiers sources et des paramètres de construction (année, fenêtre
+temporelle). Toute modification d'un fichier source produit donc une nouvelle
+clé, ce qui invalide automatiquement l'ancienne entrée.
+
+Classes:
+    NetworkCache: Gestionnaire du cache des réseaux.
+
+Example:
+    >>> from network.utils import NetworkCache
+    >>> cache = NetworkCache("data/.cache")
+    >>> key = cache.compute_key(source_files, year='2024')
+    >>> network = cache.load(key)
+    >>> if network is None:
+    ...     cache.save(key, build_network())
+
+Notes:
+    Deux formats sont disponibles :
+    - 'pickle' : le plus rapide, restitue le réseau à l'identique
+    - 'netcdf' : format natif de PyPSA, portable entre versions
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import pypsa
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class NetworkCache:
+    """
+    Cache sur disque des réseaux PyPSA, adressé par le contenu des sources.
+
+    Attributes:
+        cache_dir (Path): Répertoire de stockage des réseaux en cache
+        fmt (str): Format de stockage ('pickle' ou 'netcdf')
+    """
+
+    EXTENSIONS = {"pickle": ".pkl", "netcdf": ".nc"}
+
+    def __init__(self, cache_dir: str, fmt: str = "pickle"):
+        """
+        Initialise le cache.
+
+        Args:
+            cache_dir: Répertoire de stockage (créé au besoin)
+            fmt: Format de stockage ('pickle' ou 'netcdf')
+
+        Raises:
+            ValueError: Si le format n'est pas supporté
+        """
+        if fmt not in self.EXTENSIONS:
+            raise ValueError(f"Format de cache non supporté: {fmt}")
+
+        self.cache_dir = Path(cache_dir)
+        self.fmt = fmt
+
+    def compute_key(self, source_files: List[Path], **params) -> str:
+        """
+        Calcule la clé d'un réseau à partir de ses sources.
+
+        Args:
+            source_files: Fichiers lus pour construire le réseau
+            **params: Paramètres de construction (année, dates, ...)
+
+        Returns:
+            Empreinte hexadécimale SHA-256
+        """
+        digest = hashlib.sha256()
+        digest.update(pypsa.__version__.encode())
+        digest.update(self.fmt.encode())
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+
+        for path in sorted(Path(p) for p in source_files):
+            digest.update(path.as_posix().encode())
+            if path.exists():
+                digest.update(path.read_bytes())
+
+        return digest.hexdigest()
+
+    def get_path(self, key: str) -> Path:
+        """Retourne le chemin du fichier associé à une clé."""
+        return self.cache_dir / f"network_{key}{self.EXTENSIONS[self.fmt]}"
+
+    def load(self, key: str) -> Optional[pypsa.Network]:
+        """
+        Charge un réseau depuis le cache.
+
+        Args:
+            key: Clé du réseau
+
+        Returns:
+            Le réseau en cache, ou None s'il est absent ou illisible
+        """
+        path = self.get_path(key)
+        if not path.exists():
+            return None
+
+        try:
+            if self.fmt == "pickle":
+                with open(path, "rb") as f:
+                    return pickle.load(f)
+            return pypsa.Network(str(path))
+        except Exception as e:
+            print(f"Entrée de cache illisible ignorée ({path.name}) : {str(e)}")
+            return None
+
+    def save(self, key: str, network: pypsa.Network) -> Path:
+        """
+        Enregistre un réseau dans le cache.
+
+        L'écriture se fait dans un fichier temporaire renommé ensuite, afin
+        qu'une exécution interrompue ne laisse pas d'entrée corrompue.
+
+        Args:
+            key: Clé du réseau
+            network: Réseau à enregistrer
+
+        Returns:
+            Chemin du fichier écrit
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.get_path(key)
+        tmp_path = path.with_name(path.name + ".tmp")
+
+        try:
+            if self.fmt == "pickle":
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(network, f, protocol=pickle.HIGHEST_PROTOCOL)
+            else:
+                network.export_to_netcdf(str(tmp_path))
+        except BaseException:
+            # Pas de fichier partiel compté comme une entrée du cache
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        os.replace(tmp_path, path)
+        return path
+
+    def clear(self) -> int:
+        """
+        Supprime toutes les entrées du cache.
+
+        Returns:
+            Nombre de fichiers supprimés
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        removed = 0
+        for path in self.cache_dir.glob("network_*"):
+            path.unlink()
+            removed += 1
+        return removed
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Retourne l'occupation du cache.
+
+        Returns:
+            Dict avec le nombre d'entrées et la taille totale en Mo
+        """
+        entries = list(self.cache_dir.glob("network_*")) if self.cache_dir.exists() else []
+        return {
+            'entries': len(entries),
+            'size_mb': sum(p.stat().st_size for p in entries) / 1e6
+        }
@@ -0,0 +1,393 @@
+"""
+Module d'exécution de chaînes de traitement déclaratives.
+
+Une chaîne est un graphe orienté sans cycle d'étapes. Chaque étape est une
+fonction qui reçoit les DataFrames produits par les étapes dont elle dépend
+et retourne un DataFrame : les résultats passent d'une étape à l'autre en
+mémoire, sans relecture de fichiers intermédiaires.
+
+Chaque étape est adressée par le contenu : sa clé est une empreinte SHA-256
+de son nom, de son code (source de la fonction et numéro de version), de ses
+paramètres, de ses fichiers sources et du contenu des résultats des étapes
+amont. Une étape dont la clé n'a pas changé depuis la
+dernière exécution est sautée et son résultat relu depuis le répertoire
+d'état, sauf si elle dépend d'un état externe (always_run) : elle est alors
+exécutée à chaque fois et les étapes aval ne sont recalculées que si son
+résultat change. L'état est enregistré après chaque étape : une exécution
+interrompue reprend à la première étape non terminée.
+
+Classes:
+    PipelineStage: Description d'une étape.
+    Pipeline: Exécution ordonnée (et parallèle) des étapes.
+
+Example:
+    >>> from network.utils import Pipeline, PipelineStage
+    >>> pipeline = Pipeline([
+    ...     PipelineStage('raw', read_raw, sources=['raw.xlsx']),
+    ...     PipelineStage('clean', clean, depends_on=['raw'], output='clean.csv'),
+    ... ], state_dir='data/.pipeline')
+    >>> report = pipeline.run()
+
+Notes:
+    Les étapes indépendantes s'exécutent en parallèle dans des threads
+    (max_workers), ce qui profite surtout aux étapes limitées par les
+    entrées/sorties (lecture de fichiers, requêtes réseau).
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import time
+import pandas as pd
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass
+class PipelineStage:
+    """
+    Description d'une étape de la chaîne.
+
+    Attributes:
+        name (str): Nom unique de l'étape
+        func (Callable): Fonction appelée avec les résultats des étapes
+            amont (dans l'ordre de depends_on) et les paramètres
+        depends_on (List[str]): Étapes dont les résultats sont requis
+        sources (List[str]): Fichiers lus par l'étape, pris en compte dans la clé
+        output (str, optional): Fichier CSV où exporter le résultat
+        params (Dict): Paramètres nommés transmis à func
+        version (str): Version du traitement, à changer lorsqu'une fonction
+            appelée par func est modifiée (la source de func elle-même fait
+            déjà partie de la clé)
+        always_run (bool): Exécute l'étape à chaque lancement, pour les
+            étapes dont le résultat dépend d'un état externe absent de la
+            clé (ex: cache ou service de géocodage)
+    """
+    name: str
+    func: Callable[..., pd.DataFrame]
+    depends_on: List[str] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+    output: Optional[str] = None
+    params: Dict = field(default_factory=dict)
+    version: str = ""
+    always_run: bool = False
+
+
+class Pipeline:
+    """
+    Exécute une chaîne d'étapes en ne recalculant que les étapes modifiées.
+
+    Attributes:
+        stages (Dict[str, PipelineStage]): Étapes par nom
+        order (List[str]): Ordre topologique des étapes
+        state_dir (Path): Répertoire des résultats et de l'état
+        max_workers (int): Nombre maximal d'étapes exécutées simultanément
+        report (pd.DataFrame): Bilan de la dernière exécution
+    """
+
+    STATE_FILE = "pipeline_state.json"
+
+    def __init__(self,
+                 stages: List[PipelineStage],
+                 state_dir: str,
+                 max_workers: int = 2):
+        """
+        Initialise la chaîne.
+
+        Args:
+            stages: Étapes, dans un ordre quelconque
+            state_dir: Répertoire des résultats et de l'état (créé au besoin)
+            max_workers: Nombre maximal d'étapes exécutées simultanément
+
+        Raises:
+            ValueError: Si un nom est en double, si une dépendance est
+                inconnue ou si le graphe contient un cycle
+        """
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Étape en double: {stage.name}")
+            self.stages[stage.name] = stage
+
+        self.order = self._topological_order()
+        self.state_dir = Path(state_dir)
+        self.max_workers = max_workers
+        self.report = None
+        self._results = {}
+
+    def _topological_order(self) -> List[str]:
+        """
+        Ordonne les étapes de sorte que chacune suive ses dépendances.
+
+        Returns:
+            Noms des étapes dans l'ordre d'exécution
+
+        Raises:
+            ValueError: Si une dépendance est inconnue ou si le graphe a un cycle
+        """
+        remaining = {}
+        for name, stage in self.stages.items():
+            unknown = set(stage.depends_on) - set(self.stages)
+            if unknown:
+                raise ValueError(f"Dépendances inconnues pour {name}: {sorted(unknown)}")
+            remaining[name] = set(stage.depends_on)
+
+        order = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Cycle entre les étapes: {sorted(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def run(self, targets: Optional[List[str]] = None, force: bool = False) -> pd.DataFrame:
+        """
+        Exécute la chaîne.
+
+        Args:
+            targets: Étapes à produire, avec leurs dépendances (toutes si None)
+            force: Exécute toutes les étapes, même à jour
+
+        Returns:
+            DataFrame indexé par étape : statut ('exécutée' ou 'à jour'),
+            durée en secondes et nombre de lignes du résultat
+
+        Raises:
+            ValueError: Si une cible est inconnue
+            RuntimeError: Si une étape échoue (les étapes terminées restent
+                enregistrées pour la reprise)
+        """
+        selected = self._select(targets)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        state = self._load_state()
+        self._results = {}
+
+        pending = [name for name in self.order if name in selected]
+        done = {}
+        rows = {}
+        failure = None
+        run_start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while pending or running:
+                # Lancer (ou sauter) toutes les étapes dont les dépendances sont prêtes
+                if failure is None:
+                    for name in [n for n in pending
+                                 if all(d in done for d in self.stages[n].depends_on)]:
+                        pending.remove(name)
+                        key = self._compute_key(name, done)
+                        if (not force and not self.stages[name].always_run
+                                and self._is_up_to_date(name, key, state)):
+                            done[name] = state[name]['output_hash']
+                            rows[name] = {'status': 'à jour', 'seconds': 0.0,
+                                          'rows': state[name]['rows']}
+                            continue
+                        running[executor.submit(self._execute, name)] = (name, key)
+
+                if not running:
+                    if failure is not None or not pending:
+                        break
+                    continue
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, key = running.pop(future)
+                    try:
+                        df, seconds = future.result()
+                    except Exception as e:
+                        failure = failure or (name, e)
+                        continue
+
+                    output_hash = self._hash_frame(df)
+                    self._save_result(name, df)
+                    state[name] = {'key': key, 'output_hash': output_hash, 'rows': len(df)}
+                    self._save_state(state)
+                    done[name] = output_hash
+                    rows[name] = {'status': 'exécutée', 'seconds': seconds, 'rows': len(df)}
+                    print(f"Étape {name} terminée en {seconds:.2f} s ({len(df)} lignes)")
+
+        self.report = pd.DataFrame.from_dict(rows, orient='index',
+                                             columns=['status', 'seconds', 'rows'])
+        self.report.index.name = 'stage'
+
+        if failure is not None:
+            name, error = failure
+            raise RuntimeError(f"Étape {name} échouée : {str(error)}") from error
+
+        executed = (self.report['status'] == 'exécutée').sum()
+        print(f"Chaîne terminée en {time.perf_counter() - run_start:.2f} s : "
+              f"{executed} étapes exécutées, {len(self.report) - executed} à jour")
+        return self.report
+
+    def get_result(self, name: str) -> pd.DataFrame:
+        """
+        Retourne le résultat d'une étape (en mémoire ou relu depuis l'état).
+
+        Args:
+            name: Nom de l'étape
+
+        Returns:
+            Copie du DataFrame produit par l'étape
+
+        Raises:
+            KeyError: Si l'étape n'a jamais été exécutée
+        """
+        if name not in self._results:
+            path = self._result_path(name)
+            if not path.exists():
+                raise KeyError(f"Aucun résultat pour l'étape {name}")
+            with open(path, "rb") as f:
+                self._results[name] = pickle.load(f)
+        return self._results[name].copy()
+
+    def _select(self, targets: Optional[List[str]]) -> set:
+        """Retourne les cibles et toutes leurs dépendances (toutes les étapes si None)."""
+        if targets is None:
+            return set(self.stages)
+
+        unknown = set(targets) - set(self.stages)
+        if unknown:
+            raise ValueError(f"Étapes inconnues: {sorted(unknown)}")
+
+        selected = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in selected:
+                selected.add(name)
+                stack.extend(self.stages[name].depends_on)
+        return selected
+
+    def _execute(self, name: str):
+        """
+        Exécute une étape à partir des résultats de ses dépendances.
+
+        Returns:
+            Tuple (DataFrame produit, durée en secondes)
+        """
+        stage = self.stages[name]
+        inputs = [self.get_result(dep) for dep in stage.depends_on]
+
+        start = time.perf_counter()
+        df = stage.func(*inputs, **stage.params)
+        seconds = time.perf_counter() - start
+
+        if not isinstance(df, pd.DataFrame):
+            raise TypeError(f"L'étape {name} doit retourner un DataFrame")
+
+        self._results[name] = df
+        if stage.output is not None:
+            output = Path(stage.output)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            tmp_output = output.with_name(output.name + ".tmp")
+            df.to_csv(tmp_output, index=False, encoding='utf-8')
+            os.replace(tmp_output, output)
+        return df, seconds
+
+    def _compute_key(self, name: str, done: Dict[str, str]) -> str:
+        """
+        Calcule la clé d'une étape.
+
+        Args:
+            name: Nom de l'étape
+            done: Empreinte du résultat de chaque étape terminée
+
+        Returns:
+            Empreinte hexadécimale SHA-256
+        """
+        stage = self.stages[name]
+        digest = hashlib.sha256()
+        digest.update(name.encode())
+        digest.update(stage.version.encode())
+        digest.update(self._hash_code(stage.func))
+        digest.update(json.dumps(stage.params, sort_keys=True, default=str).encode())
+        digest.update(str(stage.output).encode())
+
+        for dep in stage.depends_on:
+            digest.update(done[dep].encode())
+
+        for path in sorted(Path(p) for p in stage.sources):
+            digest.update(path.as_posix().encode())
+            if path.exists():
+                digest.update(path.read_bytes())
+
+        return digest.hexdigest()
+
+    def _is_up_to_date(self, name: str, key: str, state: Dict) -> bool:
+        """Indique si une étape a déjà été exécutée avec la même clé."""
+        output = self.stages[name].output
+        return (state.get(name, {}).get('key') == key
+                and self._result_path(name).exists()
+                and (output is None or Path(output).exists()))
+
+    @staticmethod
+    def _hash_code(func: Callable) -> bytes:
+        """
+        Retourne le code d'une fonction d'étape, pris en compte dans sa clé.
+
+        La source est utilisée lorsqu'elle est disponible (fonctions, méthodes,
+        lambdas), sinon le bytecode ; functools.partial est déroulé.
+        """
+        while isinstance(func, functools.partial):
+            func = func.func
+        try:
+            return inspect.getsource(func).encode()
+        except (OSError, TypeError):
+            code = getattr(func, '__code__', None)
+            if code is not None:
+                return code.co_code
+            return getattr(func, '__qualname__', type(func).__qualname__).encode()
+
+    @staticmethod
+    def _hash_frame(df: pd.DataFrame) -> str:
+        """Calcule l'empreinte du contenu d'un DataFrame (valeurs, index, colonnes, types)."""
+        digest = hashlib.sha256()
+        digest.update(json.dumps([str(c) for c in df.columns]).encode())
+        digest.update(json.dumps([str(t) for t in df.dtypes]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def _result_path(self, name: str) -> Path:
+        """Retourne le fichier du résultat d'une étape."""
+        return self.state_dir / f"{name}.pkl"
+
+    def _save_result(self, name: str, df: pd.DataFrame) -> None:
+        """Enregistre le résultat d'une étape (écriture atomique)."""
+        path = self._result_path(name)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def _load_state(self) -> Dict:
+        """Lit l'état de la dernière exécution (vide s'il est absent ou illisible)."""
+        path = self.state_dir / self.STATE_FILE
+        if not path.exists():
+            return {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"État de la chaîne illisible ignoré : {str(e)}")
+            return {}
+
+    def _save_state(self, state: Dict) -> None:
+        """Enregistre l'état (écriture atomique)."""
+        path = self.state_dir / self.STATE_FILE
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding='utf-8') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
@@ -0,0 +1,364 @@
+"""
+Module de réduction des snapshots avant optimisation.
+
+Ce module réduit le nombre de snapshots d'un réseau entre le chargement des
+séries temporelles (NetworkDataLoader.load_timeseries_data) et
+l'optimisation. Deux approches sont proposées :
+- Jours représentatifs : les jours de l'horizon sont regroupés par k-means
+  (profil moyen du groupe) ou k-medoids (jour réel le plus central)
+- Sous-échantillonnage : moyenne par blocs de plusieurs heures
+
+Les pondérations (snapshot_weightings) du réseau réduit sont la somme des
+pondérations des snapshots qu'ils représentent : coûts et énergies restent
+à l'échelle de l'horizon complet. Les résultats du réseau réduit sont
+ramenés sur l'horizon complet par la correspondance snapshot d'origine ->
+snapshot représentatif.
+
+Example:
+    >>> from network.utils import SnapshotReducer
+    >>> reducer = SnapshotReducer(network)
+    >>> reduced = reducer.cluster_days(n_days=12, method='kmeans')
+    >>> reduced.optimize(solver_name='highs')
+    >>> dispatch = reducer.expand(reduced.generators_t.p)
+    >>> reducer.error_report
+
+Notes:
+    Les jours représentatifs ne sont pas consécutifs : l'état des stockages
+    n'est pas continu d'un jour à l'autre sur le réseau réduit.
+
+Contributeurs : Yanis Aksas (yanis.aksas@polymtl.ca)
+                Add Contributor here
+"""
+
+import numpy as np
+import pandas as pd
+import pypsa
+from scipy.cluster.vq import kmeans2
+from scipy.spatial.distance import cdist
+from typing import Dict, Tuple
+
+
+class SnapshotReducer:
+    """
+    Réduit les snapshots d'un réseau et ramène les résultats sur l'horizon complet.
+
+    Attributes:
+        network (pypsa.Network): Réseau complet (non modifié)
+        reduced (pypsa.Network): Réseau réduit du dernier appel
+        mapping (pd.Series): Snapshot représentatif de chaque snapshot d'origine
+        error_report (pd.DataFrame): Erreurs de reconstruction par série
+    """
+
+    METHODS = ['kmeans', 'kmedoids']
+
+    def __init__(self, network: pypsa.Network):
+        """
+        Initialise la réduction.
+
+        Args:
+            network: Réseau avec ses séries temporelles
+        """
+        self.network = network
+        self.reduced = None
+        self.mapping = None
+        self.error_report = None
+        self._series = self._get_input_series()
+
+    def downsample(self, hours: int = 3) -> pypsa.Network:
+        """
+        Regroupe les snapshots consécutifs par blocs de plusieurs heures.
+
+        Args:
+            hours: Nombre de snapshots par bloc
+
+        Returns:
+            Réseau réduit (un snapshot par bloc, valeurs moyennes du bloc)
+
+        Raises:
+            ValueError: Si hours n'est pas positif
+        """
+        if hours <= 0:
+            raise ValueError("hours doit être positif")
+
+        snapshots = self.network.snapshots
+        blocks = np.arange(len(snapshots)) // hours
+        representatives = snapshots[np.r_[0, np.flatnonzero(np.diff(blocks)) + 1]]
+
+        mapping = pd.Series(representatives[blocks], index=snapshots)
+        values = {key: df.groupby(blocks).mean().set_axis(representatives)
+                  for key, df in self._series.items()}
+        return self._build(mapping, values)
+
+    def cluster_days(self,
+                     n_days: int = 12,
+                     method: str = "kmeans",
+                     keep_peak_day: bool = True,
+                     seed: int = 0) -> pypsa.Network:
+        """
+        Remplace l'horizon par des jours représentatifs.
+
+        Chaque jour est décrit par ses profils horaires (charges, p_max_pu,
+        coûts, ...) normalisés par la valeur maximale de chaque série.
+
+        Args:
+            n_days: Nombre de jours représentatifs
+            method: 'kmeans' (profil moyen de chaque groupe, porté par le
+                jour le plus proche) ou 'kmedoids' (jour réel le plus central)
+            keep_peak_day: Conserve le jour de pointe de charge comme jour
+                représentatif à part entière
+            seed: Graine de l'initialisation
+
+        Returns:
+            Réseau réduit (n_days × snapshots par jour)
+
+        Raises:
+            ValueError: Si la méthode n'est pas supportée, si n_days est
+                invalide, si les jours n'ont pas tous le même nombre de
+                snapshots ou si, avec 'kmedoids', trop peu de jours ont des
+                profils distincts
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Méthode non supportée: {method}")
+
+        days, features = self._get_daily_features()
+        day_index = pd.Index(days.unique())
+        if not 1 <= n_days <= len(day_index):
+            raise ValueError(f"n_days doit être compris entre 1 et {len(day_index)}")
+
+        labels = np.full(len(day_index), -1)
+        medoids = []
+        candidates = np.arange(len(day_index))
+
+        # Jour de pointe isolé : il garde ses valeurs réelles
+        if keep_peak_day and n_days > 1 and "Load.p_set" in self._series:
+            total_load = self._series["Load.p_set"].sum(axis=1)
+            peak = day_index.get_loc(total_load.idxmax().normalize())
+            labels[peak] = 0
+            medoids.append(peak)
+            candidates = np.delete(candidates, peak)
+
+        n_clusters = n_days - len(medoids)
+        clusters, centers = self._cluster(features[candidates], n_clusters, method, seed)
+        labels[candidates] = clusters + len(medoids)
+        medoids += list(candidates[centers])
+
+        # Correspondance heure par heure entre chaque jour et son représentant
+        hours = pd.Series(np.arange(len(days)), index=days)
+        position = hours.groupby(level=0).cumcount().to_numpy()
+        first_hours = hours.groupby(level=0).first().loc[day_index].to_numpy()
+        representative_day = np.asarray(medoids)[labels][day_index.get_indexer(days)]
+        snapshots = self.network.snapshots
+        mapping = pd.Series(snapshots[first_hours[representative_day] + position], index=snapshots)
+
+        values = {}
+        for key, df in self._series.items():
+            if method == "kmedoids":
+                values[key] = df.loc[pd.Index(mapping.unique()).sort_values()]
+            else:
+                # Profil moyen des jours de chaque groupe, heure par heure
+                values[key] = df.groupby(mapping.values).mean()
+        return self._build(mapping, values)
+
+    def expand(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ramène des résultats du réseau réduit sur l'horizon complet.
+
+        Args:
+            df: Tableau indexé par les snapshots du réseau réduit
+                (ex: reduced.generators_t.p)
+
+        Returns:
+            Tableau indexé par les snapshots d'origine
+
+        Raises:
+            RuntimeError: Si aucune réduction n'a été effectuée
+        """
+        if self.mapping is None:
+            raise RuntimeError("Aucune réduction effectuée")
+        return df.reindex(self.mapping.values).set_axis(self.mapping.index)
+
+    def _get_input_series(self) -> Dict[str, pd.DataFrame]:
+        """Retourne les séries temporelles d'entrée non vides ('Composant.attribut')."""
+        series = {}
+        for component in self.network.components:
+            if component.empty:
+                continue
+            defaults = component.defaults
+            for attr, df in component.dynamic.items():
+                if (not df.empty and attr in defaults.index
+                        and str(defaults.at[attr, 'status']).startswith('Input')):
+                    series[f"{component.name}.{attr}"] = df.reindex(self.network.snapshots)
+        return series
+
+    def _get_daily_features(self) -> Tuple[pd.Index, np.ndarray]:
+        """
+        Construit les profils journaliers normalisés.
+
+        Returns:
+            Tuple (jour de chaque snapshot, matrice jours × (heures · séries))
+
+        Raises:
+            ValueError: Si les jours n'ont pas tous le même nombre de snapshots
+        """
+        days = self.network.snapshots.normalize()
+        counts = days.value_counts()
+        if counts.nunique() > 1:
+            raise ValueError("Les jours doivent avoir le même nombre de snapshots")
+
+        n_days, hours = len(counts), int(counts.iloc[0])
+        blocks = []
+        for df in self._series.values():
+            values = df.to_numpy(dtype=float)
+            scale = np.nanmax(np.abs(values), axis=0)
+            scale[~(scale > 0)] = 1.0
+            normalized = np.nan_to_num(values / scale)
+            blocks.append(normalized.reshape(n_days, hours * values.shape[1]))
+        return days, np.hstack(blocks)
+
+    def _cluster(self,
+                 features: np.ndarray,
+                 n_clusters: int,
+                 method: str,
+                 seed: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Regroupe les jours et choisit un jour représentatif par groupe.
+
+        Args:
+            features: Profils journaliers normalisés (jours × variables)
+            n_clusters: Nombre de groupes
+            method: 'kmeans' ou 'kmedoids'
+            seed: Graine de l'initialisation
+
+        Returns:
+            Tuple (groupe de chaque jour numéroté de 0 à n, position du jour
+            représentatif de chaque groupe)
+
+        Raises:
+            ValueError: Si moins de n_clusters jours ont des profils distincts
+                (méthode 'kmedoids')
+        """
+        centroids, labels = kmeans2(features, n_clusters, minit="++", seed=seed)
+        distances = cdist(features, centroids)
+
+        if method == "kmedoids":
+            # Alternance affectation / choix du jour minimisant la somme des distances
+            pairwise = cdist(features, features)
+            medoids = self._seed_medoids(pairwise, distances, n_clusters)
+            for _ in range(100):
+                labels = pairwise[:, medoids].argmin(axis=1)
+                updated = np.array([
+                    np.flatnonzero(labels == k)[pairwise[np.ix_(labels == k, labels == k)]
+                                                .sum(axis=0).argmin()]
+                    for k in range(len(medoids))
+                ])
+                if np.array_equal(updated, medoids):
+                    break
+                medoids = updated
+            return pairwise[:, medoids].argmin(axis=1), medoids
+
+        # Groupes vides retirés, représentant = jour le plus proche du centroïde
+        used, labels = np.unique(labels, return_inverse=True)
+        member_distances = np.where(labels[:, None] == np.arange(len(used))[None, :],
+                                    distances[:, used], np.inf)
+        return labels, member_distances.argmin(axis=0)
+
+    def _seed_medoids(self,
+                      pairwise: np.ndarray,
+                      distances: np.ndarray,
+                      n_clusters: int) -> np.ndarray:
+        """
+        Choisit les médoïdes initiaux : le jour le plus proche de chaque centroïde.
+
+        Plusieurs centroïdes peuvent avoir le même jour le plus proche. Les
+        médoïdes manquants sont alors remplacés, un à un, par le jour le plus
+        éloigné des médoïdes déjà choisis.
+
+        Args:
+            pairwise: Distances entre jours (jours × jours)
+            distances: Distances entre jours et centroïdes (jours × groupes)
+            n_clusters: Nombre de médoïdes à choisir
+
+        Returns:
+            Positions des n_clusters médoïdes, distinctes
+
+        Raises:
+            ValueError: Si moins de n_clusters jours ont des profils distincts
+        """
+        medoids = list(np.unique(distances.argmin(axis=0)))
+        while len(medoids) < n_clusters:
+            nearest = pairwise[:, medoids].min(axis=1)
+            farthest = int(nearest.argmax())
+            if not nearest[farthest] > 0:
+                raise ValueError(f"Moins de {n_clusters} jours ont des profils distincts")
+            medoids.append(farthest)
+        return np.sort(medoids)
+
+    def _build(self,
+               mapping: pd.Series,
+               values: Dict[str, pd.DataFrame]) -> pypsa.Network:
+        """
+        Construit le réseau réduit et le rapport d'erreur.
+
+        Args:
+            mapping: Snapshot représentatif de chaque snapshot d'origine
+            values: Séries agrégées indexées par les snapshots représentatifs
+
+        Returns:
+            Réseau réduit
+        """
+        network = self.network
+        representatives = pd.Index(mapping.unique()).sort_values()
+
+        reduced = network.copy(snapshots=representatives)
+        reduced.snapshot_weightings = network.snapshot_weightings.groupby(
+            mapping.values).sum().loc[representatives]
+
+        for key, df in values.items():
+            component, attr = key.split(".")
+            dynamic = reduced.components[component].dynamic
+            dynamic[attr] = df.loc[representatives]
+
+        self.reduced = reduced
+        self.mapping = mapping
+        self.error_report = self._compute_errors(values)
+
+        print(f"Snapshots réduits de {len(mapping)} à {len(representatives)}")
+        return reduced
+
+    def _compute_errors(self, values: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Compare chaque série d'origine à sa reconstruction sur l'horizon complet.
+
+        Returns:
+            DataFrame par série avec :
+            - Erreur quadratique moyenne (absolue et en % de la moyenne)
+            - Erreur absolue maximale
+            - Écart d'énergie pondérée en pourcentage
+            - Écart sur la pointe de la somme des colonnes en pourcentage
+        """
+        weights = self.network.snapshot_weightings.generators.to_numpy(dtype=float)
+        rows = []
+        for key, df in values.items():
+            original = self._series[key].to_numpy(dtype=float)
+            rebuilt = self.expand(df).to_numpy(dtype=float)
+            error = rebuilt - original
+
+            energy = np.nansum(original * weights[:, None])
+            peak = np.nanmax(np.nansum(original, axis=1))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rows.append({
+                    'series': key,
+                    'rmse': float(np.sqrt(np.nanmean(error ** 2))),
+                    'nrmse_percent': float(np.sqrt(np.nanmean(error ** 2))
+                                           / np.nanmean(np.abs(original)) * 100),
+                    'max_abs_error': float(np.nanmax(np.abs(error))),
+                    'energy_error_percent': float(
+                        (np.nansum(rebuilt * weights[:, None]) - energy) / energy * 100),
+                    'peak_error_percent': float(
+                        (np.nanmax(np.nansum(rebuilt, axis=1)) - peak) / peak * 100)
+                })
+
+        report = pd.DataFrame(rows).set_index('series')
+        report['n_snapshots'] = len(self.mapping.unique())
+        report['n_original'] = len(self.mapping)
+        return report